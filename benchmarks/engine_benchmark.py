@@ -0,0 +1,327 @@
+"""
+Overhead of the game engine, without any model in the loop.
+
+Players are scripted agents that answer instantly with valid protocol text: they make proposals while they are
+allowed to and then wait until the game runs out of iterations, so every game plays all its turns. What we
+measure is the cost of `AlternatingGame.run()` itself: parsing, `write_game_state`, the deep copies of
+`get_state` and the serialization in `log_state`.
+
+Two sweeps, for each game type:
+
+    - iterations: games of 2 to 200 iterations (the cost of a turn grows with the length of the game)
+    - games: 1 to 10k games of a few iterations
+
+Each point runs in a fresh process so that the peak memory is the one of that point. Run from the root of the
+repository:
+
+    python -m benchmarks.engine_benchmark
+    python -m benchmarks.engine_benchmark --game-types buysell --games 1 10 100 --save-baseline
+"""
+
+import os
+import time
+import shutil
+import argparse
+import traceback
+import tempfile
+import resource
+import multiprocessing
+from contextlib import redirect_stdout
+
+from negotiationarena.constants import *
+from negotiationarena.agents.scripted import ScriptedAgent
+from negotiationarena.game_objects.resource import Resources
+from negotiationarena.game_objects.goal import (
+    BuyerGoal,
+    SellerGoal,
+    ResourceGoal,
+    UltimatumGoal,
+)
+from negotiationarena.game_objects.valuation import Valuation
+from negotiationarena.profiling import profile_summary
+from games.buy_sell_game.game import BuySellGame, BuySellGameDefaultParser
+from games.trading_game.game import TradingGame
+from games.trading_game.interface import TradingGameDefaultParser
+from games.ultimatum.game import MultiTurnUltimatumGame
+from games.ultimatum.interface import UltimatumGameDefaultParser
+from benchmarks.utils import save_baseline, load_baseline, print_results
+
+DEFAULT_ITERATIONS = [2, 5, 10, 20, 50, 100, 200]
+DEFAULT_GAMES = [1, 10, 100, 1000, 10000]
+
+
+class ProtocolAgent(ScriptedAgent):
+    """
+    Scripted agent that proposes `trade` while it has proposals left, then answers NONE.
+    """
+
+    def __init__(self, agent_name, game_interface, contents, trade):
+        super().__init__(agent_name)
+        self.game_interface = game_interface
+        self.contents = contents
+        self.trade = trade
+        self.proposals_left = 0
+
+    def reply(self):
+        contents = dict(self.contents)
+        if self.proposals_left > 0:
+            self.proposals_left -= 1
+            contents[PLAYER_ANSWER_TAG] = "PROPOSAL"
+            contents[PROPOSED_TRADE_TAG] = self.trade
+        else:
+            contents[PLAYER_ANSWER_TAG] = REFUSING_OR_WAIT_TAG
+            contents[PROPOSED_TRADE_TAG] = REFUSING_OR_WAIT_TAG
+        contents[PROPOSAL_COUNT_TAG] = self.replies_made + 1
+        contents[TURN_OR_MOVE_TAG] = self.replies_made + 1
+        return self.game_interface.format_response(contents)
+
+
+class CountBytesWritten:
+    """
+    Mixin for the games, adds up the size of the logs every time they are written.
+    """
+
+    bytes_written = 0
+
+    def log_state(self):
+        super().log_state()
+        CountBytesWritten.bytes_written += directory_size(self.log_path)
+
+
+def measured(game_class):
+    return type(game_class.__name__, (CountBytesWritten, game_class), {})
+
+
+def directory_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+def buysell_game(iterations, log_path):
+    interface = BuySellGameDefaultParser()
+    players = [
+        ProtocolAgent(
+            name,
+            interface,
+            {RESOURCES_TAG: res, GOALS_TAG: goal, MESSAGE_TAG: "Deal?"},
+            f"{AGENT_ONE} Gives X: 1 | {AGENT_TWO} Gives {MONEY_TOKEN}: 50",
+        )
+        for name, res, goal in [
+            (AGENT_ONE, "X: 1", "sell"),
+            (AGENT_TWO, f"{MONEY_TOKEN}: 1000", "buy"),
+        ]
+    ]
+    return measured(BuySellGame)(
+        players=players,
+        iterations=iterations,
+        player_goals=[
+            SellerGoal(cost_of_production=Valuation({"X": 40})),
+            BuyerGoal(willingness_to_pay=Valuation({"X": 60})),
+        ],
+        player_starting_resources=[
+            Resources({"X": 1}),
+            Resources({MONEY_TOKEN: 1000}),
+        ],
+        player_conversation_roles=[
+            f"You are {AGENT_ONE}.",
+            f"You are {AGENT_TWO}.",
+        ],
+        player_social_behaviour=["", ""],
+        log_path=log_path,
+    )
+
+
+def trading_game(iterations, log_path):
+    interface = TradingGameDefaultParser()
+    players = [
+        ProtocolAgent(
+            name,
+            interface,
+            {
+                MY_NAME_TAG: name,
+                RESOURCES_TAG: res,
+                GOALS_TAG: "X: 15, Y: 15",
+                MESSAGE_TAG: "Deal?",
+            },
+            f"{AGENT_ONE} Gives X: 5 | {AGENT_TWO} Gives Y: 5",
+        )
+        for name, res in [
+            (AGENT_ONE, "X: 25, Y: 5"),
+            (AGENT_TWO, "X: 5, Y: 25"),
+        ]
+    ]
+    return measured(TradingGame)(
+        players=players,
+        iterations=iterations,
+        resources_support_set=Resources({"X": 0, "Y": 0}),
+        player_goals=[
+            ResourceGoal({"X": 15, "Y": 15}),
+            ResourceGoal({"X": 15, "Y": 15}),
+        ],
+        player_initial_resources=[
+            Resources({"X": 25, "Y": 5}),
+            Resources({"X": 5, "Y": 25}),
+        ],
+        player_social_behaviour=["", ""],
+        player_roles=[
+            f"You are {AGENT_ONE}, start by making a proposal.",
+            f"You are {AGENT_TWO}, start by responding to a trade.",
+        ],
+        log_path=log_path,
+    )
+
+
+def ultimatum_game(iterations, log_path):
+    interface = UltimatumGameDefaultParser()
+    players = [
+        ProtocolAgent(
+            name,
+            interface,
+            {MY_NAME_TAG: name, RESOURCES_TAG: res, MESSAGE_TAG: "Deal?"},
+            f"{AGENT_ONE} Gives Dollars: 60 | {AGENT_TWO} Gives Dollars: 0",
+        )
+        for name, res in [
+            (AGENT_ONE, "Dollars: 100"),
+            (AGENT_TWO, "Dollars: 0"),
+        ]
+    ]
+    return measured(MultiTurnUltimatumGame)(
+        players=players,
+        iterations=iterations,
+        resources_support_set=Resources({"Dollars": 0}),
+        player_goals=[UltimatumGoal(), UltimatumGoal()],
+        player_initial_resources=[
+            Resources({"Dollars": 100}),
+            Resources({"Dollars": 0}),
+        ],
+        player_social_behaviour=["", ""],
+        player_roles=[f"You are {AGENT_ONE}.", f"You are {AGENT_TWO}."],
+        log_path=log_path,
+    )
+
+
+GAMES = dict(
+    buysell=buysell_game, trading=trading_game, ultimatum=ultimatum_game
+)
+
+
+def run_point(game_type, iterations, games):
+    """
+    Plays `games` games of `iterations` iterations and measures the engine.
+
+    :return: dict of metrics
+    """
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    turns, engine = 0, 0.0
+    CountBytesWritten.bytes_written = 0
+
+    with tempfile.TemporaryDirectory() as log_dir, open(
+        os.devnull, "w"
+    ) as devnull:
+        seconds = 0.0
+        for i in range(games):
+            game = GAMES[game_type](iterations, os.path.join(log_dir, str(i)))
+            for idx, player in enumerate(game.players):
+                player.proposals_left = game.move_validator(
+                    idx
+                ).maximum_number_of_proposals
+
+            # the engine prints a lot, printing is part of what we measure but it does not go to the terminal
+            with redirect_stdout(devnull):
+                start = time.perf_counter()
+                game.run()
+                seconds += time.perf_counter() - start
+
+            summary = profile_summary(game.game_state)
+            turns += summary["turns"]
+            engine += summary["engine"]
+            shutil.rmtree(game.log_path)
+
+    # game_state.json and interaction.log are written again after every turn
+    bytes_written = CountBytesWritten.bytes_written
+
+    # ru_maxrss is in kilobytes on linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return dict(
+        turns=turns,
+        seconds=seconds,
+        turns_per_second=turns / seconds if seconds else 0.0,
+        engine_ms_per_turn=engine / turns * 1e3 if turns else 0.0,
+        bytes_written_per_turn=bytes_written / turns if turns else 0.0,
+        peak_rss_mb=peak_rss / 1024,
+        rss_growth_mb=(peak_rss - start_rss) / 1024,
+    )
+
+
+def _run_point(queue, *args):
+    try:
+        queue.put(run_point(*args))
+    except Exception:
+        queue.put(traceback.format_exc())
+
+
+def run_point_in_subprocess(*args):
+    """
+    Peak memory is per process, every point gets its own.
+    """
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_run_point, args=(queue, *args))
+    process.start()
+    result = queue.get()
+    process.join()
+    if isinstance(result, str):
+        raise RuntimeError(
+            "Benchmark point {} failed:\n{}".format(args, result)
+        )
+    return result
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--game-types", nargs="+", default=list(GAMES), choices=list(GAMES)
+    )
+    arg_parser.add_argument(
+        "--iterations", nargs="+", type=int, default=DEFAULT_ITERATIONS
+    )
+    arg_parser.add_argument(
+        "--games-per-iteration",
+        type=int,
+        default=3,
+        help="games played at each point of the iterations sweep",
+    )
+    arg_parser.add_argument(
+        "--games", nargs="+", type=int, default=DEFAULT_GAMES
+    )
+    arg_parser.add_argument(
+        "--iterations-per-game",
+        type=int,
+        default=6,
+        help="iterations of the games of the games sweep",
+    )
+    arg_parser.add_argument("--baseline", default="engine")
+    arg_parser.add_argument("--save-baseline", action="store_true")
+    args = arg_parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    for game_type in args.game_types:
+        points = [
+            (iterations, args.games_per_iteration)
+            for iterations in args.iterations
+        ] + [(args.iterations_per_game, games) for games in args.games]
+        for iterations, games in points:
+            case = f"{game_type} iterations={iterations} games={games}"
+            if case in results:
+                continue
+            results[case] = run_point_in_subprocess(
+                game_type, iterations, games
+            )
+            print_results({case: results[case]}, baseline)
+
+    if args.save_baseline:
+        print("Baseline saved to", save_baseline(args.baseline, results))
@@ -0,0 +1,551 @@
+"""
+Local stand-in for the OpenAI and Anthropic HTTP APIs, to load test the runner without calling the providers.
+
+Endpoints:
+
+    POST /v1/chat/completions   OpenAI chat completions (ChatGPTAgent, and LLama2ChatAgent which uses the same API)
+    POST /v1/complete           Anthropic text completions (ClaudeAgent)
+    POST /v1/messages           Anthropic messages
+    GET  /stats                 counters of the requests served so far
+
+All of them support `"stream": true`. Latency, server errors and 429s are injected at random (see the arguments),
+and the replies are valid moves of the game found in the system prompt (buy-sell, trading or ultimatum): players
+propose small trades and accept the proposals of the other player with probability --accept-rate.
+
+    python -m benchmarks.fake_llm_server --port 8000 --latency lognormal --latency-mean 1.5 --rate-limit-rate 0.05
+
+and then point the agents to it:
+
+    OPENAI_BASE_URL=http://localhost:8000/v1 ANY_SCALE_BASE_URL=http://localhost:8000/v1
+    ANTHROPIC_BASE_URL=http://localhost:8000
+"""
+
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from negotiationarena.constants import *
+from games.buy_sell_game.game import BuySellGameDefaultParser
+from games.trading_game.interface import TradingGameDefaultParser
+from games.ultimatum.interface import UltimatumGameDefaultParser
+
+# a game is recognized by a tag that only its prompt asks for, first match wins
+GAME_INTERFACES = [
+    (TURN_OR_MOVE_TAG, UltimatumGameDefaultParser()),
+    (PROPOSAL_COUNT_TAG, BuySellGameDefaultParser()),
+    (MY_NAME_TAG, TradingGameDefaultParser()),
+]
+
+
+class Latency:
+    """
+    Distribution of the time to the first byte of a response, in seconds.
+
+    constant: always `mean`
+    uniform: between mean - spread and mean + spread
+    exponential: with mean `mean`
+    lognormal: with median `mean` and sigma `spread` (heavy tail, closest to what providers do)
+    """
+
+    def __init__(self, kind="constant", mean=0.0, spread=0.0, rng=None):
+        self.kind = kind
+        self.mean = mean
+        self.spread = spread
+        self.rng = random.Random() if rng is None else rng
+
+    def sample(self):
+        if self.mean <= 0:
+            return 0.0
+        if self.kind == "constant":
+            return self.mean
+        if self.kind == "uniform":
+            return max(
+                0.0,
+                self.rng.uniform(
+                    self.mean - self.spread, self.mean + self.spread
+                ),
+            )
+        if self.kind == "exponential":
+            return self.rng.expovariate(1 / self.mean)
+        if self.kind == "lognormal":
+            return self.mean * self.rng.lognormvariate(0, self.spread)
+        raise ValueError(f"Unknown latency distribution: {self.kind}")
+
+
+def count_tokens(text):
+    # close enough for english text
+    return max(1, len(text) // 4)
+
+
+def negotiation_reply(messages, accept_rate=0.3, rng=random):
+    """
+    A valid move for the game described by the first message of the conversation.
+
+    :param messages: list of {"role", "content"}, the system prompt first
+    :param accept_rate: probability of accepting a proposal of the other player
+    :return:
+    """
+    prompt = messages[0]["content"] if messages else ""
+    interface = next(
+        (i for tag, i in GAME_INTERFACES if f"<{tag}>" in prompt), None
+    )
+    if interface is None:
+        return "Hello!"
+
+    # the role ("You are Player RED") comes after the rules, either at the end of the system prompt or in the
+    # first user message
+    roles = "\n".join(m["content"] for m in messages[:2])
+    me = max(
+        [AGENT_ONE, AGENT_TWO], key=lambda name: roles.rfind(f"You are {name}")
+    )
+    other = AGENT_TWO if me == AGENT_ONE else AGENT_ONE
+
+    # the resources of the player, skipping the placeholders of the answer format
+    resources = next(
+        (
+            r.strip()
+            for r in re.findall(
+                f"<{RESOURCES_TAG}>(.*?)</{RESOURCES_TAG}>", prompt
+            )[::-1]
+            if re.search(r"\w+:\s*\d+", r)
+        ),
+        "",
+    )
+    owned = re.search(r"(\w+):\s*([1-9]\d*)", resources)
+    give = f"{owned.group(1)}: 1" if owned else REFUSING_OR_WAIT_TAG
+
+    last = messages[-1]["content"] if messages[-1]["role"] == "user" else ""
+    proposal = re.search(
+        f"<{OTHER_PLAYER_PROPOSED_TRADE}>(.*?)</{OTHER_PLAYER_PROPOSED_TRADE}>",
+        last,
+        re.S,
+    )
+    proposal = proposal.group(1).strip() if proposal else REFUSING_OR_WAIT_TAG
+    moves = sum(m["role"] == "assistant" for m in messages) + 1
+
+    # stay within the proposal limit stated in the rules, when there is one
+    limit = re.search(r"allowed at most (\d+) proposals", prompt)
+    proposals_made = sum(
+        m["role"] == "assistant" and "Gives" in m["content"] for m in messages
+    )
+    can_propose = limit is None or proposals_made < int(limit.group(1))
+    # in the ultimatum the last move is for accepting or rejecting
+    last_move = re.search(f"{me} has (\\d+) moves", prompt)
+    if last_move is not None and moves >= int(last_move.group(1)):
+        can_propose = False
+
+    contents = {
+        MY_NAME_TAG: me,
+        RESOURCES_TAG: resources,
+        GOALS_TAG: "",
+        REASONING_TAG: "Scripted by the fake server.",
+        MESSAGE_TAG: "Let's make a deal.",
+        PROPOSAL_COUNT_TAG: moves,
+        TURN_OR_MOVE_TAG: moves,
+    }
+    if proposal != REFUSING_OR_WAIT_TAG and (
+        not can_propose or rng.random() < accept_rate
+    ):
+        contents[PLAYER_ANSWER_TAG] = ACCEPTING_TAG
+        contents[PROPOSED_TRADE_TAG] = REFUSING_OR_WAIT_TAG
+    elif not can_propose:
+        contents[PLAYER_ANSWER_TAG] = REFUSING_OR_WAIT_TAG
+        contents[PROPOSED_TRADE_TAG] = REFUSING_OR_WAIT_TAG
+    else:
+        contents[PLAYER_ANSWER_TAG] = REFUSING_OR_WAIT_TAG
+        gives = {me: give, other: REFUSING_OR_WAIT_TAG}
+        contents[PROPOSED_TRADE_TAG] = (
+            f"{AGENT_ONE} Gives {gives[AGENT_ONE]} | "
+            f"{AGENT_TWO} Gives {gives[AGENT_TWO]}"
+        )
+    return interface.format_response(contents)
+
+
+def chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)] or [""]
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    # set by `serve`
+    config = None
+    stats = Counter()
+    stats_lock = threading.Lock()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.config.verbose:
+            super().log_message(format, *args)
+
+    def count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def start_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def send_event(self, data, event=None):
+        message = "" if event is None else f"event: {event}\n"
+        message += (
+            f"data: {data if isinstance(data, str) else json.dumps(data)}\n\n"
+        )
+        self.wfile.write(message.encode())
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            with self.stats_lock:
+                self.send_json(200, dict(self.stats))
+        else:
+            self.send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_json(400, {"error": {"message": "invalid json"}})
+            return
+
+        routes = {
+            "/v1/chat/completions": self.chat_completions,
+            "/v1/complete": self.anthropic_complete,
+            "/v1/messages": self.anthropic_messages,
+        }
+        route = routes.get(self.path.split("?")[0].rstrip("/"))
+        if route is None:
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+        self.count("requests")
+        self.count(self.path)
+
+        if self.inject_fault():
+            return
+        time.sleep(self.config.latency.sample())
+        route(body)
+
+    def inject_fault(self):
+        """
+        :return: True if an error was sent instead of the response
+        """
+        draw = self.config.rng.random()
+        if draw < self.config.rate_limit_rate:
+            self.count("429")
+            self.send_json(
+                429,
+                {
+                    "type": "error",
+                    "error": {
+                        "type": "rate_limit_error",
+                        "message": "Rate limit reached (injected)",
+                    },
+                },
+                headers={"Retry-After": str(self.config.retry_after)},
+            )
+            return True
+        if draw < self.config.rate_limit_rate + self.config.error_rate:
+            self.count("500")
+            self.send_json(
+                500,
+                {
+                    "type": "error",
+                    "error": {
+                        "type": "api_error",
+                        "message": "Internal server error (injected)",
+                    },
+                },
+            )
+            return True
+        return False
+
+    def reply(self, messages):
+        return negotiation_reply(
+            messages, self.config.accept_rate, rng=self.config.rng
+        )
+
+    def stream_pieces(self, text):
+        for piece in chunks(text, self.config.chunk_size):
+            time.sleep(self.config.chunk_delay)
+            yield piece
+
+    def chat_completions(self, body):
+        messages = body.get("messages", [])
+        text = self.reply(messages)
+        prompt_tokens = count_tokens("".join(m["content"] for m in messages))
+        completion_tokens = count_tokens(text)
+        common = dict(
+            id="chatcmpl-" + uuid.uuid4().hex,
+            created=int(time.time()),
+            model=body.get("model", "fake"),
+        )
+
+        if not body.get("stream"):
+            self.send_json(
+                200,
+                dict(
+                    object="chat.completion",
+                    choices=[
+                        dict(
+                            index=0,
+                            message=dict(role="assistant", content=text),
+                            finish_reason="stop",
+                        )
+                    ],
+                    usage=dict(
+                        prompt_tokens=prompt_tokens,
+                        completion_tokens=completion_tokens,
+                        total_tokens=prompt_tokens + completion_tokens,
+                        prompt_tokens_details=dict(cached_tokens=0),
+                    ),
+                    **common,
+                ),
+            )
+            return
+
+        self.start_stream()
+        for piece in self.stream_pieces(text):
+            self.send_event(
+                dict(
+                    object="chat.completion.chunk",
+                    choices=[
+                        dict(
+                            index=0,
+                            delta=dict(content=piece),
+                            finish_reason=None,
+                        )
+                    ],
+                    **common,
+                )
+            )
+        self.send_event(
+            dict(
+                object="chat.completion.chunk",
+                choices=[dict(index=0, delta={}, finish_reason="stop")],
+                **common,
+            )
+        )
+        self.send_event("[DONE]")
+
+    def anthropic_complete(self, body):
+        # the prompt is "system\n\nHuman: ...\n\nAssistant: ...\n\nAssistant:"
+        prompt = body.get("prompt", "")
+        turns = re.split(r"\n\n(Human|Assistant):", prompt)
+        messages = [dict(role="system", content=turns[0])] + [
+            dict(
+                role="user" if role == "Human" else "assistant",
+                content=content.strip(),
+            )
+            for role, content in zip(turns[1::2], turns[2::2])
+            if content.strip()
+        ]
+        text = self.reply(messages)
+        common = dict(
+            id="compl_" + uuid.uuid4().hex,
+            type="completion",
+            model=body.get("model", "fake"),
+        )
+
+        if not body.get("stream"):
+            self.send_json(
+                200,
+                dict(
+                    completion=text,
+                    stop_reason="stop_sequence",
+                    stop=None,
+                    **common,
+                ),
+            )
+            return
+
+        self.start_stream()
+        for piece in self.stream_pieces(text):
+            self.send_event(
+                dict(completion=piece, stop_reason=None, **common),
+                event="completion",
+            )
+        self.send_event(
+            dict(completion="", stop_reason="stop_sequence", **common),
+            event="completion",
+        )
+
+    def anthropic_messages(self, body):
+        system = body.get("system", "")
+        if isinstance(system, list):
+            system = "".join(block.get("text", "") for block in system)
+        messages = [dict(role="system", content=system)] + [
+            dict(
+                role=m["role"],
+                content=m["content"]
+                if isinstance(m["content"], str)
+                else "".join(b.get("text", "") for b in m["content"]),
+            )
+            for m in body.get("messages", [])
+        ]
+        text = self.reply(messages)
+        usage = dict(
+            input_tokens=count_tokens("".join(m["content"] for m in messages)),
+            output_tokens=count_tokens(text),
+        )
+        message = dict(
+            id="msg_" + uuid.uuid4().hex,
+            type="message",
+            role="assistant",
+            model=body.get("model", "fake"),
+            stop_sequence=None,
+        )
+
+        if not body.get("stream"):
+            self.send_json(
+                200,
+                dict(
+                    content=[dict(type="text", text=text)],
+                    stop_reason="end_turn",
+                    usage=usage,
+                    **message,
+                ),
+            )
+            return
+
+        self.start_stream()
+        self.send_event(
+            dict(
+                type="message_start",
+                message=dict(
+                    content=[],
+                    stop_reason=None,
+                    usage=dict(usage, output_tokens=0),
+                    **message,
+                ),
+            ),
+            event="message_start",
+        )
+        self.send_event(
+            dict(
+                type="content_block_start",
+                index=0,
+                content_block=dict(type="text", text=""),
+            ),
+            event="content_block_start",
+        )
+        for piece in self.stream_pieces(text):
+            self.send_event(
+                dict(
+                    type="content_block_delta",
+                    index=0,
+                    delta=dict(type="text_delta", text=piece),
+                ),
+                event="content_block_delta",
+            )
+        self.send_event(
+            dict(type="content_block_stop", index=0),
+            event="content_block_stop",
+        )
+        self.send_event(
+            dict(
+                type="message_delta",
+                delta=dict(stop_reason="end_turn", stop_sequence=None),
+                usage=dict(output_tokens=usage["output_tokens"]),
+            ),
+            event="message_delta",
+        )
+        self.send_event(dict(type="message_stop"), event="message_stop")
+
+
+def serve(
+    host="127.0.0.1",
+    port=8000,
+    latency=None,
+    error_rate=0.0,
+    rate_limit_rate=0.0,
+    retry_after=1,
+    accept_rate=0.3,
+    chunk_size=16,
+    chunk_delay=0.0,
+    seed=None,
+    verbose=False,
+):
+    """
+    Builds the server, call `serve_forever()` on it (or run it in a thread for tests and benchmarks).
+    """
+    config = argparse.Namespace(
+        latency=Latency() if latency is None else latency,
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+        retry_after=retry_after,
+        accept_rate=accept_rate,
+        chunk_size=chunk_size,
+        chunk_delay=chunk_delay,
+        rng=random.Random(seed),
+        verbose=verbose,
+    )
+    handler = type(
+        "ConfiguredFakeLLMHandler",
+        (FakeLLMHandler,),
+        dict(config=config, stats=Counter(), stats_lock=threading.Lock()),
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8000)
+    arg_parser.add_argument(
+        "--latency",
+        default="constant",
+        choices=["constant", "uniform", "exponential", "lognormal"],
+    )
+    arg_parser.add_argument("--latency-mean", type=float, default=0.0)
+    arg_parser.add_argument("--latency-spread", type=float, default=0.5)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    arg_parser.add_argument("--retry-after", type=int, default=1)
+    arg_parser.add_argument("--accept-rate", type=float, default=0.3)
+    arg_parser.add_argument("--chunk-size", type=int, default=16)
+    arg_parser.add_argument("--chunk-delay", type=float, default=0.0)
+    arg_parser.add_argument("--seed", type=int, default=None)
+    arg_parser.add_argument("--verbose", action="store_true")
+    args = arg_parser.parse_args()
+
+    server = serve(
+        host=args.host,
+        port=args.port,
+        latency=Latency(args.latency, args.latency_mean, args.latency_spread),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        accept_rate=args.accept_rate,
+        chunk_size=args.chunk_size,
+        chunk_delay=args.chunk_delay,
+        seed=args.seed,
+        verbose=args.verbose,
+    )
+    print(
+        "Fake LLM server listening on http://{}:{}".format(
+            args.host, args.port
+        )
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
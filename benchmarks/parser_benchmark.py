@@ -0,0 +1,158 @@
+"""
+Throughput of the game parsers on the answers found in our logs.
+
+The corpus is made of every `player_complete_answer` stored in the game_state.json files found under the
+log directories. Every parser is run on the whole corpus (parsers also see the answers of the other games,
+this is where most failures come from) and we report responses per second, the memory allocated by a parse
+and the failure rate.
+
+Run from the root of the repository:
+
+    python -m benchmarks.parser_benchmark                   # compare with the saved baseline
+    python -m benchmarks.parser_benchmark --save-baseline   # after a parser change you are happy with
+    python -m benchmarks.parser_benchmark --log-dirs .logs ../example_logs_ignore
+"""
+
+import io
+import os
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+from contextlib import redirect_stdout
+
+from negotiationarena.constants import PROPOSED_TRADE_TAG, REFUSING_OR_WAIT_TAG
+from negotiationarena.utils import TagIndex
+from games.buy_sell_game.game import BuySellGameDefaultParser
+from games.trading_game.interface import TradingGameDefaultParser
+from games.ultimatum.interface import UltimatumGameDefaultParser
+from benchmarks.utils import save_baseline, load_baseline, print_results
+
+DEFAULT_LOG_DIRS = ["example_logs", ".logs"]
+
+
+def harvest_corpus(log_dirs):
+    """
+    Collects the answers of the players from all the game_state.json under log_dirs.
+    We read the raw json, there is no need to rebuild the games.
+
+    :param log_dirs:
+    :return: list of (game class, answer)
+    """
+    corpus = []
+    for log_dir in log_dirs:
+        for root, _, files in sorted(os.walk(log_dir)):
+            if "game_state.json" not in files:
+                continue
+            with open(os.path.join(root, "game_state.json")) as f:
+                game = json.load(f)
+            for state in game.get("game_state", []):
+                answer = state.get("player_complete_answer")
+                if isinstance(answer, str):
+                    corpus.append((game.get("class"), answer))
+    return corpus
+
+
+def trade_strings(corpus):
+    """
+    Contents of the proposed trade tag of each answer, without the empty ones and NONE.
+    """
+    strings = []
+    for _, answer in corpus:
+        contents = TagIndex(answer).get(PROPOSED_TRADE_TAG).strip()
+        if contents and contents != REFUSING_OR_WAIT_TAG:
+            strings.append(contents)
+    return strings
+
+
+def benchmark(function, inputs, repeat=20):
+    """
+    :param function: called on each input
+    :param inputs:
+    :param repeat: number of timed passes over the inputs, we keep the median
+    :return: dict of metrics
+    """
+    failures = 0
+    for x in inputs:
+        try:
+            function(x)
+        except Exception:
+            failures += 1
+
+    def one_pass():
+        start = time.perf_counter()
+        for x in inputs:
+            try:
+                function(x)
+            except Exception:
+                pass
+        return time.perf_counter() - start
+
+    seconds = statistics.median(one_pass() for _ in range(repeat))
+
+    # peak memory of a single call and memory still held by what it returns
+    peak_bytes, retained_bytes = 0, 0
+    tracemalloc.start()
+    for x in inputs:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            result = function(x)
+        except Exception:
+            result = None
+        current, peak = tracemalloc.get_traced_memory()
+        peak_bytes += peak - before
+        retained_bytes += current - before
+        del result
+    tracemalloc.stop()
+
+    n = max(len(inputs), 1)
+    return dict(
+        inputs=len(inputs),
+        per_second=len(inputs) / seconds if seconds else 0.0,
+        us_per_input=seconds / n * 1e6,
+        peak_bytes=peak_bytes / n,
+        retained_bytes=retained_bytes / n,
+        failures=failures,
+        failure_rate=failures / n,
+    )
+
+
+def run(log_dirs, repeat=20):
+    corpus = harvest_corpus([d for d in log_dirs if os.path.isdir(d)])
+    answers = [answer for _, answer in corpus]
+    trades = trade_strings(corpus)
+
+    parsers = [
+        BuySellGameDefaultParser(),
+        TradingGameDefaultParser(),
+        UltimatumGameDefaultParser(),
+    ]
+
+    results = {}
+    # parsers print the answers they cannot parse, we do not want that in the timings
+    with redirect_stdout(io.StringIO()):
+        for parser in parsers:
+            results[parser.__class__.__name__ + ".parse"] = benchmark(
+                parser.parse, answers, repeat=repeat
+            )
+        results["parse_proposed_trade"] = benchmark(
+            parsers[0].parse_proposed_trade, trades, repeat=repeat
+        )
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--log-dirs", nargs="+", default=DEFAULT_LOG_DIRS)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    arg_parser.add_argument("--baseline", default="parser")
+    arg_parser.add_argument("--save-baseline", action="store_true")
+    args = arg_parser.parse_args()
+
+    results = run(args.log_dirs, repeat=args.repeat)
+    print_results(results, load_baseline(args.baseline))
+
+    if args.save_baseline:
+        print("Baseline saved to", save_baseline(args.baseline, results))
@@ -0,0 +1,65 @@
+import os
+import json
+import platform
+from datetime import datetime
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def save_baseline(name, results):
+    """
+    Saves the results of a benchmark in benchmarks/baselines/<name>.json
+
+    :param name:
+    :param results: dict of case -> dict of metrics
+    :return: the path of the baseline
+    """
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = os.path.join(BASELINE_DIR, "{}.json".format(name))
+    with open(path, "w") as f:
+        json.dump(
+            dict(
+                created=datetime.now().isoformat(timespec="seconds"),
+                python=platform.python_version(),
+                machine=platform.machine(),
+                results=results,
+            ),
+            f,
+            indent=2,
+        )
+    return path
+
+
+def load_baseline(name):
+    path = os.path.join(BASELINE_DIR, "{}.json".format(name))
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def print_results(results, baseline=None, columns=None):
+    """
+    Prints one line per case, and the ratio with the baseline when there is one.
+
+    :param results: dict of case -> dict of metrics
+    :param baseline: a baseline loaded with load_baseline
+    :param columns: metrics to print, all of them by default
+    :return:
+    """
+    old = {} if baseline is None else baseline["results"]
+    for case, metrics in results.items():
+        cells = []
+        for k, v in metrics.items():
+            if columns is not None and k not in columns:
+                continue
+            cell = (
+                "{}={:.4g}".format(k, v)
+                if isinstance(v, float)
+                else f"{k}={v}"
+            )
+            before = old.get(case, {}).get(k)
+            if isinstance(before, (int, float)) and before:
+                cell += " ({:+.1%})".format(v / before - 1)
+            cells.append(cell)
+        print("{:<40} {}".format(case, "  ".join(cells)))
@@ -12,10 +12,12 @@ from negotiationarena.constants import (
     ACCEPTING_TAG,
 )
 
-from negotiationarena.utils import extract_multiple_tags
+from negotiationarena.utils import extract_multiple_tags, TagIndex
 from games.buy_sell_game.prompt import buy_sell_prompt
 from negotiationarena.parser import ExchangeGameDefaultParser
 from negotiationarena.agent_message import AgentMessage
+from negotiationarena.validation import MoveValidator
+from negotiationarena.game_objects.records import SettingsRecord, SummaryRecord
 
 BUYER_ALIGN_PROMPT = """
 YYou are Player BLUE, the BUYER.
@@ -271,9 +273,24 @@ END OF BUYER PROMPT
 ----------------------------------------------------------------
 """
 
+
 class BuySellGameDefaultParser(ExchangeGameDefaultParser):
-    def __init__(self):
+    response_tags = [
+        PROPOSAL_COUNT_TAG,
+        RESOURCES_TAG,
+        GOALS_TAG,
+        REASONING_TAG,
+        PLAYER_ANSWER_TAG,
+        PROPOSED_TRADE_TAG,
+        MESSAGE_TAG,
+    ]
+
+    def __init__(self, buyer_prompt=BUYER_ALIGN_PROMPT):
+        """
+        :param buyer_prompt: prompt of the buyer, None to give the buyer the same prompt as the seller
+        """
         super().__init__()
+        self.buyer_prompt = buyer_prompt
 
     def instantiate_prompt(
         self,
@@ -283,8 +300,11 @@ class BuySellGameDefaultParser(ExchangeGameDefaultParser):
         maximum_number_of_proposals,
         player_social_behaviour,
     ):
-        if isinstance(player_goal, BuyerGoal):
-          return BUYER_ALIGN_PROMPT
+        if (
+            isinstance(player_goal, BuyerGoal)
+            and self.buyer_prompt is not None
+        ):
+            return self.buyer_prompt
         return buy_sell_prompt(
             resources_available_in_game,
             starting_initial_resources,
@@ -303,6 +323,7 @@ class BuySellGameDefaultParser(ExchangeGameDefaultParser):
         :param response:
         :return:
         """
+        tags = TagIndex(response)
         (
             resources,
             goal,
@@ -312,7 +333,7 @@ class BuySellGameDefaultParser(ExchangeGameDefaultParser):
             proposal_count,
             trade,
         ) = extract_multiple_tags(
-            response,
+            tags,
             [
                 RESOURCES_TAG,
                 GOALS_TAG,
@@ -324,7 +345,7 @@ class BuySellGameDefaultParser(ExchangeGameDefaultParser):
             ],
         )
         resources = Resources.from_string(resources)
-        trade = self.parse_trade(response, PROPOSED_TRADE_TAG)
+        trade = self.parse_trade(tags, PROPOSED_TRADE_TAG)
 
         # create the message, we are going to split between public messages and secret messages.
 
@@ -372,10 +393,8 @@ class BuySellGame(AlternatingGameEndsOnTag):
         resources_support_set = Resources(resources_support_set)
 
         self.game_state = [
-            {
-                "current_iteration": "START",
-                "turn": "None",
-                "settings": dict(
+            SettingsRecord(
+                settings=dict(
                     resources_support_set=resources_support_set,
                     player_goals=player_goals,
                     player_initial_resources=player_starting_resources,
@@ -383,7 +402,7 @@ class BuySellGame(AlternatingGameEndsOnTag):
                     player_roles=player_conversation_roles,
                     player_valuation=[g.get_valuation() for g in player_goals],
                 ),
-            }
+            )
         ]
 
         # we are going to set all the parameter we might need later
@@ -399,6 +418,10 @@ class BuySellGame(AlternatingGameEndsOnTag):
             else game_interface
         )
 
+        self.game_interface.set_resources(
+            resources_support_set, *player_starting_resources
+        )
+
         # init players
         self.init_players()
 
@@ -421,6 +444,13 @@ class BuySellGame(AlternatingGameEndsOnTag):
 
             player.init_agent(game_prompt, settings["player_roles"][idx])
 
+    def move_validator(self, player_index):
+        return MoveValidator(
+            self.game_interface,
+            self.game_state[0]["settings"]["player_initial_resources"],
+            maximum_number_of_proposals=self.iterations // 2 - 1,
+        )
+
     def after_game_ends(self):
         """
         This method is called after the game ends. For example
@@ -433,16 +463,12 @@ class BuySellGame(AlternatingGameEndsOnTag):
         end_state = self.game_state[-1]
 
         # if there is only one iteration, we are going to set the game state to END
-        if int(end_state["current_iteration"]) <= 1:
-            datum = dict(
-                current_iteration="END",
-                turn="None",
-            )
-            self.game_state.append(datum)
+        if int(end_state.current_iteration) <= 1:
+            self.game_state.append(SummaryRecord())
         else:
             # we compute the outcome of the game
 
-            player_response = end_state["player_public_info_dict"][
+            player_response = end_state.player_public_info_dict[
                 PLAYER_ANSWER_TAG
             ]
             initial_resources = self.game_state[0]["settings"][
@@ -452,7 +478,7 @@ class BuySellGame(AlternatingGameEndsOnTag):
                 "player_valuation"
             ]
             player_goals = self.game_state[0]["settings"]["player_goals"]
-            proposed_trade = self.game_state[-2]["player_public_info_dict"][
+            proposed_trade = self.game_state[-2].player_public_info_dict[
                 PROPOSED_TRADE_TAG
             ]
 
@@ -473,9 +499,7 @@ class BuySellGame(AlternatingGameEndsOnTag):
                 )
             ]
 
-            datum = dict(
-                current_iteration="END",
-                turn="None",
+            datum = SummaryRecord(
                 summary=dict(
                     player_goals=player_goals,
                     player_initial_resources=initial_resources,
@@ -4,6 +4,11 @@ from negotiationarena.constants import *
 from negotiationarena.utils import *
 from negotiationarena.agent_message import AgentMessage
 from games.simple_game.prompt import simple_game_prompt
+from negotiationarena.game_objects.records import (
+    Record,
+    SettingsRecord,
+    SummaryRecord,
+)
 from typing import List
 
 
@@ -12,11 +17,12 @@ class SimpleGameDefaultParser(ExchangeGameDefaultParser):
         return simple_game_prompt(initial_resources, social_behavior)
 
     def parse(self, response):
+        tags = TagIndex(response)
         ms = AgentMessage()
 
-        answer = get_tag_contents(response, PLAYER_ANSWER_TAG)
-        message = get_tag_contents(response, MESSAGE_TAG)
-        trade = self.parse_trade(response, PROPOSED_TRADE_TAG)
+        answer = get_tag_contents(tags, PLAYER_ANSWER_TAG)
+        message = get_tag_contents(tags, MESSAGE_TAG)
+        trade = self.parse_trade(tags, PROPOSED_TRADE_TAG)
 
         ms.add_public(MESSAGE_TAG, message)
         ms.add_public(PLAYER_ANSWER_TAG, answer)
@@ -42,17 +48,15 @@ class SimpleGame(AlternatingGameEndsOnTag):
         # Game State    #
         #################
 
-        self.game_state: List[dict] = [
-            {
-                "current_iteration": "START",
-                "turn": "None",
-                "settings": dict(
+        self.game_state: List[Record] = [
+            SettingsRecord(
+                settings=dict(
                     resources_support_set=resources_support_set,
                     player_initial_resources=player_initial_resources,
                     player_roles=player_roles,
                     player_social_behaviour=player_social_behaviour,
                 ),
-            }
+            )
         ]
 
         self.resources_support_set = resources_support_set
@@ -85,7 +89,7 @@ class SimpleGame(AlternatingGameEndsOnTag):
 
         state = self.game_state[-1]
         if state:
-            response = state["player_public_info_dict"].get(
+            response = state.player_public_info_dict.get(
                 PLAYER_ANSWER_TAG, REFUSING_OR_WAIT_TAG
             )
 
@@ -96,6 +100,6 @@ class SimpleGame(AlternatingGameEndsOnTag):
         return False
 
     def after_game_ends(self):
-        datum = dict(current_iteration="END", turn="None", summary=dict())
+        datum = SummaryRecord(summary=dict())
 
         self.game_state.append(datum)
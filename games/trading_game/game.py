@@ -3,6 +3,10 @@ import sys
 sys.path.append(".")
 from negotiationarena.alternating_game import AlternatingGameEndsOnTag
 from negotiationarena.constants import *
+from negotiationarena.validation import MoveValidator
+from negotiationarena.game_objects.records import SettingsRecord, SummaryRecord
+from negotiationarena.game_objects.goal import ResourceGoal
+from negotiationarena.bargaining import outcome_efficiency
 from games.trading_game.interface import TradingGameDefaultParser
 
 
@@ -17,25 +21,24 @@ class TradingGame(AlternatingGameEndsOnTag):
         game_interface=None,
         **kwargs
     ):
+        super().__init__(**kwargs)
+
+        # set after the base class, which resets the interface
         self.game_interface = (
             TradingGameDefaultParser()
             if game_interface is None
             else game_interface
         )
-
-        super().__init__(**kwargs)
         self.game_state = [
-            {
-                "current_iteration": "START",
-                "turn": "None",
-                "settings": dict(
+            SettingsRecord(
+                settings=dict(
                     resources_support_set=resources_support_set,
                     player_goals=player_goals,
                     player_initial_resources=player_initial_resources,
                     player_social_behaviour=player_social_behaviour,
                     player_roles=player_roles,
                 ),
-            }
+            )
         ]
         self.resources_support_set = resources_support_set
         self.player_goals = player_goals
@@ -43,6 +46,10 @@ class TradingGame(AlternatingGameEndsOnTag):
         self.player_social_behaviour = player_social_behaviour
         self.player_roles = player_roles
 
+        self.game_interface.set_resources(
+            resources_support_set, *player_initial_resources
+        )
+
         # init players
         self.init_players()
 
@@ -61,6 +68,13 @@ class TradingGame(AlternatingGameEndsOnTag):
             )
             player.init_agent(game_prompt, settings["player_roles"][idx])
 
+    def move_validator(self, player_index):
+        return MoveValidator(
+            self.game_interface,
+            self.game_state[0]["settings"]["player_initial_resources"],
+            maximum_number_of_proposals=self.iterations // 2 - 1,
+        )
+
     def after_game_ends(self):
         initial_resources = self.game_state[0]["settings"][
             "player_initial_resources"
@@ -71,11 +85,11 @@ class TradingGame(AlternatingGameEndsOnTag):
         end_state = self.game_state[-1]
 
         # and because of the above the accepted trade is the second to last one
-        proposed_trade = self.game_state[-2]["player_public_info_dict"][
+        proposed_trade = self.game_state[-2].player_public_info_dict[
             PROPOSED_TRADE_TAG
         ]
 
-        player_answer = end_state["player_public_info_dict"][PLAYER_ANSWER_TAG]
+        player_answer = end_state.player_public_info_dict[PLAYER_ANSWER_TAG]
 
         # if player accepted the trade we update the actual resources fo each player
         if player_answer == ACCEPTING_TAG:
@@ -94,18 +108,25 @@ class TradingGame(AlternatingGameEndsOnTag):
             for goal, final in zip(player_goals, final_resources)
         ]
 
-        # log stuff into the state
-        datum = dict(
-            current_iteration="END",
-            turn="None",
-            summary=dict(
-                player_goals=player_goals,
-                initial_resources=initial_resources,
-                proposed_trade=proposed_trade,
-                final_response=player_answer,
-                final_resources=final_resources,
-                player_outcome=outcome,
-            ),
+        summary = dict(
+            player_goals=player_goals,
+            initial_resources=initial_resources,
+            proposed_trade=proposed_trade,
+            final_response=player_answer,
+            final_resources=final_resources,
+            player_outcome=outcome,
         )
+        # how the outcome compares with the bargaining solutions of the scenario
+        if all(isinstance(goal, ResourceGoal) for goal in player_goals):
+            summary.update(
+                outcome_efficiency(
+                    initial_resources,
+                    player_goals,
+                    proposed_trade if player_answer == ACCEPTING_TAG else None,
+                )
+            )
+
+        # log stuff into the state
+        datum = SummaryRecord(summary=summary)
 
         self.game_state.append(datum)
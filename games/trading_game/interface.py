@@ -25,6 +25,16 @@ class TradingAgentMessage(AgentMessageInterface):
 
 
 class TradingGameDefaultParser(ExchangeGameDefaultParser):
+    response_tags = [
+        MY_NAME_TAG,
+        RESOURCES_TAG,
+        GOALS_TAG,
+        REASONING_TAG,
+        PLAYER_ANSWER_TAG,
+        MESSAGE_TAG,
+        PROPOSED_TRADE_TAG,
+    ]
+
     def __init__(self):
         super().__init__()
 
@@ -47,17 +57,18 @@ class TradingGameDefaultParser(ExchangeGameDefaultParser):
         )
 
     def parse(self, response):
+        tags = TagIndex(response)
         ms = TradingAgentMessage()
 
         resources = Resources.from_string(
-            get_tag_contents(response, RESOURCES_TAG)
+            get_tag_contents(tags, RESOURCES_TAG)
         )
-        goal = get_tag_contents(response, GOALS_TAG)
-        answer = get_tag_contents(response, PLAYER_ANSWER_TAG)
-        reasoning = get_tag_contents(response, REASONING_TAG)
-        message = get_tag_contents(response, MESSAGE_TAG)
-        trade = self.parse_trade(response, PROPOSED_TRADE_TAG)
-        my_name = get_tag_contents(response, MY_NAME_TAG)
+        goal = get_tag_contents(tags, GOALS_TAG)
+        answer = get_tag_contents(tags, PLAYER_ANSWER_TAG)
+        reasoning = get_tag_contents(tags, REASONING_TAG)
+        message = get_tag_contents(tags, MESSAGE_TAG)
+        trade = self.parse_trade(tags, PROPOSED_TRADE_TAG)
+        my_name = get_tag_contents(tags, MY_NAME_TAG)
 
         ms.add_public(MESSAGE_TAG, message)
         ms.add_public(PLAYER_ANSWER_TAG, answer)
@@ -1,5 +1,11 @@
 from negotiationarena.alternating_game import AlternatingGame
 from negotiationarena.constants import *
+from negotiationarena.validation import MoveValidator
+from negotiationarena.simulation import (
+    ultimatum_moves,
+    ultimatum_proposal_limits,
+)
+from negotiationarena.game_objects.records import SettingsRecord, SummaryRecord
 from games.ultimatum.interface import UltimatumGameDefaultParser
 
 
@@ -23,17 +29,15 @@ class MultiTurnUltimatumGame(AlternatingGame):
         )
 
         self.game_state = [
-            {
-                "current_iteration": "START",
-                "turn": "None",
-                "settings": dict(
+            SettingsRecord(
+                settings=dict(
                     resources_support_set=resources_support_set,
                     player_goals=player_goals,
                     player_initial_resources=player_initial_resources,
                     player_social_behaviour=player_social_behaviour,
                     player_roles=player_roles,
                 ),
-            }
+            )
         ]
         self.resources_support_set = resources_support_set
         self.player_goals = player_goals
@@ -41,6 +45,10 @@ class MultiTurnUltimatumGame(AlternatingGame):
         self.player_social_behaviour = player_social_behaviour
         self.player_roles = player_roles
 
+        self.game_interface.set_resources(
+            resources_support_set, *player_initial_resources
+        )
+
         # init players
         self.init_players()
 
@@ -56,21 +64,32 @@ class MultiTurnUltimatumGame(AlternatingGame):
                 ].only_keys(),
                 initial_resources=settings["player_initial_resources"][idx],
                 iterations=self.iterations,
-                number_of_proposals=self.iterations // 2,
+                number_of_moves=[
+                    int(moves) for moves in ultimatum_moves(self.iterations)
+                ],
                 social_behaviour=settings["player_social_behaviour"][idx],
             )
             player.init_agent(game_prompt, settings["player_roles"][idx])
 
+    def move_validator(self, player_index):
+        # the player with the last move cannot make a proposal on that move, as the prompt says
+        limits = ultimatum_proposal_limits(self.iterations)
+        return MoveValidator(
+            self.game_interface,
+            self.game_state[0]["settings"]["player_initial_resources"],
+            maximum_number_of_proposals=int(limits[player_index]),
+        )
+
     def game_over(self):
         """
         game over logic based on game state
         """
         state = self.game_state[-1]
         if state:
-            response = state["player_public_info_dict"].get(
+            response = state.player_public_info_dict.get(
                 PLAYER_ANSWER_TAG, REFUSING_OR_WAIT_TAG
             )
-            iteration = state.get("current_iteration", 0)
+            iteration = state.current_iteration
             if (
                 response in [ACCEPTING_TAG, REJECTION_TAG]
                 or iteration == self.iterations
@@ -89,11 +108,11 @@ class MultiTurnUltimatumGame(AlternatingGame):
         end_state = self.game_state[-1]
 
         # and because of the above the accepted trade is the second to last one
-        proposed_trade = self.game_state[-2]["player_public_info_dict"][
+        proposed_trade = self.game_state[-2].player_public_info_dict[
             PROPOSED_TRADE_TAG
         ]
 
-        player_answer = end_state["player_public_info_dict"][PLAYER_ANSWER_TAG]
+        player_answer = end_state.player_public_info_dict[PLAYER_ANSWER_TAG]
 
         # if the player did not reach an agreement, they keep their initial resources
         if player_answer == ACCEPTING_TAG:
@@ -112,9 +131,7 @@ class MultiTurnUltimatumGame(AlternatingGame):
         # grab correct payoff for player 1
         outcome[0] = final_resources[0]
 
-        datum = dict(
-            current_iteration="END",
-            turn="None",
+        datum = SummaryRecord(
             summary=dict(
                 player_goals=player_goals,
                 initial_resources=initial_resources,
@@ -26,6 +26,16 @@ class UltimatumMultiTurnAgentMessage(AgentMessageInterface):
 
 
 class UltimatumGameDefaultParser(ExchangeGameDefaultParser):
+    response_tags = [
+        MY_NAME_TAG,
+        TURN_OR_MOVE_TAG,
+        RESOURCES_TAG,
+        REASONING_TAG,
+        PLAYER_ANSWER_TAG,
+        MESSAGE_TAG,
+        PROPOSED_TRADE_TAG,
+    ]
+
     def __init__(self):
         super().__init__()
 
@@ -35,7 +45,7 @@ class UltimatumGameDefaultParser(ExchangeGameDefaultParser):
         resources_in_game,
         initial_resources,
         iterations,
-        number_of_proposals,
+        number_of_moves,
         social_behaviour,
     ):
         return ultimatum_prompt(
@@ -43,19 +53,20 @@ class UltimatumGameDefaultParser(ExchangeGameDefaultParser):
             resources_in_game,
             initial_resources,
             iterations,
-            number_of_proposals,
+            number_of_moves,
             social_behaviour,
         )
 
     def parse(self, response):
-        move_count = get_tag_contents(response, TURN_OR_MOVE_TAG)
+        tags = TagIndex(response)
+        move_count = get_tag_contents(tags, TURN_OR_MOVE_TAG)
         resources = Resources.from_string(
-            get_tag_contents(response, RESOURCES_TAG)
+            get_tag_contents(tags, RESOURCES_TAG)
         )
-        answer = get_tag_contents(response, PLAYER_ANSWER_TAG)
-        reasoning = get_tag_contents(response, REASONING_TAG)
-        message = get_tag_contents(response, MESSAGE_TAG)
-        trade = self.parse_trade(response, PROPOSED_TRADE_TAG)
+        answer = get_tag_contents(tags, PLAYER_ANSWER_TAG)
+        reasoning = get_tag_contents(tags, REASONING_TAG)
+        message = get_tag_contents(tags, MESSAGE_TAG)
+        trade = self.parse_trade(tags, PROPOSED_TRADE_TAG)
 
         ms = UltimatumMultiTurnAgentMessage()
 
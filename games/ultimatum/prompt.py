@@ -6,16 +6,12 @@ def ultimatum_prompt(
     resources_in_game,
     initial_resources,
     iterations,
-    number_of_proposals,
+    number_of_moves,
     social_behaviour,
 ):
-    agent_one_proposals = (
-        number_of_proposals + 1 if iterations % 2 else number_of_proposals
-    )
-    agent_two_proposals = number_of_proposals
-    proposal_limit = (
-        number_of_proposals + 1 if iterations % 2 else number_of_proposals
-    )
+    agent_one_proposals, agent_two_proposals = number_of_moves
+    # the player with the last move cannot propose on it
+    proposal_limit = number_of_moves[(iterations - 1) % 2]
 
     prompt = f""""You are playing a game involving a split of resources. 
 {AGENT_ONE} starts with {player_1_initial_resources}, {AGENT_TWO} has none to trade.
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from negotiationarena.utils import from_name_and_tag_to_message
 
 
-class AgentMessage:
+class AgentMessageInterface(ABC):
     """
     Structured format for agent messages.
     Should define what agents can see of each other messages.
@@ -27,6 +27,16 @@ class AgentMessage:
     def add_secret(self, key, message):
         self.secret[key] = message
 
+    @abstractmethod
+    def message_to_other_player(self):
+        pass
+
+
+class AgentMessage(AgentMessageInterface):
+    """
+    By default the other player sees all the public messages.
+    """
+
     def message_to_other_player(self):
         response = []
         for key, value in self.public.items():
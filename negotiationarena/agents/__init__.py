@@ -1,3 +1,4 @@
 from .chatgpt import ChatGPTAgent
 from .claude import ClaudeAgent
 from .llama2 import LLama2ChatAgent
+from .scripted import ScriptedAgent
@@ -4,16 +4,61 @@ from negotiationarena.constants import REASONING_TAG
 
 
 class SelfCheckingAgent(Agent, ABC):
+    """
+    Agent that double checks its answers.
+
+    If a `validator` is set, the agent double checks only when the validator rejects the first
+    answer. A validator is a callable that takes the raw response and returns the list of problems found
+    (see negotiationarena.validation.MoveValidator). Without a validator the agent always double checks.
+    """
+
+    validator = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.self_check_stats = dict(
+            answers=0, reflections=0, changed=0, fixed=0
+        )
+
+    def set_validator(self, validator):
+        self.validator = validator
+
+    def reflection_prompt(self, issues):
+        prompt = "Double check your proposal."
+        if issues:
+            prompt += "\n" + "\n".join(issues)
+        return prompt
+
     def think(self):
         # do one step of thinking
-        super().think()
+        response = super().think()
+        self.self_check_stats["answers"] += 1
+
+        issues = None if self.validator is None else self.validator(response)
+        if issues is not None and not issues:
+            return response
+
         # print("reflecting!")
         # prompt agent to check proposal
         self.update_conversation_tracking(
-            "user", "Double check your proposal."
+            "user", self.reflection_prompt(issues)
         )
         # think again
-        return super().think()
+        checked_response = super().think()
+
+        self.self_check_stats["reflections"] += 1
+        if checked_response.split() != response.split():
+            self.self_check_stats["changed"] += 1
+        if issues and not self.validator(checked_response):
+            self.self_check_stats["fixed"] += 1
+
+        return checked_response
+
+    def get_state(self):
+        state = super().get_state()
+        # the validator is set by whoever runs the agent, it is not part of the agent state
+        state.pop("validator", None)
+        return state
 
 
 class ReasoningAgent(Agent, ABC):
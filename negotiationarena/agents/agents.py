@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 import copy
 from negotiationarena.constants import *
+from negotiationarena.usage import empty_usage, usage_cost, add_usage
+from negotiationarena.profiling import timed
 from copy import deepcopy
 
 
@@ -25,6 +27,12 @@ class Agent(ABC):
 
         self.prompt_entity_initializer = None
 
+        # token usage of all the calls, and of the calls not yet collected by the game
+        self.usage = empty_usage()
+        self.pending_usage = empty_usage()
+        # time spent in each phase of the calls not yet collected by the game
+        self.pending_timings = {}
+
         if self.agent_name not in [AGENT_ONE, AGENT_TWO]:
             raise ValueError(
                 f"Agent name must be either {AGENT_ONE} or {AGENT_TWO}"
@@ -38,6 +46,48 @@ class Agent(ABC):
     def update_conversation_tracking(self, entity, message):
         pass
 
+    def record_usage(self, prompt_tokens, completion_tokens, cached_tokens=0):
+        """
+        Called by `chat` implementations to keep track of the tokens used by each call.
+
+        :param prompt_tokens:
+        :param completion_tokens:
+        :param cached_tokens:
+        :return:
+        """
+        usage = dict(
+            calls=1,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            cost=usage_cost(
+                self.model, prompt_tokens, completion_tokens, cached_tokens
+            ),
+        )
+        add_usage(self.usage, usage)
+        add_usage(self.pending_usage, usage)
+
+    def collect_usage(self):
+        """
+        Returns the usage of the calls made since the last time usage was collected.
+        """
+        usage = self.pending_usage
+        self.pending_usage = empty_usage()
+        return usage
+
+    def record_timing(self, phase, seconds):
+        self.pending_timings[phase] = (
+            self.pending_timings.get(phase, 0.0) + seconds
+        )
+
+    def collect_timings(self):
+        """
+        Returns the timings of the calls made since the last time timings were collected.
+        """
+        timings = self.pending_timings
+        self.pending_timings = {}
+        return timings
+
     def set_state(self, state_dict):
         self.conversation = state_dict["conversation"]
         self.run_epoch_time_ms = state_dict["run_epoch_time_ms"]
@@ -71,7 +121,8 @@ class Agent(ABC):
         :return:
         """
         # call agent / make agent think
-        response = self.chat()
+        with timed(self.pending_timings, "request"):
+            response = self.chat()
 
         # update agent history
         self.update_conversation_tracking("assistant", response)
@@ -74,6 +74,14 @@ class ChatGPTAgent(Agent):
             seed=self.seed,
         )
 
+        if chat.usage is not None:
+            details = chat.usage.prompt_tokens_details
+            self.record_usage(
+                chat.usage.prompt_tokens,
+                chat.usage.completion_tokens,
+                getattr(details, "cached_tokens", None) or 0,
+            )
+
         return chat.choices[0].message.content
 
     def update_conversation_tracking(self, role, message):
@@ -81,5 +89,6 @@ class ChatGPTAgent(Agent):
 
 
 class SelfCheckingChatGPTAgent(ChatGPTAgent, SelfCheckingAgent):
-    def __init__(self, **kwargs):
+    def __init__(self, validator=None, **kwargs):
         super().__init__(**kwargs)
+        self.validator = validator
@@ -1,6 +1,7 @@
 import os
 from anthropic import Anthropic, HUMAN_PROMPT, AI_PROMPT
 from negotiationarena.agents.agents import Agent
+from negotiationarena.profiling import timed
 import time
 from copy import copy, deepcopy
 from negotiationarena.constants import AGENT_TWO, AGENT_ONE
@@ -27,6 +28,8 @@ class ClaudeAgent(Agent):
         self.anthropic = Anthropic(
             # defaults to os.environ.get("ANTHROPIC_API_KEY")
             api_key=os.environ.get("ANTHROPIC_API_KEY"),
+            # e.g., a local server for load tests
+            base_url=os.environ.get("ANTHROPIC_BASE_URL"),
         )
 
     def init_agent(self, system_prompt, role):
@@ -103,7 +106,14 @@ class ClaudeAgent(Agent):
             temperature=0.7,
             prompt=t,
         )
-        time.sleep(0.2)
+        # the completion API does not return usage, we count the tokens locally
+        self.record_usage(
+            self.anthropic.count_tokens(t),
+            self.anthropic.count_tokens(completion.completion),
+        )
+        # we wait a bit between requests to stay within the rate limits
+        with timed(self.pending_timings, "throttle"):
+            time.sleep(0.2)
         return completion.completion
 
     def update_conversation_tracking(self, role, message):
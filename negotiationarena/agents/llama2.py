@@ -31,7 +31,9 @@ class LLama2ChatAgent(Agent):
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.client = openai.OpenAI(
-            base_url="https://api.endpoints.anyscale.com/v1",
+            base_url=os.environ.get(
+                "ANY_SCALE_BASE_URL", "https://api.endpoints.anyscale.com/v1"
+            ),
             api_key=os.environ.get("ANY_SCALE"),
         )
 
@@ -72,6 +74,11 @@ class LLama2ChatAgent(Agent):
             messages=self.conversation,
             temperature=0.7,
         )
+        if chat_completion.usage is not None:
+            self.record_usage(
+                chat_completion.usage.prompt_tokens,
+                chat_completion.usage.completion_tokens,
+            )
         return chat_completion.choices[0].message.content
 
     def update_conversation_tracking(self, role, message):
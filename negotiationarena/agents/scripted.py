@@ -0,0 +1,47 @@
+import time
+from negotiationarena.agents.agents import Agent
+from negotiationarena.constants import AGENT_TWO, AGENT_ONE
+
+
+class ScriptedAgent(Agent):
+    """
+    Agent that answers without calling a model: no latency and no token usage. Useful to benchmark the engine and
+    to run games offline.
+
+    Answers come from `reply`. By default `reply` goes through the list `replies` and repeats the last one when
+    the list runs out, subclasses can override it to compute the answer from the conversation.
+    """
+
+    def __init__(self, agent_name: str, replies=None, model="scripted"):
+        super().__init__(agent_name)
+        self.run_epoch_time_ms = str(round(time.time() * 1000))
+        self.model = model
+        self.conversation = []
+        self.prompt_entity_initializer = "system"
+        self.replies = [] if replies is None else list(replies)
+        self.replies_made = 0
+
+    def init_agent(self, system_prompt, role):
+        # same conversation layout as the chat agents
+        if AGENT_ONE in self.agent_name:
+            self.update_conversation_tracking(
+                self.prompt_entity_initializer, system_prompt
+            )
+            self.update_conversation_tracking("user", role)
+        elif AGENT_TWO in self.agent_name:
+            self.update_conversation_tracking(
+                self.prompt_entity_initializer, system_prompt + role
+            )
+
+    def reply(self):
+        if not self.replies:
+            raise ValueError("{} has nothing to say".format(self.agent_name))
+        return self.replies[min(self.replies_made, len(self.replies) - 1)]
+
+    def chat(self):
+        response = self.reply()
+        self.replies_made += 1
+        return response
+
+    def update_conversation_tracking(self, role, message):
+        self.conversation.append({"role": role, "content": message})
@@ -0,0 +1,328 @@
+"""
+Rule-based negotiation strategies.
+
+These agents answer with valid protocol text without calling a model, so thousands of games can be played
+through the real engine: to get baselines, to have cheap opponents for the LLM agents and to pre-screen game
+configurations before spending tokens on them.
+
+Every offer of the games we have can be described by a single number, the `value` of the offer:
+
+    - BuySellGame: the price paid for the object (PriceIssue)
+    - MultiTurnUltimatumGame: the amount RED gives to BLUE (SplitIssue)
+    - TradingGame: how much of the other resource we get for a fixed amount of ours (SwapIssue)
+
+An agent knows its `best` value (the opening offer) and its `reservation` value (the worst deal it accepts),
+the strategy decides how to move from one to the other. The utility of an offer is normalized so that the
+best value has utility 1 and the reservation value utility 0.
+
+The number of proposals an agent can make is set by the game through `set_validator` (see
+AlternatingGame.install_validators), agents stop proposing when they run out of proposals.
+"""
+
+import math
+from abc import abstractmethod
+from negotiationarena.agents.scripted import ScriptedAgent
+from negotiationarena.game_objects.trade import parse_trade_string
+from negotiationarena.constants import *
+from negotiationarena.utils import TagIndex
+
+# parsed trades are keyed by color
+TRADE_KEYS = {AGENT_ONE: "RED", AGENT_TWO: "BLUE"}
+
+
+def proposed_trade_in(message):
+    """
+    The trade proposed by the other player in the message we received, empty if there is none.
+    """
+    tags = TagIndex(message)
+    if OTHER_PLAYER_PROPOSED_TRADE in tags.spans:
+        return tags.get(OTHER_PLAYER_PROPOSED_TRADE)
+    # the buy-sell game sends the tags the other way round: <trade> newly proposed trade </trade>
+    for tag in tags.spans:
+        if tags.get(tag).strip() == PROPOSED_TRADE_TAG:
+            return tag
+    return ""
+
+
+class PriceIssue:
+    """
+    RED sells `quantity` units of `good` to BLUE, the value is the price.
+    """
+
+    def __init__(self, good="X", quantity=1, money=MONEY_TOKEN):
+        self.good = good
+        self.quantity = quantity
+        self.money = money
+
+    def to_trade(self, value):
+        return f"{AGENT_ONE} Gives {self.good}: {self.quantity} | {AGENT_TWO} Gives {self.money}: {value}"
+
+    def from_trade(self, trade):
+        if (
+            trade.get(TRADE_KEYS[AGENT_ONE], {}).get(self.good)
+            != self.quantity
+        ):
+            return None
+        return trade.get(TRADE_KEYS[AGENT_TWO], {}).get(self.money, 0)
+
+
+class SplitIssue:
+    """
+    RED gives part of its `resource` to BLUE, the value is the amount given.
+    """
+
+    def __init__(self, resource="Dollars"):
+        self.resource = resource
+
+    def to_trade(self, value):
+        return f"{AGENT_ONE} Gives {self.resource}: {value} | {AGENT_TWO} Gives {self.resource}: 0"
+
+    def from_trade(self, trade):
+        if trade.get(TRADE_KEYS[AGENT_TWO], {}).get(self.resource, 0):
+            return None
+        return trade.get(TRADE_KEYS[AGENT_ONE], {}).get(self.resource, 0)
+
+
+class SwapIssue:
+    """
+    `giver` gives `amount` of `give` for some of `get`, the value is the amount of `get` received.
+    """
+
+    def __init__(self, giver, give, amount, get):
+        self.giver = giver
+        self.receiver = AGENT_TWO if giver == AGENT_ONE else AGENT_ONE
+        self.give = give
+        self.amount = amount
+        self.get = get
+
+    def to_trade(self, value):
+        sides = {
+            self.giver: f"{self.give}: {self.amount}",
+            self.receiver: f"{self.get}: {value}",
+        }
+        return " | ".join(
+            f"{player} Gives {sides[player]}"
+            for player in [AGENT_ONE, AGENT_TWO]
+        )
+
+    def from_trade(self, trade):
+        if trade.get(TRADE_KEYS[self.giver], {}) != {self.give: self.amount}:
+            return None
+        return trade.get(TRADE_KEYS[self.receiver], {}).get(self.get, 0)
+
+
+class StrategyAgent(ScriptedAgent):
+    """
+    Base class of the rule-based agents, subclasses implement `target_utility`.
+
+    The agent accepts the offer of the other player if it is at least as good as the offer it would make
+    next. When it cannot propose anymore it accepts any offer above its reservation value.
+    """
+
+    def __init__(
+        self,
+        agent_name,
+        game_interface,
+        issue,
+        best,
+        reservation,
+        resources="",
+        goals="",
+        message="",
+        model=None,
+    ):
+        """
+        :param game_interface: the parser of the game, used to write the answers
+        :param issue: what the offers are about (PriceIssue, SplitIssue or SwapIssue)
+        :param best: opening value
+        :param reservation: worst value the agent accepts
+        :param resources: written in the resources tag
+        :param goals: written in the goals tag
+        :param message: message sent with every answer
+        """
+        super().__init__(
+            agent_name, model=model or type(self).__name__.lower()
+        )
+        self.game_interface = game_interface
+        self.issue = issue
+        self.best = best
+        self.reservation = reservation
+        self.resources = resources
+        self.goals = goals
+        self.message = message
+        self.validator = None
+        self.maximum_number_of_proposals = None
+        self.proposals_made = 0
+        # values offered by the other player, None when it did not make an offer we understand
+        self.received = []
+        self.offered = []
+
+    def set_validator(self, validator):
+        # we only need the number of proposals
+        self.maximum_number_of_proposals = (
+            validator.maximum_number_of_proposals
+        )
+
+    def utility(self, value):
+        if self.best == self.reservation:
+            return 1.0 if value == self.best else -1.0
+        return (value - self.reservation) / (self.best - self.reservation)
+
+    def value_of(self, utility):
+        value = self.reservation + utility * (self.best - self.reservation)
+        # round in our favour
+        return math.ceil(value) if self.best > self.reservation else int(value)
+
+    def time(self):
+        """
+        Fraction of the proposals already made, from 0 (first proposal) to 1 (last one).
+        """
+        if self.maximum_number_of_proposals is None:
+            return 0.0
+        if self.maximum_number_of_proposals == 0:
+            return 1.0
+        return min(
+            1.0,
+            self.proposals_made / max(1, self.maximum_number_of_proposals - 1),
+        )
+
+    @abstractmethod
+    def target_utility(self):
+        """
+        Utility of the next proposal, between 0 (the reservation value) and 1 (the best value).
+        """
+        pass
+
+    def can_propose(self):
+        return (
+            self.maximum_number_of_proposals is None
+            or self.proposals_made < self.maximum_number_of_proposals
+        )
+
+    def read_offer(self):
+        """
+        Value of the trade proposed by the other player in the last message, None if there is none.
+        """
+        message = self.conversation[-1]["content"] if self.conversation else ""
+        trade = proposed_trade_in(message).strip()
+        if not trade or trade.upper() == REFUSING_OR_WAIT_TAG:
+            return None
+        try:
+            return self.issue.from_trade(parse_trade_string(trade))
+        except Exception:
+            return None
+
+    def decide(self, offer):
+        """
+        :param offer: value of the offer of the other player, or None
+        :return: the answer and the value to propose (None to propose nothing)
+        """
+        if not self.can_propose():
+            if offer is not None and self.utility(offer) >= 0:
+                return ACCEPTING_TAG, None
+            return REFUSING_OR_WAIT_TAG, None
+
+        proposal = self.value_of(self.target_utility())
+        if offer is not None and self.utility(offer) >= self.utility(proposal):
+            return ACCEPTING_TAG, None
+        return REFUSING_OR_WAIT_TAG, proposal
+
+    def reply(self):
+        offer = self.read_offer()
+        self.received.append(offer)
+        answer, proposal = self.decide(offer)
+
+        if proposal is not None:
+            self.proposals_made += 1
+            self.offered.append(proposal)
+            trade = self.issue.to_trade(proposal)
+        else:
+            trade = REFUSING_OR_WAIT_TAG
+
+        return self.game_interface.format_response(
+            {
+                MY_NAME_TAG: self.agent_name,
+                TURN_OR_MOVE_TAG: self.replies_made + 1,
+                PROPOSAL_COUNT_TAG: self.proposals_made,
+                RESOURCES_TAG: self.resources,
+                GOALS_TAG: self.goals,
+                REASONING_TAG: type(self).__name__,
+                PLAYER_ANSWER_TAG: answer,
+                MESSAGE_TAG: self.message,
+                PROPOSED_TRADE_TAG: trade,
+            }
+        )
+
+    def get_state(self):
+        state = super().get_state()
+        state.pop("game_interface", None)
+        state.pop("issue", None)
+        return state
+
+
+class TimeDependentAgent(StrategyAgent):
+    """
+    Concedes with time: the target utility is 1 - t ** (1 / e), where t goes from 0 to 1 over the proposals.
+
+    e < 1 is a Boulware agent (concedes at the end), e > 1 a Conceder (concedes early), e = 1 is linear.
+    """
+
+    def __init__(self, *args, e=1.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.e = e
+
+    def target_utility(self):
+        return 1 - self.time() ** (1 / self.e)
+
+
+class BoulwareAgent(TimeDependentAgent):
+    def __init__(self, *args, e=0.2, **kwargs):
+        super().__init__(*args, e=e, **kwargs)
+
+
+class ConcederAgent(TimeDependentAgent):
+    def __init__(self, *args, e=5.0, **kwargs):
+        super().__init__(*args, e=e, **kwargs)
+
+
+class TitForTatAgent(StrategyAgent):
+    """
+    Opens with the best value and then concedes as much utility as the other player conceded with its last
+    offer (relative tit-for-tat). Offers of the other player are measured with our utility, so a concession of
+    the other player is an increase of our utility.
+    """
+
+    def target_utility(self):
+        if not self.offered:
+            return 1.0
+        offers = [o for o in self.received if o is not None]
+        previous = self.utility(self.offered[-1])
+        if len(offers) < 2:
+            return previous
+        conceded = self.utility(offers[-1]) - self.utility(offers[-2])
+        return min(1.0, max(0.0, previous - max(0.0, conceded)))
+
+
+class ReservationPriceAgent(StrategyAgent):
+    """
+    Always proposes the same value and accepts everything above its reservation value.
+    """
+
+    def target_utility(self):
+        return 1.0
+
+    def decide(self, offer):
+        if offer is not None and self.utility(offer) >= 0:
+            return ACCEPTING_TAG, None
+        if not self.can_propose():
+            return REFUSING_OR_WAIT_TAG, None
+        return REFUSING_OR_WAIT_TAG, self.best
+
+
+STRATEGIES = dict(
+    boulware=BoulwareAgent,
+    conceder=ConcederAgent,
+    linear=TimeDependentAgent,
+    tit_for_tat=TitForTatAgent,
+    reservation=ReservationPriceAgent,
+)
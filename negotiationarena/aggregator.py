@@ -0,0 +1,252 @@
+"""
+Streaming statistics of the game outcomes.
+
+The aggregator is fed by the games when they end (see AlternatingGame.game_end_listeners) and keeps, for each
+(game type, model pair, behaviour pair), running counts, means, variances, extremes and approximate quantiles
+of the payoffs, the acceptance rate, the length of the games and the tokens spent. Nothing is kept per game,
+reading the current numbers is O(1) and the whole state fits in a small JSON file.
+
+    aggregator = OutcomeAggregator(".logs/aggregate.json")
+    AlternatingGame.game_end_listeners.append(aggregator)
+    ... run games ...
+    aggregator.get("BuySellGame", ("gpt-4", "gpt-4"), ("", ""))["accepted"]["mean"]
+"""
+
+import os
+import json
+import threading
+from negotiationarena.evaluation import RunningStats, accepted, payoff
+from negotiationarena.game_objects.records import TurnRecord
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+class P2Quantile:
+    """
+    Approximate quantile of a stream with five markers (P-square algorithm, Jain and Chlamtac).
+    """
+
+    def __init__(self, p):
+        self.p = p
+        # the first five values, then the heights of the markers
+        self.q = []
+        self.n = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        q, n = self.q, self.n
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # move the middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (
+                d <= -1 and n[i - 1] - n[i] < -1
+            ):
+                d = 1 if d > 0 else -1
+                height = self.parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def parabolic(self, i, d):
+        q, n = self.q, self.n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self):
+        if not self.q:
+            return None
+        if len(self.q) < 5:
+            # exact with few values
+            return self.q[min(len(self.q) - 1, int(self.p * len(self.q)))]
+        return self.q[2]
+
+    def json(self):
+        return dict(p=self.p, q=self.q, n=self.n, desired=self.desired)
+
+    @classmethod
+    def from_json(cls, state):
+        quantile = cls(state["p"])
+        quantile.q, quantile.n = state["q"], state["n"]
+        quantile.desired = state["desired"]
+        return quantile
+
+
+class StreamingStats:
+    """
+    Count, mean, variance, min, max and approximate quantiles of a stream of numbers.
+    """
+
+    def __init__(self, quantiles=DEFAULT_QUANTILES):
+        self.stats = RunningStats()
+        self.min = None
+        self.max = None
+        self.quantiles = [P2Quantile(p) for p in quantiles]
+
+    def add(self, x):
+        x = float(x)
+        self.stats.add(x)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        for quantile in self.quantiles:
+            quantile.add(x)
+
+    def summary(self):
+        return dict(
+            **self.stats.json(),
+            min=self.min,
+            max=self.max,
+            **{f"q{q.p:g}": q.value for q in self.quantiles},
+        )
+
+    def json(self):
+        return dict(
+            n=self.stats.n,
+            mean=self.stats.mean,
+            m2=self.stats.m2,
+            min=self.min,
+            max=self.max,
+            quantiles=[q.json() for q in self.quantiles],
+        )
+
+    @classmethod
+    def from_json(cls, state):
+        stats = cls(quantiles=())
+        stats.stats.n = state["n"]
+        stats.stats.mean = state["mean"]
+        stats.stats.m2 = state["m2"]
+        stats.min, stats.max = state["min"], state["max"]
+        stats.quantiles = [P2Quantile.from_json(q) for q in state["quantiles"]]
+        return stats
+
+
+def game_metrics(game):
+    """
+    What we aggregate for a finished game.
+    """
+    usage = (game.game_state[-1].get("usage") or {}).get("total", {})
+    return dict(
+        payoff_1=payoff(0)(game),
+        payoff_2=payoff(1)(game),
+        accepted=accepted(game),
+        turns=sum(isinstance(s, TurnRecord) for s in game.game_state),
+        tokens=usage.get("prompt_tokens", 0)
+        + usage.get("completion_tokens", 0),
+        cost=usage.get("cost", 0.0),
+    )
+
+
+def game_key(game):
+    settings = game.game_state[0]["settings"]
+    return (
+        game.__class__.__name__,
+        tuple(getattr(p, "model", None) for p in game.players),
+        tuple(settings.get("player_social_behaviour", ("", ""))),
+    )
+
+
+class OutcomeAggregator:
+    """
+    Listener of the game end events, keeps StreamingStats of `game_metrics` per `game_key`.
+    """
+
+    def __init__(self, path=None, save_every=1):
+        """
+        :param path: where the state is persisted, loaded if it exists
+        :param save_every: save after this many games
+        """
+        self.path = path
+        self.save_every = save_every
+        self.groups = {}
+        self.pending = 0
+        # games can end in different threads (see league.play_concurrently)
+        self.lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __call__(self, game):
+        self.add_game(game)
+
+    def add_game(self, game):
+        self.add(game_key(game), game_metrics(game))
+
+    def add(self, key, metrics):
+        with self.lock:
+            group = self.groups.setdefault(key, {})
+            for name, value in metrics.items():
+                group.setdefault(name, StreamingStats()).add(value)
+            self.pending += 1
+            if self.path is not None and self.pending >= self.save_every:
+                self.save(self.path)
+
+    def get(self, game_type, models, behaviours):
+        """
+        :return: dict metric -> summary, empty if no game of this kind ended
+        """
+        group = self.groups.get((game_type, tuple(models), tuple(behaviours)))
+        if group is None:
+            return {}
+        return {name: stats.summary() for name, stats in group.items()}
+
+    def summary(self):
+        return [
+            dict(
+                game_type=key[0],
+                models=list(key[1]),
+                behaviours=list(key[2]),
+                **{name: stats.summary() for name, stats in group.items()},
+            )
+            for key, group in self.groups.items()
+        ]
+
+    def save(self, path):
+        state = [
+            dict(
+                key=[key[0], list(key[1]), list(key[2])],
+                metrics={name: stats.json() for name, stats in group.items()},
+            )
+            for key, group in self.groups.items()
+        ]
+        # readers never see a half written file
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        self.pending = 0
+
+    def load(self, path):
+        with open(path) as f:
+            state = json.load(f)
+        self.groups = {
+            (
+                entry["key"][0],
+                tuple(entry["key"][1]),
+                tuple(entry["key"][2]),
+            ): {
+                name: StreamingStats.from_json(stats)
+                for name, stats in entry["metrics"].items()
+            }
+            for entry in state
+        }
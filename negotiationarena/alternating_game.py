@@ -1,13 +1,18 @@
 import os
 import time
 import json
-from negotiationarena.constants import ACCEPTING_TAG
+from negotiationarena.constants import ACCEPTING_TAG, PROPOSED_TRADE_TAG
 import inspect
 from pathlib import Path
 from typing import List
 from abc import ABC, abstractmethod, abstractproperty
 from negotiationarena.game_objects.game import Game
 from negotiationarena.agents.agents import Agent
+from negotiationarena.game_objects.trade import Trade
+from negotiationarena.game_objects.records import TurnRecord, record_from_dict
+from negotiationarena.validation import MoveValidator
+from negotiationarena.usage import game_usage
+from negotiationarena.profiling import timed
 from negotiationarena.utils import get_next_filename
 from negotiationarena.constants import PLAYER_ANSWER_TAG
 
@@ -30,25 +35,34 @@ class AlternatingGame(Game):
 
     (6) `check_winner`: determines which player(s) won
 
+    Optionally, games can implement `move_validator` to reject illegal moves (e.g., trades that a player cannot
+    afford) before the turn is handed over to the other player.
 
+    Callables in `game_end_listeners` are called with the game once it is over and logged (e.g.,
+    negotiationarena.aggregator.OutcomeAggregator). The list is shared by all the games, a game can set its own.
     """
 
+    game_end_listeners = []
+
     def __init__(
         self,
         players: List[List],
         log_dir: str = ".logs",
         log_path=None,
         iterations: int = 8,
+        illegal_move_retries: int = 1,
     ):
         super().__init__(players=players, log_dir=log_dir, log_path=log_path)
 
         # default start with player 0
         self.turn = 0
-        # list of dict for simplicity
+        # list of records (see negotiationarena.game_objects.records)
         self.game_state = []
         self.iterations = iterations
         self.current_iteration = 1
         self.game_interface = None
+        # how many times an illegal move is sent back to the player before we accept it anyway
+        self.illegal_move_retries = illegal_move_retries
 
     @abstractmethod
     def game_over(self):
@@ -62,49 +76,118 @@ class AlternatingGame(Game):
         pass
 
     def read_iteration_message(self, iteration):
-        datum = self.game_state[iteration].get(
-            "player_public_answer_string", None
+        datum = getattr(
+            self.game_state[iteration], "player_public_answer_string", None
         )
         datum = {} if datum is None else datum
         return datum
 
+    def move_validator(self, player_index):
+        """
+        Local legality checks for the moves of a player (see negotiationarena.validation).
+        By default there are no rules to check.
+
+        :param player_index:
+        :return: a validator or None
+        """
+        return None
+
+    def proposals_made(self, player_index):
+        """
+        Number of proposals made so far by a player.
+        """
+        return sum(
+            isinstance(
+                state.player_public_info_dict.get(PROPOSED_TRADE_TAG), Trade
+            )
+            for state in self.game_state[1:]
+            if isinstance(state, TurnRecord) and state.turn == player_index
+        )
+
+    def check_move(self, response):
+        """
+        Runs the legality checks on the response of the current player.
+
+        :param response:
+        :return: list of problems, empty if the move is legal
+        """
+        validator = self.move_validator(self.turn)
+        if validator is None:
+            return []
+        validator.proposals_made = self.proposals_made(self.turn)
+        return validator(response)
+
+    def enforce_legal_move(self, response):
+        """
+        Illegal moves are sent back to the player that made them, the other player never sees them.
+
+        :param response:
+        :return: the first legal response, or the last one if the player ran out of retries
+        """
+        for _ in range(self.illegal_move_retries):
+            with timed(self.players[self.turn].pending_timings, "validation"):
+                issues = self.check_move(response)
+            if not issues:
+                break
+            print("Illegal move, sending it back to the player: ", issues)
+            response = self.players[self.turn].step(
+                "Your move is not valid:\n" + "\n".join(issues)
+            )
+        return response
+
+    def install_validators(self):
+        """
+        Self-checking agents use the rules of the game to decide when to double check.
+        """
+        for idx, player in enumerate(self.players):
+            if hasattr(player, "set_validator") and player.validator is None:
+                player.set_validator(self.move_validator(idx))
+
     def write_game_state(
         self,
         players,
         response,
     ):
-        try:
-            agent_message = self.game_interface.parse(response)
-        except Exception as e:
-            print("response : {}".format(response))
-            raise e
-
-        datum = dict(
-            current_iteration=self.current_iteration,
-            turn=self.turn,
-            player_public_answer_string=agent_message.message_to_other_player(),
-            player_public_info_dict=agent_message.public,
-            player_private_info_dict=agent_message.secret,
-            player_complete_answer=response,
-            player_state=[player.get_state() for player in players],
-        )
+        timings = players[self.turn].collect_timings()
+
+        with timed(timings, "parse"):
+            try:
+                agent_message = self.game_interface.parse(response)
+            except Exception as e:
+                print("response : {}".format(response))
+                raise e
+
+        with timed(timings, "state_write"):
+            datum = TurnRecord(
+                current_iteration=self.current_iteration,
+                turn=self.turn,
+                player_public_answer_string=agent_message.message_to_other_player(),
+                player_public_info_dict=agent_message.public,
+                player_private_info_dict=agent_message.secret,
+                player_complete_answer=response,
+                player_state=[player.get_state() for player in players],
+                player_usage=players[self.turn].collect_usage(),
+                timings=timings,
+            )
 
-        self.game_state.append(datum)
+            self.game_state.append(datum)
 
     def set_game_state(self, game_state_dict):
         # set game time
         self.run_epoch_time_ms = game_state_dict["run_epoch_time_ms"]
 
-        # set game state
-        self.game_state = game_state_dict["game_state"]
+        # set game state, logs store plain dicts
+        self.game_state = [
+            record_from_dict(state) for state in game_state_dict["game_state"]
+        ]
 
         # set agent state
         self.players = game_state_dict["players"]
 
         # update iteration and turn
         last_state = self.game_state[-1]
-        self.turn = last_state["turn"]
-        self.current_iteration = last_state["current_iteration"]
+        self.turn = last_state.turn
+        self.current_iteration = last_state.current_iteration
 
     def get_next_player(self):
         """
@@ -152,15 +235,15 @@ class AlternatingGame(Game):
         # we replay events from iteration - 1 to regenerate the correct state dict
 
         # update to previous state turn first
-        self.turn = self.game_state[iteration - 1]["turn"]
+        self.turn = self.game_state[iteration - 1].turn
         # get response from iteration - 1
-        last_response = self.game_state[iteration - 1]["player_state"][
-            self.turn
-        ]["conversation"][-1]["content"]
+        last_response = self.game_state[iteration - 1].player_state[self.turn][
+            "conversation"
+        ][-1]["content"]
         # initialize players to state of iteration - 1
         self.players = [
             Agent.from_dict(player)
-            for player in self.game_state[iteration - 1]["player_state"]
+            for player in self.game_state[iteration - 1].player_state
         ]
         # set game state to iteration - 1
         self.game_state = self.game_state[: iteration - 1]
@@ -170,15 +253,17 @@ class AlternatingGame(Game):
         # update turn
         self.get_next_player()
 
-    def run(self):
+    def run(self, memory_profiler=None):
         """
 
         Execute the ratbench / Main ratbench engine
 
+        :param memory_profiler: optional negotiationarena.profiling.MemoryProfiler, ticked after every turn
         """
 
         # patrick said it was a good idea to do it this way
         self.log_state()
+        self.install_validators()
         # start with iteration = 1
         for iteration in range(self.current_iteration, self.iterations + 1):
             self.current_iteration = iteration
@@ -186,8 +271,16 @@ class AlternatingGame(Game):
             # get ratbench state from last iteration
             message = self.read_iteration_message(iteration - 1)
 
+            # keep the proposal count of the player validator in sync with the game
+            validator = getattr(self.players[self.turn], "validator", None)
+            if isinstance(validator, MoveValidator):
+                validator.proposals_made = self.proposals_made(self.turn)
+
             # player to take a step/action based on current ratbench state
             response = self.players[self.turn].step(message)
+
+            # illegal moves are bounced back to the player before handing the turn over
+            response = self.enforce_legal_move(response)
             print("\n===== RAW AGENT RESPONSE =====")
             print(f"Iteration: {self.current_iteration}")
             print(f"Turn: {self.turn}")
@@ -210,18 +303,33 @@ class AlternatingGame(Game):
                 ]
             )
 
-            # for logging / reproducibility
-            self.log_state()
+            # for logging / reproducibility, the log time of a turn is saved with the next log
+            with timed(self.game_state[-1].timings, "log_write"):
+                self.log_state()
+
+            if memory_profiler is not None:
+                memory_profiler.tick(self)
 
             # check if ratbench is over
             if self.game_over():
                 self.after_game_ends()
+                # token usage and cost of the whole game
+                self.game_state[-1].usage = game_usage(self.game_state)
                 self.log_state()
+                self.notify_game_end()
                 return
 
             self.get_next_player()
             print("=============\n")
 
+    def notify_game_end(self):
+        for listener in self.game_end_listeners:
+            # a broken listener should not lose the game
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"Game end listener {listener} failed: {e}")
+
     def log_human_readable_state(self):
         """
         easy to inspect log file
@@ -249,17 +357,16 @@ class AlternatingGame(Game):
 
         # log ratbench state
         for state in self.game_state[1:]:
-            # turn = state['turn']
-            if state["current_iteration"] == "END":
+            if not isinstance(state, TurnRecord):
                 continue
             data = [
-                "Current Iteration: {}".format(state["current_iteration"]),
-                "Turn: {}".format(state["turn"]),
+                "Current Iteration: {}".format(state.current_iteration),
+                "Turn: {}".format(state.turn),
                 *[
                     "{}: {}".format(k, v)
                     for k, v in {
-                        **state["player_public_info_dict"],
-                        **state["player_private_info_dict"],
+                        **state.player_public_info_dict,
+                        **state.player_private_info_dict,
                     }.items()
                 ],
             ]
@@ -296,13 +403,19 @@ class AlternatingGameEndsOnTag(AlternatingGame):
     """
 
     def __init__(
-        self, players: List[List], log_dir=".logs", log_path=None, iterations=8
+        self,
+        players: List[List],
+        log_dir=".logs",
+        log_path=None,
+        iterations=8,
+        illegal_move_retries=1,
     ):
         super().__init__(
             players=players,
             log_dir=log_dir,
             log_path=log_path,
             iterations=iterations,
+            illegal_move_retries=illegal_move_retries,
         )
 
         self.end_tag = ACCEPTING_TAG
@@ -313,9 +426,9 @@ class AlternatingGameEndsOnTag(AlternatingGame):
         """
         state = self.game_state[-1]
         if state:
-            response = state["player_public_info_dict"].get(PLAYER_ANSWER_TAG)
+            response = state.player_public_info_dict.get(PLAYER_ANSWER_TAG)
             # TODO: this is pretty buggy
-            iteration = state.get("current_iteration", 0)
+            iteration = state.current_iteration
             if response == self.end_tag or iteration == self.iterations:
                 return True
 
@@ -0,0 +1,336 @@
+"""
+Bargaining solutions of TradingGame scenarios: the feasible trades, the Pareto frontier and the Nash point.
+
+A trade only matters through the net transfer of each resource from RED to BLUE (giving 3 X and getting 1 X
+back is giving 2 X), the feasible trades are the integer net transfers that both players can afford. Players
+care first about reaching their ResourceGoal and then about the resources they hold:
+
+    utility = goal_weight * goal reached + valuation . final resources
+
+with `goal_weight` larger than all the resources in the game, so reaching the goal always comes first. Without
+a valuation each unit is worth one.
+
+No deal is the disagreement point. Trades that leave a player worse off than no deal are not individually
+rational; a player that reaches the goal without trading must still reach it, which narrows the range of
+each resource. Within it we only enumerate the trades that can be on the Pareto frontier (see
+`BargainingSolution.enumerate`), the grid of all the trades grows too fast with the resources. The Nash
+point maximizes the product of the gains over no deal.
+
+Solutions are memoized by scenario (initial resources, goals, valuations), the games of a tournament share a
+handful of scenarios. TradingGame writes the Nash gap and the Pareto efficiency of its outcome in the summary
+(`outcome_efficiency`) and rescoring.bargaining_efficiency does the same for all the stored games.
+
+    solution = bargaining_solution(
+        [Resources({"X": 25, "Y": 5}), Resources({"X": 5, "Y": 25})],
+        [ResourceGoal({"X": 15, "Y": 15}), ResourceGoal({"X": 15, "Y": 15})],
+    )
+    solution.nash_trade()  # RED gives X: 10, BLUE gives Y: 10
+"""
+
+import numpy as np
+from negotiationarena.constants import *
+from negotiationarena.game_objects.trade import Trade
+
+_SOLUTIONS = {}
+
+
+def _plain(obj):
+    # Resources, ResourceGoal, Valuation or a dict
+    for attribute in ["resource_dict", "valuation_dict"]:
+        if hasattr(obj, attribute):
+            return dict(getattr(obj, attribute))
+    return dict(obj or {})
+
+
+def scenario_key(initial_resources, goals, valuations=None):
+    valuations = valuations or [None, None]
+    return tuple(
+        None if x is None else frozenset(_plain(x).items())
+        for x in list(initial_resources) + list(goals) + list(valuations)
+    )
+
+
+class BargainingSolution:
+    def __init__(
+        self, initial_resources, goals, valuations=None, goal_weight=None
+    ):
+        """
+        :param initial_resources: pair of Resources (or dicts)
+        :param goals: pair of ResourceGoal (or dicts)
+        :param valuations: pair of Valuation (or dicts, or None), by default each unit is worth one
+        :param goal_weight: by default one more than all the resources of the game (weighted by valuation)
+        """
+        initial = [_plain(r) for r in initial_resources]
+        goals = [_plain(g) for g in goals]
+        valuations = valuations or [None, None]
+        self.resource_names = list(
+            dict.fromkeys([k for d in initial + goals for k in d])
+        )
+        names = self.resource_names
+        self.initial = np.array(
+            [[d.get(k, 0) for k in names] for d in initial], dtype=np.int64
+        ).reshape(2, len(names))
+        self.goals = np.array(
+            [[d.get(k, 0) for k in names] for d in goals], dtype=np.int64
+        ).reshape(2, len(names))
+        self.valuation = np.array(
+            [
+                [1 if v is None else _plain(v).get(k, 0) for k in names]
+                for v in valuations
+            ],
+            dtype=np.float64,
+        ).reshape(2, len(names))
+        if goal_weight is None:
+            goal_weight = (self.initial.sum(0) @ self.valuation.max(0)) + 1
+        self.goal_weight = goal_weight
+
+        self.disagreement = self.utility(np.zeros((1, len(names)), np.int64))[
+            0
+        ]
+        self.trades = self.enumerate()
+        self.utilities = self.utility(self.trades)
+        self.frontier = self.pareto_frontier()
+        self.nash = self.nash_point()
+
+    def reached(self, net):
+        """
+        (K, 2) whether each player reaches the goal after the net transfers `net` (K, R).
+        """
+        red = (self.initial[0] - net >= self.goals[0]).all(-1)
+        blue = (self.initial[1] + net >= self.goals[1]).all(-1)
+        return np.stack([red, blue], -1)
+
+    def utility(self, net):
+        """
+        (K, 2) utility of each player after the net transfers `net` (K, R) from RED to BLUE.
+        """
+        final = np.stack([self.initial[0] - net, self.initial[1] + net], 1)
+        return self.goal_weight * self.reached(net) + (
+            final * self.valuation
+        ).sum(-1)
+
+    def bounds(self):
+        """
+        Lowest and highest net transfer of each resource: what the players can afford, cut by the goals the
+        players reach without trading.
+        """
+        low, high = -self.initial[1], self.initial[0].copy()
+        reached = self.reached(
+            np.zeros((1, len(self.resource_names)), np.int64)
+        )[0]
+        if reached[0]:
+            high = np.minimum(high, self.initial[0] - self.goals[0])
+        if reached[1]:
+            low = np.maximum(low, self.goals[1] - self.initial[1])
+        return low, high
+
+    def enumerate(self):
+        """
+        (K, R) the individually rational net transfers that can be on the Pareto frontier.
+
+        We add one resource at a time. A partial trade is summed up by whether each player still reaches the
+        goal on the resources seen so far and by the value that RED gives and BLUE gets; the remaining
+        resources change all the partial trades with the same goal flags in the same way, so a partial trade
+        that gives more and gets less than another one with the same flags can be dropped. With the default
+        valuations only a few hundred partial trades survive each step, instead of the whole grid.
+        """
+        low, high = self.bounds()
+        names = self.resource_names
+        net = np.zeros((1, len(names)), np.int64)
+        flags = np.ones((1, 2), dtype=bool)
+        values = np.zeros((1, 2))
+
+        for r in range(len(names)):
+            amounts = np.arange(low[r], high[r] + 1)
+            if len(amounts) == 0:
+                return np.zeros((1, len(names)), np.int64)
+            k, m = len(net), len(amounts)
+            net = np.repeat(net, m, axis=0)
+            net[:, r] = np.tile(amounts, k)
+            step_flags = np.stack(
+                [
+                    amounts <= self.initial[0, r] - self.goals[0, r],
+                    amounts >= self.goals[1, r] - self.initial[1, r],
+                ],
+                -1,
+            )
+            flags = np.repeat(flags, m, axis=0) & np.tile(step_flags, (k, 1))
+            values = np.repeat(values, m, axis=0) + np.outer(
+                np.tile(amounts, k), self.valuation[:, r]
+            )
+            keep = self.undominated(flags, values, np.abs(net).sum(-1))
+            net, flags, values = net[keep], flags[keep], values[keep]
+
+        rational = (self.utility(net) >= self.disagreement).all(-1)
+        return net[rational]
+
+    @staticmethod
+    def undominated(flags, values, volume):
+        """
+        Indices of the partial trades not dominated by one with the same goal flags: RED gives less value or
+        BLUE gets more. One partial trade (the smallest) is kept for equal ones.
+        """
+        group = flags[:, 0] * 2 + flags[:, 1]
+        order = np.lexsort((volume, -values[:, 1], values[:, 0], group))
+        group, values = group[order], values[order]
+        keep = np.zeros(len(order), dtype=bool)
+        for g in np.unique(group):
+            rows = np.flatnonzero(group == g)
+            gets = values[rows, 1]
+            # sorted by what RED gives, a row survives if BLUE gets more than in all the rows before
+            best_before = np.maximum.accumulate(
+                np.concatenate([[-np.inf], gets[:-1]])
+            )
+            keep[rows] = gets > best_before
+        return order[keep]
+
+    def pareto_frontier(self):
+        """
+        :return: indices of `trades` on the Pareto frontier, one trade (the smallest) per point, by
+            decreasing utility of RED
+        """
+        volume = np.abs(self.trades).sum(-1)
+        # by decreasing utility of RED, then of BLUE, then the smallest trades first
+        order = np.lexsort(
+            (volume, -self.utilities[:, 1], -self.utilities[:, 0])
+        )
+        u = self.utilities[order]
+        first = np.ones(len(u), dtype=bool)
+        first[1:] = (u[1:] != u[:-1]).any(-1)
+        order, u = order[first], u[first]
+        # a point is dominated by the points before it if one of them is as good for BLUE
+        best_before = np.maximum.accumulate(
+            np.concatenate([[-np.inf], u[:-1, 1]])
+        )
+        return order[u[:, 1] > best_before]
+
+    def nash_point(self):
+        """
+        :return: index in `trades` of the trade with the largest product of the gains (the smallest one when
+            there are ties)
+        """
+        gains = self.utilities - self.disagreement
+        product = gains.prod(-1)
+        best = np.flatnonzero(product == product.max())
+        return best[np.abs(self.trades[best]).sum(-1).argmin()]
+
+    def trade(self, net):
+        """
+        The Trade for a net transfer: RED gives the positive part, BLUE the negative one.
+        """
+        net = np.asarray(net)
+        return Trade(
+            {
+                "RED": {
+                    k: int(v)
+                    for k, v in zip(self.resource_names, net)
+                    if v > 0
+                },
+                "BLUE": {
+                    k: int(-v)
+                    for k, v in zip(self.resource_names, net)
+                    if v < 0
+                },
+            }
+        )
+
+    def nash_trade(self):
+        return self.trade(self.trades[self.nash])
+
+    def frontier_trades(self):
+        return [self.trade(self.trades[i]) for i in self.frontier]
+
+    def net_transfer(self, trade):
+        """
+        (R,) net transfer of a Trade (or of a (R,) array of the ledger, reordered by name).
+        """
+        if hasattr(trade, "resources_from_first_agent"):
+            red = trade.resources_from_first_agent.resource_dict
+            blue = trade.resources_from_second_agent.resource_dict
+            return np.array(
+                [red.get(k, 0) - blue.get(k, 0) for k in self.resource_names],
+                dtype=np.int64,
+            )
+        return np.asarray(trade, dtype=np.int64)
+
+    def efficiency(self, net):
+        """
+        How good the outcomes (K, R) net transfers are, e.g. what was accepted (zeros for no deal).
+
+        :return: dict with the utilities, whether they are individually rational, whether no individually
+            rational trade is better for a player and as good for the other (pareto_efficient), the gap from
+            the utilities of the Nash point and the share of the Nash product
+        """
+        net = np.atleast_2d(net)
+        utilities = self.utility(net)
+        frontier = self.utilities[self.frontier]
+        # dominated if a frontier point is at least as good for both and better for one
+        dominated = (
+            (frontier[None] >= utilities[:, None]).all(-1)
+            & (frontier[None] > utilities[:, None]).any(-1)
+        ).any(-1)
+        nash = self.utilities[self.nash]
+        nash_product = (nash - self.disagreement).prod()
+        gains = np.maximum(utilities - self.disagreement, 0).prod(-1)
+        return dict(
+            utilities=utilities,
+            individually_rational=(utilities >= self.disagreement).all(-1),
+            pareto_efficient=~dominated,
+            nash_gap=utilities - nash,
+            nash_share=gains / nash_product
+            if nash_product > 0
+            else np.ones(len(net)),
+        )
+
+    def json(self):
+        return dict(
+            resource_names=self.resource_names,
+            disagreement=self.disagreement.tolist(),
+            bounds=[b.tolist() for b in self.bounds()],
+            frontier=[
+                dict(
+                    trade=self.trades[i].tolist(),
+                    utilities=self.utilities[i].tolist(),
+                )
+                for i in self.frontier
+            ],
+            nash=dict(
+                trade=self.trades[self.nash].tolist(),
+                utilities=self.utilities[self.nash].tolist(),
+            ),
+        )
+
+
+def bargaining_solution(initial_resources, goals, valuations=None):
+    """
+    The BargainingSolution of a scenario, computed once per scenario.
+    """
+    key = scenario_key(initial_resources, goals, valuations)
+    if key not in _SOLUTIONS:
+        _SOLUTIONS[key] = BargainingSolution(
+            initial_resources, goals, valuations
+        )
+    return _SOLUTIONS[key]
+
+
+def outcome_efficiency(initial_resources, goals, trade=None):
+    """
+    Efficiency of the outcome of a TradingGame against its scenario (see `BargainingSolution.efficiency`),
+    written by the game in its summary.
+
+    :param initial_resources: pair of Resources
+    :param goals: pair of ResourceGoal
+    :param trade: the accepted Trade, None without a deal
+    :return: dict with the gap from the Nash point of each player and whether the outcome is Pareto efficient
+    """
+    solution = bargaining_solution(initial_resources, goals)
+    net = (
+        np.zeros(len(solution.resource_names), np.int64)
+        if trade is None
+        else solution.net_transfer(trade)
+    )
+    efficiency = solution.efficiency(net)
+    return dict(
+        nash_gap=efficiency["nash_gap"][0].tolist(),
+        pareto_efficient=bool(efficiency["pareto_efficient"][0]),
+    )
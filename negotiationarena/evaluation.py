@@ -0,0 +1,377 @@
+"""
+Sequential evaluation of matchups.
+
+Instead of playing a fixed number of games per matchup, games are scheduled one at a time and a matchup stops
+as soon as its stopping rule says that the metric is resolved, e.g., the confidence interval of the acceptance
+rate is narrow enough or a sequential probability ratio test picked one of its hypotheses. The remaining budget
+goes to the matchups that are still unresolved.
+
+    matchups = [
+        Matchup("kind", make_kind_game, accepted, ConfidenceWidth(0.2, bernoulli=True)),
+        Matchup("rude", make_rude_game, accepted, SPRT(0.3, 0.7)),
+    ]
+    run_matchups(matchups, budget=100)
+"""
+
+import math
+from statistics import NormalDist
+from negotiationarena.constants import *
+
+
+class RunningStats:
+    """
+    Count, mean and variance of a stream of numbers (Welford), without keeping the numbers.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    def json(self):
+        return dict(n=self.n, mean=self.mean, variance=self.variance)
+
+
+def z_score(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(successes, n, confidence=0.95):
+    """
+    Confidence interval of a proportion, well behaved also with few games or a rate close to 0 or 1.
+    """
+    if n == 0:
+        return 0.0, 1.0
+    z = z_score(confidence)
+    p = successes / n
+    center = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+    half = (
+        z
+        * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2))
+        / (1 + z**2 / n)
+    )
+    return center - half, center + half
+
+
+def mean_interval(stats, confidence=0.95):
+    """
+    Normal confidence interval of the mean.
+    """
+    if stats.n < 2:
+        return -math.inf, math.inf
+    half = z_score(confidence) * math.sqrt(stats.variance / stats.n)
+    return stats.mean - half, stats.mean + half
+
+
+class ConfidenceWidth:
+    """
+    Stops when the confidence interval of the metric is narrower than `width`.
+
+    With `bernoulli` the metric is a rate (0/1 values) and we use the Wilson interval.
+    """
+
+    def __init__(self, width, confidence=0.95, bernoulli=False, min_games=5):
+        self.width = width
+        self.confidence = confidence
+        self.bernoulli = bernoulli
+        self.min_games = min_games
+
+    def interval(self, stats):
+        if self.bernoulli:
+            return wilson_interval(
+                round(stats.mean * stats.n), stats.n, self.confidence
+            )
+        return mean_interval(stats, self.confidence)
+
+    def decide(self, stats):
+        """
+        :return: None while the metric is unresolved
+        """
+        if stats.n < self.min_games:
+            return None
+        low, high = self.interval(stats)
+        if high - low <= self.width:
+            return "interval [{:.3f}, {:.3f}]".format(low, high)
+        return None
+
+
+class SPRT:
+    """
+    Wald's sequential probability ratio test on a rate: is it `p0` or `p1`?
+
+    `alpha` is the probability of choosing p1 when the rate is p0, `beta` the probability of choosing p0 when
+    the rate is p1.
+    """
+
+    def __init__(self, p0, p1, alpha=0.05, beta=0.05):
+        self.p0 = p0
+        self.p1 = p1
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+
+    def log_likelihood_ratio(self, stats):
+        successes = stats.mean * stats.n
+        failures = stats.n - successes
+        return successes * math.log(self.p1 / self.p0) + failures * math.log(
+            (1 - self.p1) / (1 - self.p0)
+        )
+
+    def decide(self, stats):
+        llr = self.log_likelihood_ratio(stats)
+        if llr >= self.upper:
+            return f"rate is {self.p1}"
+        if llr <= self.lower:
+            return f"rate is {self.p0}"
+        return None
+
+
+class Matchup:
+    """
+    A configuration to evaluate: how to build a game, what to measure on it and when to stop.
+    """
+
+    # games played by each call to `play`
+    games_per_step = 1
+
+    def __init__(self, name, make_game, metric, rule, max_games=None):
+        """
+        :param name:
+        :param make_game: callable that returns a new game, ready to run
+        :param metric: callable that takes a finished game and returns a number (e.g., `accepted`)
+        :param rule: stopping rule, an object with a `decide(stats)` method (ConfidenceWidth, SPRT)
+        :param max_games: stop anyway after this many games
+        """
+        self.name = name
+        self.make_game = make_game
+        self.metric = metric
+        self.rule = rule
+        self.max_games = max_games
+        self.stats = RunningStats()
+        self.games = 0
+        self.errors = 0
+        self.decision = None
+
+    @property
+    def resolved(self):
+        return self.decision is not None
+
+    def run_game(self, *args):
+        """
+        :return: the finished game, None if it failed
+        """
+        self.games += 1
+        try:
+            game = self.make_game(*args)
+            game.run()
+            return game
+        except Exception as e:
+            print(f"Game of {self.name} failed: {e}")
+            self.errors += 1
+            return None
+
+    def update_decision(self):
+        self.decision = self.rule.decide(self.stats)
+        if (
+            self.decision is None
+            and self.max_games is not None
+            and self.games >= self.max_games
+        ):
+            self.decision = "max games"
+
+    def play(self):
+        """
+        Plays one game and updates the statistics and the decision.
+
+        :return: the number of games played
+        """
+        game = self.run_game()
+        if game is not None:
+            self.stats.add(float(self.metric(game)))
+        self.update_decision()
+        return self.games_per_step
+
+    def json(self):
+        return dict(
+            name=self.name,
+            decision=self.decision,
+            games=self.games,
+            errors=self.errors,
+            **self.stats.json(),
+        )
+
+
+class PairedMatchup(Matchup):
+    """
+    Compares two configurations A and B with games played in pairs with the roles swapped: in the first game
+    A is AGENT_ONE (it moves first, e.g., the seller) and B is AGENT_TWO, in the second game it is the other
+    way round. Both games of a pair get the same seed, so everything else (settings, random draws) is shared.
+
+    The statistic of a pair is the advantage of A over B in the same role and with the same settings, averaged
+    over the two roles. The role effect and the effect of the settings cancel out within the pair, so the
+    confidence intervals are tighter than with independent games (see `paired_estimates`).
+    """
+
+    games_per_step = 2
+
+    def __init__(self, name, make_game, metric, rule, max_games=None, seed=0):
+        """
+        :param make_game: callable taking (swapped, seed) and returning a new game. When `swapped` A plays
+            AGENT_TWO
+        :param metric: callable taking the index of a player and returning a metric for it (e.g., `payoff`,
+            `won`)
+        :param seed: seed of the first pair, the next pairs get the following ones
+        """
+        super().__init__(name, make_game, metric, rule, max_games=max_games)
+        self.seed = seed
+        # (A as AGENT_ONE, A as AGENT_TWO, B as AGENT_ONE, B as AGENT_TWO)
+        self.pairs = []
+
+    def play(self):
+        seed = self.seed + self.games // 2
+        first, second = [
+            self.run_game(swapped, seed) for swapped in (False, True)
+        ]
+        if first is not None and second is not None:
+            pair = tuple(
+                float(self.metric(idx)(game))
+                for idx, game in [
+                    (0, first),
+                    (1, second),
+                    (0, second),
+                    (1, first),
+                ]
+            )
+            self.pairs.append(pair)
+            self.stats.add(paired_advantage(pair))
+        self.update_decision()
+        return self.games_per_step
+
+    def json(self):
+        return dict(
+            **super().json(),
+            **paired_estimates(self.pairs),
+        )
+
+
+def paired_advantage(pair):
+    a_first, a_second, b_first, b_second = pair
+    return ((a_first - b_first) + (a_second - b_second)) / 2
+
+
+def paired_estimates(pairs, confidence=0.95):
+    """
+    Estimates from role-swapped pairs.
+
+    :param pairs: list of (A as AGENT_ONE, A as AGENT_TWO, B as AGENT_ONE, B as AGENT_TWO)
+    :return: dict with the advantage of A over B and its confidence interval computed on the pairs, the
+        interval we would get from as many independent games with random roles, the mean of A and of B and the
+        first mover advantage (AGENT_ONE minus AGENT_TWO)
+
+    Pairing helps when the role effect is large compared to the variation between pairs, e.g., with random
+    settings that change the surplus of every pair it can do worse than independent games. The unpaired
+    interval is there to check it.
+    """
+    advantage, role_effect = RunningStats(), RunningStats()
+    a, b, games = RunningStats(), RunningStats(), RunningStats()
+    for pair in pairs:
+        a_first, a_second, b_first, b_second = pair
+        advantage.add(paired_advantage(pair))
+        role_effect.add(((a_first + b_first) - (a_second + b_second)) / 2)
+        a.add(a_first)
+        a.add(a_second)
+        b.add(b_first)
+        b.add(b_second)
+        # advantage of A in each game, as if the games were independent
+        games.add(a_first - b_second)
+        games.add(a_second - b_first)
+
+    return dict(
+        pairs=advantage.n,
+        mean_a=a.mean,
+        mean_b=b.mean,
+        advantage=advantage.mean,
+        paired_interval=mean_interval(advantage, confidence),
+        unpaired_interval=mean_interval(games, confidence),
+        role_effect=role_effect.mean,
+        role_effect_interval=mean_interval(role_effect, confidence),
+    )
+
+
+def run_matchups(matchups, budget):
+    """
+    Plays games of the unresolved matchups in turn until all are resolved or the budget is spent. The
+    budget is never exceeded: a PairedMatchup only plays if both games of the pair fit.
+
+    :param matchups: list of Matchup
+    :param budget: total number of games
+    :return: the matchups
+    """
+    played = 0
+    while True:
+        pending = [
+            m
+            for m in matchups
+            if not m.resolved and played + m.games_per_step <= budget
+        ]
+        if not pending:
+            break
+        for matchup in pending:
+            if played + matchup.games_per_step > budget:
+                continue
+            played += matchup.play()
+            if matchup.resolved:
+                print(
+                    f"{matchup.name} resolved after {matchup.stats.n} games: "
+                    f"{matchup.decision} (mean {matchup.stats.mean:.3f})"
+                )
+    return matchups
+
+
+def final_summary(game):
+    last = game.game_state[-1]
+    return last.get("summary") or {}
+
+
+def accepted(game):
+    """
+    1 if the game ended with an accepted trade.
+    """
+    return final_summary(game).get("final_response") == ACCEPTING_TAG
+
+
+def payoff(player_index):
+    """
+    Metric: the outcome of a player, resources are valued one unit each.
+    """
+
+    def metric(game):
+        outcome = final_summary(game).get("player_outcome", [0, 0])[
+            player_index
+        ]
+        if hasattr(outcome, "resource_dict"):
+            return sum(outcome.resource_dict.values())
+        return float(outcome)
+
+    return metric
+
+
+def won(player_index):
+    """
+    Metric: 1 if the player got a better outcome than the other one.
+    """
+    mine, theirs = payoff(player_index), payoff(1 - player_index)
+
+    def metric(game):
+        return mine(game) > theirs(game)
+
+    return metric
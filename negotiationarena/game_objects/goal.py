@@ -1,6 +1,5 @@
 import json
 import logging
-from dataclasses import dataclass
 from collections import defaultdict
 from negotiationarena.game_objects.resource import Resources
 from negotiationarena.game_objects.valuation import Valuation
@@ -21,8 +20,10 @@ class Goal:
         pass
 
 
-@dataclass
 class ResourceGoal(Goal, Resources):
+    def __init__(self, resource_dict: dict = None):
+        Resources.__init__(self, resource_dict)
+
     def goal_reached(self, resources: Resources):
         return all(
             resources.resource_dict.get(k, 0) >= v
@@ -0,0 +1,218 @@
+"""
+Dense NumPy representation of the resources of many games, used to compute outcomes in batch.
+
+Every resource name gets a fixed column, the resources of N two-player games are stored as (N, 2, R) arrays.
+"""
+
+import numpy as np
+from negotiationarena.constants import MONEY_TOKEN, ACCEPTING_TAG
+from negotiationarena.game_objects.resource import Resources
+
+
+class ResourceLedger:
+    def __init__(self, resource_names, initial, given, accepted, valuation):
+        """
+        :param resource_names: name of the resource of each column
+        :param initial: (N, 2, R) initial resources of each player
+        :param given: (N, 2, R) resources each player gives in the proposed trade
+        :param accepted: (N,) whether the trade was accepted
+        :param valuation: (N, 2, R) value of one unit of each resource for each player
+        """
+        self.resource_names = list(resource_names)
+        self.index = {name: i for i, name in enumerate(self.resource_names)}
+        self.initial = initial
+        self.given = given
+        self.accepted = accepted
+        self.valuation = valuation
+
+    @classmethod
+    def from_games(cls, initial_resources, trades, accepted, valuations=None):
+        """
+        :param initial_resources: for each game, the pair of initial Resources
+        :param trades: for each game, the proposed Trade (or None)
+        :param accepted: for each game, whether the trade was accepted
+        :param valuations: for each game, the pair of Valuation (or None). Without a valuation each unit is worth one.
+        :return:
+        """
+        n = len(initial_resources)
+        valuations = [None] * n if valuations is None else valuations
+        return cls.from_dicts(
+            initial_resources=[
+                [res.resource_dict for res in pair]
+                for pair in initial_resources
+            ],
+            trades=[
+                (
+                    [
+                        t.resources_from_first_agent.resource_dict,
+                        t.resources_from_second_agent.resource_dict,
+                    ]
+                    if hasattr(t, "resources_from_first_agent")
+                    else None
+                )
+                for t in trades
+            ],
+            accepted=accepted,
+            valuations=[
+                (
+                    None
+                    if vals is None
+                    else [
+                        None if val is None else val.valuation_dict
+                        for val in vals
+                    ]
+                )
+                for vals in valuations
+            ],
+        )
+
+    @classmethod
+    def from_dicts(cls, initial_resources, trades, accepted, valuations=None):
+        """
+        Same as `from_games` with plain dicts, e.g. read from game_state.json without GameDecoder.
+
+        :param initial_resources: for each game, the pair of dicts resource -> amount
+        :param trades: for each game, the pair of dicts of the resources given by the first and by the second
+            player (or None)
+        :param accepted: for each game, whether the trade was accepted
+        :param valuations: for each game, the pair of dicts resource -> value (or None)
+        :return:
+        """
+        n = len(initial_resources)
+
+        names = {}
+        for pair, trade in zip(initial_resources, trades):
+            for res in pair:
+                names.update(dict.fromkeys(res))
+            for res in trade or []:
+                names.update(dict.fromkeys(res))
+        index = {name: i for i, name in enumerate(names)}
+
+        shape = (n, 2, len(index))
+        initial = np.zeros(shape, dtype=np.int64)
+        given = np.zeros(shape, dtype=np.int64)
+
+        for g, (pair, trade) in enumerate(zip(initial_resources, trades)):
+            for p, res in enumerate(pair):
+                for k, v in res.items():
+                    initial[g, p, index[k]] = v
+            for p, res in enumerate(trade or []):
+                for k, v in res.items():
+                    given[g, p, index[k]] = v
+
+        accepted = np.asarray(accepted, dtype=bool) & np.array(
+            [t is not None for t in trades], dtype=bool
+        )
+        ledger = cls(index, initial, given, accepted, None)
+        ledger.valuation = ledger.valuation_array(valuations)
+        return ledger
+
+    def valuation_array(self, valuations=None):
+        """
+        (N, 2, R) value of one unit of each resource, `MONEY_TOKEN` is always worth one.
+
+        :param valuations: for each game, the pair of dicts resource -> value (or None). Without a valuation
+            each unit is worth one.
+        :return:
+        """
+        valuation = np.ones(self.initial.shape, dtype=np.float64)
+        for g, vals in enumerate(valuations or []):
+            for p, val in enumerate(vals or []):
+                if val is None:
+                    continue
+                valuation[g, p] = 0
+                for k, v in val.items():
+                    if k in self.index:
+                        valuation[g, p, self.index[k]] = v
+                if MONEY_TOKEN in self.index:
+                    valuation[g, p, self.index[MONEY_TOKEN]] = 1
+        return valuation
+
+    @classmethod
+    def from_summaries(cls, summaries):
+        """
+        Builds the ledger from the summaries written by `after_game_ends`.
+
+        :param summaries: the summary dict of each game
+        :return:
+        """
+        empty = [Resources({}), Resources({})]
+        return cls.from_games(
+            initial_resources=[
+                s.get("player_initial_resources", s.get("initial_resources"))
+                or empty
+                for s in summaries
+            ],
+            trades=[s.get("proposed_trade") for s in summaries],
+            accepted=[
+                s.get("final_response") == ACCEPTING_TAG for s in summaries
+            ],
+            valuations=[s.get("player_valuation") for s in summaries],
+        )
+
+    def __len__(self):
+        return self.initial.shape[0]
+
+    def net_transfer(self):
+        """
+        (N, 2, R) resources received minus resources given by each player in accepted trades.
+        """
+        net = self.given[:, ::-1] - self.given
+        return net * self.accepted[:, None, None]
+
+    def final_resources(self):
+        return self.initial + self.net_transfer()
+
+    def payoffs(self, valuation=None):
+        """
+        (N, 2) value of the change in resources of each player, as in `BuySellGame.after_game_ends`.
+
+        :param valuation: (N, 2, R) values to use instead of the ones of the ledger (see `valuation_array`)
+        """
+        valuation = self.valuation if valuation is None else valuation
+        return (self.net_transfer() * valuation).sum(-1)
+
+    def legal_trades(self):
+        """
+        (N,) whether both players can afford the proposed trade (`Trade.can_offer` and `Trade.can_accept`).
+        """
+        return (self.initial - self.given >= 0).all(axis=(1, 2))
+
+    def goals_reached(self, goals):
+        """
+        (N, 2) whether the final resources satisfy a ResourceGoal for each player.
+
+        :param goals: for each game, the pair of ResourceGoal (or of dicts resource -> amount)
+        :return:
+        """
+        targets = np.zeros_like(self.initial)
+        unreachable = np.zeros(targets.shape[:2], dtype=bool)
+        for g, pair in enumerate(goals):
+            for p, goal in enumerate(pair):
+                goal = getattr(goal, "resource_dict", goal)
+                for k, v in goal.items():
+                    if k in self.index:
+                        targets[g, p, self.index[k]] = v
+                    elif v > 0:
+                        # nobody has this resource
+                        unreachable[g, p] = True
+        return (self.final_resources() >= targets).all(-1) & ~unreachable
+
+    def to_resources(self, array):
+        """
+        Converts a (N, 2, R) array back to Resources, e.g. `ledger.to_resources(ledger.final_resources())`.
+        Zero amounts are dropped.
+        """
+        return [
+            [
+                Resources(
+                    {
+                        name: int(row[i])
+                        for name, i in self.index.items()
+                        if row[i] != 0
+                    }
+                )
+                for row in game
+            ]
+            for game in array
+        ]
@@ -0,0 +1,160 @@
+"""
+Records stored in `AlternatingGame.game_state`.
+
+The first record holds the settings of the game, then there is one record per turn and, once the game is over,
+a last record with the summary:
+
+    [SettingsRecord, TurnRecord, TurnRecord, ..., SummaryRecord]
+
+Records use __slots__ to keep the state of long runs small. They still behave like the dicts we used to store
+(`record["turn"]`, `record.get("summary")`, `"timings" in record`) and `to_dict` gives back exactly the dict
+that is written to game_state.json, so old logs and new logs have the same format.
+"""
+
+
+class Record:
+    # fields always written to the log, in order
+    FIELDS = ()
+    # fields written to the log only when they are set
+    OPTIONAL = ()
+
+    __slots__ = ("extra",)
+
+    def __init__(self, **kwargs):
+        for field in self.FIELDS + self.OPTIONAL:
+            setattr(self, field, kwargs.pop(field, None))
+        # keys we do not know about (e.g., added by a custom game) are kept as they are
+        self.extra = kwargs
+
+    def to_dict(self):
+        datum = {
+            "current_iteration": self.current_iteration,
+            "turn": self.turn,
+        }
+        for field in self.FIELDS:
+            datum[field] = getattr(self, field)
+        for field in self.OPTIONAL:
+            value = getattr(self, field)
+            if value is not None:
+                datum[field] = value
+        datum.update(self.extra)
+        return datum
+
+    def __getitem__(self, key):
+        if key in self:
+            return self.get(key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS or key in self.OPTIONAL:
+            setattr(self, key, value)
+        elif key in ["current_iteration", "turn"]:
+            raise KeyError(
+                "{} cannot be changed on a {}".format(
+                    key, self.__class__.__name__
+                )
+            )
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        if key in ["current_iteration", "turn"] or key in self.FIELDS:
+            return True
+        if key in self.OPTIONAL:
+            return getattr(self, key) is not None
+        return key in self.extra
+
+    def get(self, key, default=None):
+        if key in ["current_iteration", "turn"] or key in self.FIELDS:
+            return getattr(self, key)
+        if key in self.OPTIONAL:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default)
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return "{}({})".format(
+            self.__class__.__name__,
+            ", ".join("{}={!r}".format(k, v) for k, v in self.items()),
+        )
+
+
+class SettingsRecord(Record):
+    """
+    First record of a game, with the settings of the players (goals, initial resources, roles, ...).
+    """
+
+    current_iteration = "START"
+    turn = "None"
+
+    FIELDS = ("settings",)
+
+    __slots__ = FIELDS
+
+
+class TurnRecord(Record):
+    """
+    What happened in a turn: the raw answer of the player, the parsed public and private information and
+    the state of the players after the turn.
+    """
+
+    FIELDS = (
+        "player_public_answer_string",
+        "player_public_info_dict",
+        "player_private_info_dict",
+        "player_complete_answer",
+        "player_state",
+    )
+    OPTIONAL = ("player_usage", "timings")
+
+    __slots__ = ("current_iteration", "turn") + FIELDS + OPTIONAL
+
+    def __init__(self, current_iteration, turn, **kwargs):
+        self.current_iteration = current_iteration
+        self.turn = turn
+        super().__init__(**kwargs)
+
+
+class SummaryRecord(Record):
+    """
+    Last record of a game, with the outcome computed by `after_game_ends` and the usage of the whole game.
+    Games that end before anything happens have no summary.
+    """
+
+    current_iteration = "END"
+    turn = "None"
+
+    OPTIONAL = ("summary", "usage")
+
+    __slots__ = OPTIONAL
+
+
+def record_from_dict(datum):
+    """
+    Builds a record from a dict as stored in game_state.json (works with the logs written before records existed).
+
+    :param datum:
+    :return:
+    """
+    if isinstance(datum, Record):
+        return datum
+
+    datum = dict(datum)
+    current_iteration = datum.pop("current_iteration", None)
+    turn = datum.pop("turn", None)
+    if current_iteration == "START":
+        return SettingsRecord(**datum)
+    if current_iteration == "END":
+        return SummaryRecord(**datum)
+    return TurnRecord(current_iteration, turn, **datum)
@@ -1,13 +1,21 @@
 import json
 import logging
-from dataclasses import dataclass, fields, asdict
-from collections import defaultdict
 from negotiationarena.utils import text_to_dict
 
 
-@dataclass
 class Resources:
-    resource_dict: dict = None
+    """
+    Resources of a player (or resources exchanged in a trade), e.g. {"X": 5, "ZUP": 100}.
+
+    Resources should be treated as immutable: arithmetic always returns new objects, which
+    lets us cache the hash.
+    """
+
+    __slots__ = ("resource_dict", "_hash")
+
+    def __init__(self, resource_dict: dict = None):
+        self.resource_dict = resource_dict
+        self._hash = None
 
     @classmethod
     def from_string(cls, string: str):
@@ -17,7 +25,6 @@ class Resources:
         except Exception:
             return cls({})
 
-
     def value(self):
         return sum(self.resource_dict.values())
 
@@ -25,36 +32,63 @@ class Resources:
         res = [f"{k}: {v}" for k, v in self.resource_dict.items()]
         return ", ".join(res)
 
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(resource_dict={self.resource_dict!r})"
+        )
+
     def available_items(self):
         return list(self.resource_dict.keys())
 
     def __eq__(self, other):
+        if not isinstance(other, Resources):
+            return NotImplemented
         return self.resource_dict == other.resource_dict
 
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self.resource_dict.items()))
+        return self._hash
+
     def check_transaction_legal(self, resource):
-        return all(
-            self.resource_dict.get(k, 0) - v >= 0
-            for k, v in resource.resource_dict.items()
-        )
+        get = self.resource_dict.get
+        for k, v in resource.resource_dict.items():
+            if get(k, 0) - v < 0:
+                return False
+        return True
 
     def equal(self, other):
         return self == other
 
+    def transfer(self, received, given):
+        """
+        Resources after receiving `received` and giving away `given`, computed with a single new dict.
+
+        :param received:
+        :param given:
+        :return:
+        """
+        new_dict = dict(self.resource_dict)
+        get = new_dict.get
+        for k, v in received.resource_dict.items():
+            new_dict[k] = get(k, 0) + v
+        for k, v in given.resource_dict.items():
+            new_dict[k] = get(k, 0) - v
+        return Resources(new_dict)
+
     def __sub__(self, other):
-        new_dict = defaultdict(int)
-        for k, v in self.resource_dict.items():
-            new_dict[k] += v
+        new_dict = dict(self.resource_dict)
+        get = new_dict.get
         for k, v in other.resource_dict.items():
-            new_dict[k] -= v
-        return Resources(dict(new_dict))
+            new_dict[k] = get(k, 0) - v
+        return Resources(new_dict)
 
     def __add__(self, other):
-        new_dict = defaultdict(int)
-        for k, v in self.resource_dict.items():
-            new_dict[k] += v
+        new_dict = dict(self.resource_dict)
+        get = new_dict.get
         for k, v in other.resource_dict.items():
-            new_dict[k] += v
-        return Resources(dict(new_dict))
+            new_dict[k] = get(k, 0) + v
+        return Resources(new_dict)
 
     def get(self, key, default=None):
         return self.resource_dict.get(key, default)
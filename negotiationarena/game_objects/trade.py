@@ -1,11 +1,136 @@
+import re
+import ast
 import json
 import logging
 from dataclasses import dataclass
 from collections import defaultdict
 from negotiationarena.game_objects.resource import Resources
 
+# grammar of the trade strings, e.g. "Player RED Gives X: 1 | Player BLUE Gives ZUP: 50"
+TRADE_ENTRY = re.compile(r"player\s+(\w+)\s+gives\b", re.IGNORECASE)
+TRADE_ITEM = re.compile(
+    r"\s*(?P<name>[^:=\s](?:[^:=]*[^:=\s])?)\s*[:=]\s*(?P<amount>\+?\d+)\s*$"
+)
+NOTHING = {"", "none", "nothing"}
+
+
+class TradeParseError(ValueError):
+    """
+    Raised when a trade string does not follow the trade grammar. `span` is the (start, end) position of
+    the part of the string that could not be parsed.
+    """
+
+    def __init__(self, message, string, span):
+        super().__init__(
+            f"{message}: '{string[span[0]:span[1]]}' at {span[0]}:{span[1]} in '{string}'"
+        )
+        self.string = string
+        self.span = span
+
+
+def parse_trade_string(string, resource_names=None):
+    """
+    Parses a trade string into a dict of player name -> resources given, in one pass.
+
+    Player names and the "Player"/"Gives" keywords are case-insensitive, whitespace and newlines are ignored.
+    Amounts can be given as "X: 5", "X:5" or "X = 5"; "NONE", "nothing" or an empty list mean that the player
+    gives nothing. A resource without an amount ("X", "X:", "$50"), negative amounts and a player named twice
+    are errors, and the trade must name exactly two players.
+
+    :param string:
+    :param resource_names: the resources of the game. If given, resource names are case-insensitive and
+        are returned as in `resource_names`, other names are errors
+    :return:
+    """
+    known = (
+        None
+        if resource_names is None
+        else {name.casefold(): name for name in resource_names}
+    )
+    trade = {}
+    # we keep track of the offsets to report where the parsing failed
+    offset = 0
+    for entry in string.split("|"):
+        start, offset = offset, offset + len(entry) + 1
+        if not entry.strip():
+            continue
+
+        player = TRADE_ENTRY.search(entry)
+        if player is None:
+            raise TradeParseError(
+                "Expected 'Player <name> Gives'",
+                string,
+                (start, start + len(entry)),
+            )
+
+        resources = {}
+        items = entry[player.end() :]
+        item_offset = start + player.end()
+        if items.strip().lower() in NOTHING:
+            items = ""
+
+        for item in items.split(","):
+            item_start, item_offset = item_offset, item_offset + len(item) + 1
+            if not item.strip():
+                continue
+
+            # fast path for "name: amount", the regex handles the other variants
+            name, _, amount = item.partition(":")
+            name = name.strip()
+            if not (name and amount.strip().lstrip("+").isdecimal()):
+                parsed = TRADE_ITEM.match(item)
+                if parsed is None:
+                    raise TradeParseError(
+                        "Expected '<resource>: <non-negative integer amount>'",
+                        string,
+                        (item_start, item_start + len(item)),
+                    )
+                name, amount = parsed.group("name"), parsed.group("amount")
+
+            if known is not None:
+                if name.casefold() not in known:
+                    raise TradeParseError(
+                        "Expected one of the resources {}".format(
+                            ", ".join(resource_names)
+                        ),
+                        string,
+                        (item_start, item_start + len(item)),
+                    )
+                name = known[name.casefold()]
+            resources[name] = int(amount)
+
+        name = player.group(1).upper()
+        if name in trade:
+            raise TradeParseError(
+                f"Player {name} appears more than once",
+                string,
+                (start, start + len(entry)),
+            )
+        trade[name] = resources
+
+    if not trade:
+        raise TradeParseError("Empty trade", string, (0, len(string)))
+    if len(trade) != 2:
+        raise TradeParseError(
+            "Expected a trade between two players, got {}".format(
+                ", ".join(trade)
+            ),
+            string,
+            (0, len(string)),
+        )
+
+    return trade
+
 
 class Trade:
+    __slots__ = (
+        "keys",
+        "resources_from_first_agent",
+        "resources_from_second_agent",
+        "raw_string",
+        "_hash",
+    )
+
     def __init__(self, trade, raw_string=None):
         """
         Trade is a class that represents a trade between two agents.
@@ -16,24 +141,24 @@ class Trade:
         :param trade:
         :param raw_string:
         """
-        self.keys = sorted(list(trade.keys()), reverse=True)
-
-        print("=== TRADE DEBUG ===")
-        print("RAW trade object:", trade)
-        print("trade type:", type(trade))
-        print("trade keys:", list(trade.keys()))
-        print("number of keys:", len(trade))
-        print("===================")
-
+        self.keys = sorted(trade, reverse=True)
         self.resources_from_first_agent = Resources(trade[self.keys[0]])
         self.resources_from_second_agent = Resources(trade[self.keys[1]])
         self.raw_string = raw_string
-
+        self._hash = None
 
     @classmethod
     def from_string(cls, string: str):
-        trade = eval(string)
-        return cls(trade)
+        """
+        :param string: either a trade string ("Player RED Gives X: 1 | Player BLUE Gives ZUP: 50")
+            or a python literal of the trade dict.
+        :return:
+        """
+        if string.lstrip().startswith("{"):
+            trade = ast.literal_eval(string)
+        else:
+            trade = parse_trade_string(string)
+        return cls(trade, raw_string=string)
 
     def can_offer(self, resources):
         return resources.check_transaction_legal(
@@ -46,14 +171,36 @@ class Trade:
         )
 
     def execute_trade(self, resources, direction_of_the_trade):
-        net_resource = (
-            self.resources_from_second_agent - self.resources_from_first_agent
-            if direction_of_the_trade == 0
-            else self.resources_from_first_agent
-            - self.resources_from_second_agent
+        if direction_of_the_trade == 0:
+            return resources.transfer(
+                self.resources_from_second_agent,
+                self.resources_from_first_agent,
+            )
+        return resources.transfer(
+            self.resources_from_first_agent, self.resources_from_second_agent
         )
-        resources_after_trade = resources + net_resource
-        return resources_after_trade
+
+    def __eq__(self, other):
+        if not isinstance(other, Trade):
+            return NotImplemented
+        return (
+            self.keys == other.keys
+            and self.resources_from_first_agent
+            == other.resources_from_first_agent
+            and self.resources_from_second_agent
+            == other.resources_from_second_agent
+        )
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(
+                (
+                    tuple(self.keys),
+                    self.resources_from_first_agent,
+                    self.resources_from_second_agent,
+                )
+            )
+        return self._hash
 
     def __str__(self):
         a1 = self.keys[0]
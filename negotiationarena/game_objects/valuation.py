@@ -2,25 +2,38 @@
 Representation of how much agent values resources as a unit of `MONEY_TOKEN`
 """
 
-from dataclasses import dataclass
 from negotiationarena.constants import *
 from negotiationarena.game_objects.resource import Resources
 
 
-@dataclass
 class Valuation:
-    valuation_dict: dict = None
     # e.g. {X:2, Y:4,} where 2 => 2M, 4 => 4M
+    __slots__ = ("valuation_dict", "_hash")
+
+    def __init__(self, valuation_dict: dict = None):
+        self.valuation_dict = valuation_dict
+        self._hash = None
 
     def value(self, resources: Resources):
+        valuation_dict = self.valuation_dict
         val_of_resources = 0
         for k, v in resources.resource_dict.items():
             if k != MONEY_TOKEN:
-                val_of_resources += self.valuation_dict[k] * v
+                val_of_resources += valuation_dict[k] * v
             else:
                 val_of_resources += v
         return val_of_resources
 
+    def __eq__(self, other):
+        if not isinstance(other, Valuation):
+            return NotImplemented
+        return self.valuation_dict == other.valuation_dict
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self.valuation_dict.items()))
+        return self._hash
+
     def to_prompt(self):
         res = [f"{k}: {v}" for k, v in self.valuation_dict.items()]
         return ", ".join(res)
@@ -0,0 +1,217 @@
+"""
+League mode: ranks many agent configurations (model x social behaviour x prompt) without a full round robin.
+
+Every configuration has a Glicko rating, a mean and a deviation that shrinks with the games played. Each round
+we pick the matches whose result is the most informative (close ratings, uncertain players), play them
+concurrently and update the ratings. A match is a pair of games with the roles swapped (see
+evaluation.PairedMatchup), the configuration with the better outcome over the two games wins.
+
+The league stops when the ranking did not change for a few rounds and all the deviations are small, or when
+the budget of games runs out.
+
+    league = League(make_game, ["gpt-4 kind", "gpt-4 rude", "gpt-3.5 kind"], workers=8)
+    league.run(budget=200)
+    print(league.ranking())
+"""
+
+import math
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from negotiationarena.evaluation import payoff, paired_advantage
+
+Q = math.log(10) / 400
+
+
+def g(rd):
+    return 1 / math.sqrt(1 + 3 * Q**2 * rd**2 / math.pi**2)
+
+
+class Rating:
+    def __init__(self, mu=1500.0, rd=350.0):
+        self.mu = mu
+        self.rd = rd
+        self.matches = 0
+
+    def json(self):
+        return dict(mu=self.mu, rd=self.rd, matches=self.matches)
+
+
+def play_concurrently(calls, workers):
+    """
+    Runs the calls in a thread pool, games spend most of their time waiting for the models.
+
+    :param calls: list of functions without arguments
+    :return: the results in the same order, None for the calls that failed
+    """
+
+    def safe(call):
+        try:
+            return call()
+        except Exception:
+            print(traceback.format_exc())
+            return None
+
+    if workers <= 1:
+        return [safe(call) for call in calls]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(safe, calls))
+
+
+class League:
+    def __init__(
+        self,
+        make_game,
+        configurations,
+        metric=payoff,
+        workers=4,
+        matches_per_round=None,
+        min_rd=30.0,
+        seed=0,
+    ):
+        """
+        :param make_game: callable taking (configuration of AGENT_ONE, configuration of AGENT_TWO, seed) and
+            returning a new game. Games played at the same time need their own log_path
+        :param configurations: names of the configurations, passed to make_game
+        :param metric: callable taking the index of a player and returning a metric for it
+        :param workers: matches played at the same time
+        :param matches_per_round: defaults to one match for each configuration
+        :param min_rd: deviations never go below this, so ratings can still move
+        :param seed: seed of the first match, the next ones get the following ones
+        """
+        self.make_game = make_game
+        self.configurations = list(configurations)
+        self.metric = metric
+        self.workers = workers
+        self.matches_per_round = matches_per_round or max(
+            1, len(self.configurations) // 2
+        )
+        self.min_rd = min_rd
+        self.seed = seed
+        self.ratings = {c: Rating() for c in self.configurations}
+        # (a, b, score of a)
+        self.history = []
+        self.games = 0
+
+    def expected(self, a, b):
+        """
+        Expected score of `a` against `b`.
+        """
+        ra, rb = self.ratings[a], self.ratings[b]
+        return 1 / (1 + 10 ** (-g(rb.rd) * (ra.mu - rb.mu) / 400))
+
+    def update(self, a, b, score):
+        """
+        Glicko update of both players with the ratings before the match.
+
+        :param score: 1 if `a` won, 0.5 for a draw, 0 if it lost
+        """
+        updated = {}
+        for me, other, s in [(a, b, score), (b, a, 1 - score)]:
+            rating, rd_other = self.ratings[me], self.ratings[other].rd
+            e = self.expected(me, other)
+            d2 = 1 / (Q**2 * g(rd_other) ** 2 * e * (1 - e))
+            precision = 1 / rating.rd**2 + 1 / d2
+            updated[me] = (
+                rating.mu + Q / precision * g(rd_other) * (s - e),
+                max(self.min_rd, math.sqrt(1 / precision)),
+            )
+        for me, (mu, rd) in updated.items():
+            self.ratings[me].mu, self.ratings[me].rd = mu, rd
+            self.ratings[me].matches += 1
+        self.history.append((a, b, score))
+
+    def information(self, a, b):
+        """
+        How much we expect to learn from a match: the outcome is uncertain and the ratings are uncertain.
+        """
+        e = self.expected(a, b)
+        return (
+            e * (1 - e) * (self.ratings[a].rd ** 2 + self.ratings[b].rd ** 2)
+        )
+
+    def next_matches(self):
+        """
+        The most informative matches, every configuration plays at most once per round.
+        """
+        candidates = sorted(
+            (
+                (self.information(a, b), a, b)
+                for i, a in enumerate(self.configurations)
+                for b in self.configurations[i + 1 :]
+            ),
+            reverse=True,
+        )
+        busy, matches = set(), []
+        for _, a, b in candidates:
+            if a in busy or b in busy:
+                continue
+            busy.update((a, b))
+            matches.append((a, b))
+            if len(matches) == self.matches_per_round:
+                break
+        return matches
+
+    def play_match(self, a, b, seed):
+        """
+        Plays the two games of a match, `a` is AGENT_ONE in the first one and AGENT_TWO in the second one.
+
+        :return: score of `a`
+        """
+        first = self.make_game(a, b, seed)
+        first.run()
+        second = self.make_game(b, a, seed)
+        second.run()
+        pair = tuple(
+            float(self.metric(idx)(game))
+            for idx, game in [(0, first), (1, second), (0, second), (1, first)]
+        )
+        advantage = paired_advantage(pair)
+        return 1.0 if advantage > 0 else 0.0 if advantage < 0 else 0.5
+
+    def ranking(self):
+        return sorted(
+            self.configurations, key=lambda c: self.ratings[c].mu, reverse=True
+        )
+
+    def run(self, budget, patience=3, max_rd=100.0):
+        """
+        Plays rounds until the ranking is stable or `budget` games were played.
+
+        :param patience: rounds without changes in the ranking
+        :param max_rd: all the deviations must be below this to stop
+        :return: the ranking
+        """
+        ranking, stable = self.ranking(), 0
+        while self.games + 2 <= budget:
+            matches = self.next_matches()
+            matches = matches[: (budget - self.games) // 2]
+            seeds = [
+                self.seed + self.games // 2 + i for i in range(len(matches))
+            ]
+            scores = play_concurrently(
+                [
+                    lambda a=a, b=b, seed=seed: self.play_match(a, b, seed)
+                    for (a, b), seed in zip(matches, seeds)
+                ],
+                self.workers,
+            )
+            self.games += 2 * len(matches)
+            for (a, b), score in zip(matches, scores):
+                if score is not None:
+                    self.update(a, b, score)
+
+            new_ranking = self.ranking()
+            stable = stable + 1 if new_ranking == ranking else 0
+            ranking = new_ranking
+            if stable >= patience and all(
+                r.rd <= max_rd for r in self.ratings.values()
+            ):
+                break
+        return ranking
+
+    def json(self):
+        return dict(
+            games=self.games,
+            ranking=self.ranking(),
+            ratings={c: r.json() for c, r in self.ratings.items()},
+        )
@@ -2,6 +2,7 @@ import json
 from negotiationarena.game_objects.goal import *
 from negotiationarena.game_objects.trade import Trade
 from negotiationarena.game_objects.valuation import Valuation
+from negotiationarena.game_objects.records import Record
 from negotiationarena.agents.agents import Agent
 from negotiationarena.parser import GameParser
 
@@ -63,10 +64,13 @@ class GameEncoder(json.JSONEncoder):
         if isinstance(obj, Resources):
             return {"_type": "resource", "_value": obj.resource_dict}
 
+        if isinstance(obj, Record):
+            return obj.to_dict()
+
         if isinstance(obj, Agent):
             return obj.get_state()
 
         if isinstance(obj, GameParser):
-            return {"class": obj.__class__.__name__}
+            return obj.to_dict()
 
         return super().default(obj)
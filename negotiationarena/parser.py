@@ -1,10 +1,14 @@
+import inspect
 from abc import ABC, abstractmethod
-from negotiationarena.game_objects.trade import Trade
+from negotiationarena.game_objects.trade import Trade, parse_trade_string
 from negotiationarena.utils import *
 from negotiationarena.constants import *
 
 
 class GameParser(ABC):
+    # tags of a response, in the order used by `format_response`
+    response_tags = []
+
     def __init__(self, **kwargs):
         pass
 
@@ -22,6 +26,29 @@ class GameParser(ABC):
         """
         pass
 
+    def format_response(self, contents):
+        """
+        Writes a response in the format expected by `parse`, e.g. to script agents without a model.
+
+        :param contents: dict of tag -> contents, missing tags are left empty
+        :return:
+        """
+        return "\n".join(
+            "<{}> {} </{}>".format(tag, contents.get(tag, ""), tag)
+            for tag in self.response_tags
+        )
+
+    def to_dict(self):
+        """
+        The class of the parser and its constructor arguments (e.g., the buyer prompt), as stored in the logs.
+        The arguments are read from the attributes with the same name.
+        """
+        state = {"class": self.__class__.__name__}
+        for name in inspect.signature(type(self).__init__).parameters:
+            if name not in ["self", "args", "kwargs"] and hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
     @classmethod
     def from_dict(cls, state):
         state = copy.deepcopy(state)
@@ -58,36 +85,32 @@ class ExchangeGameDefaultParser(GameParser, ABC):
 
     def __init__(self):
         super().__init__()
+        # set by the game, trades naming other resources are rejected
+        self.resource_names = None
 
-    def parse_proposed_trade(self, s):
+    def set_resources(self, *resources):
         """
-        :param s:
-        :return:
+        :param resources: the Resources of the game, e.g. the initial resources of the players
         """
-        trade = {}
-
-        c = s.strip().replace("\n", " ")
-        players = [p.strip() for p in c.split("|") if p.strip()]
-
-        for player in players:
-            if "Player" not in player or "Gives" not in player:
-                raise ValueError(f"Malformed trade entry: '{player}'")
-
-            player_name = player.split("Player", 1)[1].split("Gives", 1)[0].strip()
-        # for player in c.split("|"):
-        #     player_name = player.split("Player")[1].split("Gives")[0].strip()
-            resources = player.split("Gives")[1].strip()
-            # NOTE: We are casting the resources to int.
-            parse_resources = {
-                i.split(":")[0].strip(): int(i.split(":")[1].strip())
-                for i in resources.split(",")
-            }
+        self.resource_names = list(
+            dict.fromkeys(k for r in resources for k in r.resource_dict)
+        )
 
-            trade[player_name] = parse_resources
+    def parse_proposed_trade(self, s):
+        """
+        Parses a trade string (see negotiationarena.game_objects.trade.parse_trade_string).
 
-        return trade
+        :param s:
+        :return: dict of player name -> resources given
+        """
+        return parse_trade_string(s, self.resource_names)
 
     def parse_trade(self, response, interest_tag):
+        """
+        :param response: the response, or a TagIndex of the response
+        :param interest_tag:
+        :return:
+        """
         contents = get_tag_contents(response, interest_tag).lstrip().rstrip()
         if contents == REFUSING_OR_WAIT_TAG:
             return contents
@@ -0,0 +1,226 @@
+"""
+Lightweight profiling of the game engine.
+
+Timing of the phases of a turn.
+
+Agents time the calls to the model (`request`). Agents can also report `throttle` (time they sleep between
+requests to stay within the rate limits) and, when streaming, `first_byte`: both are part of the request time.
+The game times its own work (`validation`, `parse`, `state_write` and `log_write`). The timings of each turn
+are stored in the turn record under `timings`, in seconds.
+
+Opt-in memory snapshots (see `MemoryProfiler`).
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+MODEL_PHASES = ["request"]
+ENGINE_PHASES = ["validation", "parse", "state_write", "log_write"]
+# attributes of the agents holding their API client
+CLIENT_ATTRIBUTES = ["client", "anthropic"]
+SHARED_TYPES = (
+    types.ModuleType,
+    type,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+)
+
+
+@contextmanager
+def timed(timings, phase):
+    """
+    Adds the time spent in the block to timings[phase].
+
+    :param timings: dict of phase -> seconds
+    :param phase:
+    :return:
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def game_timings(game_state):
+    """
+    Total time spent in each phase over the turns of a game.
+
+    :param game_state: the list of turn records of a game
+    :return:
+    """
+    totals = defaultdict(float)
+    for state in game_state:
+        for phase, seconds in state.get("timings", {}).items():
+            totals[phase] += seconds
+    return dict(totals)
+
+
+def profile_summary(game_state):
+    """
+    Compares the time spent waiting for the models with the overhead of the engine.
+
+    :param game_state: the list of turn records of a game
+    :return:
+    """
+    turns = sum("timings" in state for state in game_state)
+    totals = game_timings(game_state)
+    model = sum(totals.get(phase, 0.0) for phase in MODEL_PHASES)
+    engine = sum(totals.get(phase, 0.0) for phase in ENGINE_PHASES)
+
+    return dict(
+        turns=turns,
+        phases=totals,
+        model=model,
+        engine=engine,
+        engine_per_turn=engine / turns if turns else 0.0,
+        engine_fraction=engine / (model + engine) if model + engine else 0.0,
+    )
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Approximate size in bytes of an object and of everything it references.
+    Objects already in `seen` are not counted again. Modules, classes and functions are shared by the whole
+    process and are not counted, neither are the API clients held by the agents (see `structure_sizes`).
+
+    :param obj:
+    :param seen: set of ids of the objects already counted
+    :return:
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            seen.add(id(obj.__dict__))
+            size += sys.getsizeof(obj.__dict__)
+            for k, v in obj.__dict__.items():
+                if k not in CLIENT_ATTRIBUTES:
+                    stack.extend([k, v])
+        # the slots of the base classes are not in type(obj).__slots__
+        for cls in type(obj).__mro__:
+            slots = getattr(cls, "__slots__", ())
+            for slot in [slots] if isinstance(slots, str) else slots:
+                if hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return size
+
+
+def structure_sizes(game):
+    """
+    Bytes held by the main structures of a game. Each object is counted once, in the first structure
+    that references it: clients, conversations, parsed objects and then the rest of the game state
+    (e.g., the agent copies saved at each turn).
+
+    :param game:
+    :return:
+    """
+    seen = set()
+    parsed_keys = ["player_public_info_dict", "player_private_info_dict"]
+
+    clients = [
+        v
+        for player in game.players
+        for k, v in getattr(player, "__dict__", {}).items()
+        if k in CLIENT_ATTRIBUTES and not isinstance(v, str)
+    ]
+    conversations = [
+        getattr(player, "conversation", None) for player in game.players
+    ]
+    parsed_objects = [
+        state[k]
+        for state in game.game_state
+        for k in parsed_keys
+        if k in state
+    ]
+
+    return dict(
+        clients=deep_sizeof(clients, seen),
+        conversations=deep_sizeof(conversations, seen),
+        parsed_objects=deep_sizeof(parsed_objects, seen),
+        game_state=deep_sizeof(game.game_state, seen),
+    )
+
+
+class MemoryProfiler:
+    """
+    Opt-in memory instrumentation for long runs.
+
+    Call `tick(game)` after every turn (`AlternatingGame.run(memory_profiler=...)` does it for you) or after every
+    game, every `every` ticks we take a tracemalloc snapshot and append a line to `memory_report.jsonl`
+    next to the logs with the traced memory, the bytes held by each structure of the game and the
+    top allocation sites.
+    """
+
+    def __init__(self, every=10, top=10, report_path=None, frames=1):
+        self.every = every
+        self.top = top
+        self.report_path = report_path
+        self.ticks = 0
+        # tracing started by someone else is left running by `stop`
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start(frames)
+
+    def tick(self, game):
+        self.ticks += 1
+        if self.ticks % self.every == 0:
+            self.snapshot(game)
+
+    def snapshot(self, game):
+        current, peak = tracemalloc.get_traced_memory()
+        top_stats = tracemalloc.take_snapshot().statistics("lineno")
+
+        report = dict(
+            tick=self.ticks,
+            game=game.log_path,
+            traced_bytes=current,
+            peak_bytes=peak,
+            structures=structure_sizes(game),
+            top=[
+                dict(
+                    site="{}:{}".format(
+                        stat.traceback[0].filename, stat.traceback[0].lineno
+                    ),
+                    bytes=stat.size,
+                    count=stat.count,
+                )
+                for stat in top_stats[: self.top]
+            ],
+        )
+
+        report_path = (
+            os.path.join(os.path.dirname(game.log_path), "memory_report.jsonl")
+            if self.report_path is None
+            else self.report_path
+        )
+        os.makedirs(
+            os.path.dirname(os.path.abspath(report_path)), exist_ok=True
+        )
+        with open(report_path, "a") as f:
+            f.write(json.dumps(report) + "\n")
+
+        return report
+
+    def stop(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
@@ -0,0 +1,184 @@
+"""
+Re-parses the stored raw answers of the players with a new version of a parser.
+
+Every turn keeps the raw answer of the player (`player_complete_answer`) next to what the parser made of it at
+the time (`player_public_info_dict`, `player_private_info_dict`, `player_public_answer_string`). After a fix to
+a parser we run it again on the raw answers of all the stored games, in a process pool, and compare with the
+stored fields. The turns that changed (or that the new parser cannot parse) are written to a JSON lines file
+and can be written back into the logs.
+
+The summary of a game is not recomputed, replay the games (runner/replay_logs.py) to see if the outcomes change.
+
+    results = reparse_logs(["example_logs"], parser=BuySellGameDefaultParser(), workers=8)
+    write_changes("reparsed.jsonl", results)
+"""
+
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor
+from negotiationarena.logging import GameEncoder
+from negotiationarena.parser import GameParser
+
+PARSED_FIELDS = [
+    "player_public_answer_string",
+    "player_public_info_dict",
+    "player_private_info_dict",
+]
+
+
+def encoded(obj):
+    # what would be written in the logs
+    return json.loads(json.dumps(obj, cls=GameEncoder))
+
+
+def parse_turn(parser, response):
+    """
+    :return: the parsed fields of a turn, as they are stored in the logs
+    """
+    agent_message = parser.parse(response)
+    return encoded(
+        dict(
+            player_public_answer_string=agent_message.message_to_other_player(),
+            player_public_info_dict=agent_message.public,
+            player_private_info_dict=agent_message.secret,
+        )
+    )
+
+
+def changed_keys(stored, parsed):
+    """
+    :return: the fields (and the keys of the dicts, e.g. "player_public_info_dict.player answer") that differ
+    """
+    changes = []
+    for field in PARSED_FIELDS:
+        old, new = stored.get(field), parsed.get(field)
+        if isinstance(old, dict) and isinstance(new, dict):
+            changes += [
+                f"{field}.{k}"
+                for k in list(old) + [k for k in new if k not in old]
+                if old.get(k) != new.get(k)
+            ]
+        elif old != new:
+            changes.append(field)
+    return changes
+
+
+def reparse_game(path, parser=None, in_place=False):
+    """
+    Re-parses the turns of the game stored in a game_state.json.
+
+    :param path:
+    :param parser: the GameParser to use, by default the one stored with the game
+    :param in_place: write the new parsed fields into the log, only if all the turns could be parsed
+    :return: dict with the path, the number of turns and the turns that changed or failed
+    """
+    with open(path) as f:
+        game = json.load(f)
+    if parser is None:
+        parser = GameParser.from_dict(game["game_interface"])
+
+    turns, results = 0, []
+    for index, state in enumerate(game["game_state"]):
+        response = state.get("player_complete_answer")
+        if response is None:
+            continue
+        turns += 1
+        result = dict(
+            index=index,
+            current_iteration=state["current_iteration"],
+            turn=state["turn"],
+        )
+        try:
+            parsed = parse_turn(parser, response)
+        except Exception as e:
+            results.append(dict(**result, error=f"{type(e).__name__}: {e}"))
+            continue
+        changes = changed_keys(state, parsed)
+        if changes:
+            results.append(dict(**result, changed=changes, **parsed))
+
+    if in_place and results and not any("error" in r for r in results):
+        for result in results:
+            for field in PARSED_FIELDS:
+                game["game_state"][result["index"]][field] = result[field]
+        # the log is never left half written
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(game, f, indent=2)
+        os.replace(tmp, path)
+
+    return dict(path=path, turns=turns, results=results)
+
+
+def _reparse_game(args):
+    path, parser, in_place = args
+    try:
+        return reparse_game(path, parser, in_place)
+    except Exception as e:
+        return dict(
+            path=path, turns=0, results=[], error=f"{type(e).__name__}: {e}"
+        )
+
+
+def find_logs(log_dirs):
+    return sorted(
+        os.path.join(root, "game_state.json")
+        for log_dir in log_dirs
+        for root, _, files in os.walk(log_dir)
+        if "game_state.json" in files
+    )
+
+
+def reparse_logs(log_dirs, parser=None, workers=None, in_place=False):
+    """
+    :param log_dirs: directories searched recursively for game_state.json
+    :param parser: the GameParser to use, by default the one stored with each game. It is sent to the worker
+        processes, so it has to be picklable (parsers are plain objects)
+    :param workers: processes, by default one per CPU
+    :param in_place: write the new parsed fields into the logs
+    :return: one result per game (see `reparse_game`)
+    """
+    paths = find_logs(log_dirs)
+    jobs = [(path, parser, in_place) for path in paths]
+    if workers == 1:
+        return [_reparse_game(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # games are small, send them in batches
+        chunksize = max(1, len(jobs) // (4 * (workers or os.cpu_count())))
+        return list(pool.map(_reparse_game, jobs, chunksize=chunksize))
+
+
+def write_changes(path, results):
+    """
+    One JSON line per turn that changed or failed, with the log path and the new parsed fields.
+    """
+    with open(path, "w") as f:
+        for game in results:
+            for result in game["results"]:
+                f.write(
+                    json.dumps(dict(path=game["path"], **result), default=str)
+                    + "\n"
+                )
+
+
+def summarize(results):
+    """
+    :return: dict with the games, the turns, the turns that changed or failed and how often each key changed
+    """
+    keys = {}
+    for game in results:
+        for result in game["results"]:
+            for key in result.get("changed", []):
+                keys[key] = keys.get(key, 0) + 1
+    return dict(
+        games=len(results),
+        failed_games=sum("error" in game for game in results),
+        turns=sum(game["turns"] for game in results),
+        changed_turns=sum(
+            "changed" in r for game in results for r in game["results"]
+        ),
+        failed_turns=sum(
+            "error" in r for game in results for r in game["results"]
+        ),
+        changed_keys=dict(sorted(keys.items(), key=lambda kv: -kv[1])),
+    )
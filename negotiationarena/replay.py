@@ -0,0 +1,217 @@
+"""
+Record/replay of games.
+
+A cassette serves the completions stored in a game_state.json instead of calling the model: each call returns the
+next assistant message of the recorded conversation of the player. Before answering we check that the prompt
+(the conversation so far) is the one that was recorded and keep track of the divergences.
+
+This lets us rerun the logs at CPU speed after a change to the engine or to the parsers and check that the
+outcome computed by `after_game_ends` did not change.
+"""
+
+import os
+import json
+import inspect
+
+from negotiationarena.agents.agents import Agent
+from negotiationarena.agents.scripted import ScriptedAgent
+from negotiationarena.game_objects.game import Game
+from negotiationarena.logging import GameEncoder, GameDecoder
+from negotiationarena.parser import GameParser
+
+
+class CassetteExhausted(Exception):
+    pass
+
+
+class CassetteAgent(Agent):
+    """
+    Wraps an agent and serves its completions from a recorded conversation.
+
+    The wrapped agent is only used to build the conversation (e.g., `init_agent`), it is never asked to chat.
+    Without an agent we use a ScriptedAgent, which builds the conversation like the chat agents.
+    """
+
+    def __init__(self, conversation, agent=None, agent_name=None):
+        """
+        :param conversation: the recorded conversation of the player (e.g., `players[idx]["conversation"]`)
+        :param agent: the agent to wrap
+        :param agent_name: needed only without an agent
+        """
+        agent = ScriptedAgent(agent_name) if agent is None else agent
+        super().__init__(agent.agent_name)
+        self.agent = agent
+        self.model = agent.model
+        self.recorded = conversation
+        self.answers = [
+            i for i, m in enumerate(conversation) if m["role"] == "assistant"
+        ]
+        self.calls = 0
+        self.divergences = []
+
+    @property
+    def conversation(self):
+        return self.agent.conversation
+
+    @conversation.setter
+    def conversation(self, conversation):
+        self.agent.conversation = conversation
+
+    def init_agent(self, system_prompt, role):
+        self.agent.init_agent(system_prompt, role)
+
+    def update_conversation_tracking(self, role, message):
+        self.agent.update_conversation_tracking(role, message)
+
+    def check_prompt(self, position):
+        """
+        Compares the conversation so far with the recorded one, the first difference is saved as a divergence.
+
+        :param position: index of the recorded answer
+        :return: True if the prompt matches
+        """
+        expected = self.recorded[:position]
+        actual = self.conversation
+        if actual == expected:
+            return True
+
+        index = next(
+            (i for i, (a, b) in enumerate(zip(actual, expected)) if a != b),
+            min(len(actual), len(expected)),
+        )
+        self.divergences.append(
+            dict(
+                call=self.calls,
+                message=index,
+                expected=expected[index] if index < len(expected) else None,
+                actual=actual[index] if index < len(actual) else None,
+            )
+        )
+        return False
+
+    def chat(self):
+        if self.calls >= len(self.answers):
+            raise CassetteExhausted(
+                "{} has no recorded answer for call {}".format(
+                    self.agent_name, self.calls
+                )
+            )
+        position = self.answers[self.calls]
+        self.check_prompt(position)
+        self.calls += 1
+        return self.recorded[position]["content"]
+
+    def get_state(self):
+        # replayed logs look like the original ones
+        return self.agent.get_state()
+
+
+def game_class(class_name):
+    subclasses = Game.get_all_subclasses()
+    constructor = next(
+        (sub for sub in subclasses if sub.__name__ == class_name), None
+    )
+    if constructor is None:
+        raise ValueError(
+            f"Unknown game: {class_name}, make sure the games are imported"
+        )
+    return constructor
+
+
+def constructor_arguments(constructor, game_dict):
+    """
+    Takes from the stored game the arguments accepted by the constructors of the game and of its base classes.
+    """
+    names = set()
+    for cls in constructor.__mro__:
+        if "__init__" in cls.__dict__:
+            names.update(inspect.signature(cls.__init__).parameters)
+    names -= {"self", "args", "kwargs", "players"}
+    names -= {"log_dir", "log_path"}
+    arguments = {k: v for k, v in game_dict.items() if k in names}
+    if isinstance(arguments.get("game_interface"), dict):
+        # the parser is stored with its constructor arguments, e.g. the buyer prompt
+        arguments["game_interface"] = GameParser.from_dict(
+            arguments["game_interface"]
+        )
+    return arguments
+
+
+def replay_game(game_dict, log_path, agents=None):
+    """
+    Plays again a stored game with cassette agents.
+
+    :param game_dict: the content of game_state.json, loaded with GameDecoder
+    :param log_path: where to log the replayed game
+    :param agents: optional agents to wrap, one per player
+    :return: the replayed game
+    """
+    agents = [None, None] if agents is None else agents
+    players = [
+        CassetteAgent(
+            player["conversation"],
+            agent=agent,
+            agent_name=player["agent_name"],
+        )
+        for player, agent in zip(game_dict["players"], agents)
+    ]
+    constructor = game_class(game_dict["class"])
+    game = constructor(
+        players=players,
+        log_path=log_path,
+        **constructor_arguments(constructor, game_dict),
+    )
+    game.run()
+    return game
+
+
+def _summary(game_state):
+    last = game_state[-1] if game_state else {}
+    summary = (
+        last.get("summary") if last.get("current_iteration") == "END" else None
+    )
+    # compare what would be written in the logs
+    return json.loads(json.dumps(summary, cls=GameEncoder))
+
+
+def replay_report(game_dict, game):
+    """
+    :param game_dict: the stored game
+    :param game: the replayed game
+    :return: dict with the divergences of each player and the outcome before and after
+    """
+    recorded = _summary(game_dict["game_state"])
+    replayed = _summary(game.game_state)
+    return dict(
+        divergences=[player.divergences for player in game.players],
+        unused_answers=[
+            len(player.answers) - player.calls for player in game.players
+        ],
+        outcome_unchanged=recorded == replayed,
+        changed_keys=sorted(
+            k
+            for k in set(recorded or {}) | set(replayed or {})
+            if (recorded or {}).get(k) != (replayed or {}).get(k)
+        ),
+    )
+
+
+def replay_log(path, log_dir, agents=None):
+    """
+    Replays the game stored in a game_state.json.
+
+    :param path: path of game_state.json
+    :param log_dir: the replayed game is logged in log_dir/<name of the original log folder>
+    :param agents: optional agents to wrap, one per player
+    :return: the report of the replay (see `replay_report`)
+    """
+    with open(path) as f:
+        game_dict = json.load(f, cls=GameDecoder)
+    log_path = os.path.join(
+        os.path.abspath(log_dir), os.path.basename(os.path.dirname(path))
+    )
+    try:
+        game = replay_game(game_dict, log_path, agents=agents)
+    except CassetteExhausted as e:
+        return dict(path=path, error=str(e))
+    return dict(path=path, **replay_report(game_dict, game))
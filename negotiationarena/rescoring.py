@@ -0,0 +1,279 @@
+"""
+Offline re-scoring of stored games.
+
+When we change how outcomes are valued (e.g., a different cost for the seller or a new resource goal) we do not
+need to rerun the games: the initial resources, the last proposed trade and the final answer are in the summary
+of every game_state.json. We read them as plain JSON (no GameDecoder, the conversations are never turned into
+objects), put all the games of the log directories in one ResourceLedger and compute the new scores on the
+arrays. The scores go to a side table, one row per game, the logs are not touched.
+
+    rows = read_logs(["example_logs"])
+    scores = rescore(rows, {
+        "stored": valuation_payoffs(),
+        "cost_45": valuation_payoffs(lambda row: [{"X": 45}, row["valuations"][1]]),
+    })
+    write_side_table("rescored.csv", rows, scores)
+"""
+
+import os
+import csv
+import json
+import numpy as np
+from negotiationarena.constants import *
+from negotiationarena.game_objects.ledger import ResourceLedger
+from negotiationarena.bargaining import bargaining_solution, scenario_key
+
+
+def plain(obj):
+    """
+    Drops the {"_type", "_value"} wrappers written by GameEncoder.
+    """
+    if isinstance(obj, dict):
+        if "_type" in obj and "_value" in obj:
+            return plain(obj["_value"])
+        return {k: plain(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [plain(v) for v in obj]
+    return obj
+
+
+def goal_of(goal):
+    """
+    :param goal: a goal as stored in the logs
+    :return: (type of the goal, its value), e.g. ("seller_goal", {"X": 40})
+    """
+    if not isinstance(goal, dict) or goal.get("_type") != "goal":
+        return None, None
+    goal = goal["_value"]
+    return goal["_type"], plain(goal["_value"])
+
+
+def read_row(path):
+    """
+    Reads what we need to score a game from its game_state.json.
+
+    :param path:
+    :return: dict, None if the game did not end with a summary
+    """
+    with open(path) as f:
+        game = json.load(f)
+
+    game_state = game["game_state"]
+    summary = game_state[-1].get("summary") if game_state else None
+    if not summary:
+        return None
+    settings = game_state[0].get("settings", {})
+
+    initial = summary.get(
+        "player_initial_resources", summary.get("initial_resources")
+    )
+    if initial is None:
+        initial = settings.get("player_initial_resources", [{}, {}])
+
+    # the first player of the trade is RED, see Trade
+    trade = plain(summary.get("proposed_trade"))
+    if isinstance(trade, dict) and len(trade) == 2:
+        trade = [trade[k] for k in sorted(trade, reverse=True)]
+    else:
+        trade = None
+
+    goals = [goal_of(g) for g in summary.get("player_goals", [])]
+    valuations = plain(summary.get("player_valuation"))
+    if valuations is None:
+        # the valuation of buyers and sellers is in their goal
+        valuations = [
+            value if kind in ["buyer_goal", "seller_goal"] else None
+            for kind, value in goals
+        ] or None
+
+    return dict(
+        path=path,
+        game=game.get("class"),
+        models=[p.get("model") for p in game.get("players", [])],
+        behaviours=settings.get("player_social_behaviour", ["", ""]),
+        initial=plain(initial),
+        trade=trade,
+        accepted=summary.get("final_response") == ACCEPTING_TAG,
+        goals=goals,
+        valuations=valuations,
+        outcome=plain(summary.get("player_outcome")),
+    )
+
+
+def read_logs(log_dirs):
+    """
+    :param log_dirs: directories searched recursively for game_state.json
+    :return: the rows of the games that ended (see `read_row`)
+    """
+    paths = sorted(
+        os.path.join(root, "game_state.json")
+        for log_dir in log_dirs
+        for root, _, files in os.walk(log_dir)
+        if "game_state.json" in files
+    )
+    rows = []
+    for path in paths:
+        try:
+            row = read_row(path)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+def ledger_of(rows):
+    return ResourceLedger.from_dicts(
+        initial_resources=[row["initial"] for row in rows],
+        trades=[row["trade"] for row in rows],
+        accepted=[row["accepted"] for row in rows],
+        valuations=[row["valuations"] for row in rows],
+    )
+
+
+def valuation_payoffs(valuations=None):
+    """
+    Scorer: value of the change in resources of each player, as in `BuySellGame.after_game_ends`.
+
+    :param valuations: callable taking a row and returning the pair of dicts resource -> value (or None, each
+        unit is worth one), or a fixed pair for all the games. By default the stored valuations
+    """
+
+    def scorer(ledger, rows):
+        if valuations is None:
+            return ledger.payoffs()
+        new = [
+            valuations(row) if callable(valuations) else valuations
+            for row in rows
+        ]
+        return ledger.payoffs(ledger.valuation_array(new))
+
+    return scorer
+
+
+def goals_reached(goals=None):
+    """
+    Scorer: whether the final resources satisfy a resource goal for each player, as in
+    `TradingGame.after_game_ends`, nan for the games without resource goals.
+
+    :param goals: callable taking a row and returning the pair of dicts resource -> amount (or None, the game has
+        no resource goals), or a fixed pair for all the games. By default the stored resource goals
+    """
+
+    def stored(row):
+        if row["goals"] and all(
+            kind == "resource_goal" for kind, _ in row["goals"]
+        ):
+            return [value for _, value in row["goals"]]
+        return None
+
+    def scorer(ledger, rows):
+        get = stored if goals is None else goals
+        pairs = [get(row) if callable(get) else get for row in rows]
+        reached = ledger.goals_reached(
+            [[{}, {}] if pair is None else pair for pair in pairs]
+        )
+        scores = reached.astype(float)
+        scores[[pair is None for pair in pairs]] = np.nan
+        return scores
+
+    return scorer
+
+
+def final_resources(weights=None):
+    """
+    Scorer: what each player has at the end, e.g. the payoff of RED in the ultimatum game.
+
+    :param weights: dict resource -> weight, by default every unit is worth one
+    """
+
+    def scorer(ledger, rows):
+        w = np.ones(len(ledger.resource_names))
+        for k, v in (weights or {}).items():
+            if k in ledger.index:
+                w[ledger.index[k]] = v
+        return ledger.final_resources() @ w
+
+    return scorer
+
+
+def bargaining_efficiency(field="nash_gap"):
+    """
+    Scorer: how the outcome of a trading game compares with the bargaining solutions of its scenario (see
+    `BargainingSolution.efficiency`), nan for the games without resource goals.
+
+    :param field: "nash_gap" and "utilities" give a column per player, "pareto_efficient" and "nash_share" a
+        single column
+    """
+
+    def scorer(ledger, rows):
+        # net transfer from RED to BLUE of the accepted trades
+        net = (ledger.given[:, 0] - ledger.given[:, 1]) * ledger.accepted[
+            :, None
+        ]
+        scenarios = {}
+        for i, row in enumerate(rows):
+            if row["goals"] and all(
+                kind == "resource_goal" for kind, _ in row["goals"]
+            ):
+                goals = [value for _, value in row["goals"]]
+                key = scenario_key(row["initial"], goals)
+                if key not in scenarios:
+                    scenarios[key] = (row["initial"], goals, [])
+                scenarios[key][2].append(i)
+
+        scores = np.full((len(rows), 2), np.nan)
+        for initial, goals, games in scenarios.values():
+            solution = bargaining_solution(initial, goals)
+            columns = np.zeros(
+                (len(games), len(solution.resource_names)), np.int64
+            )
+            for j, name in enumerate(solution.resource_names):
+                if name in ledger.index:
+                    columns[:, j] = net[games, ledger.index[name]]
+            values = solution.efficiency(columns)[field]
+            scores[games] = values if values.ndim == 2 else values[:, None]
+        return scores if field in ["nash_gap", "utilities"] else scores[:, 0]
+
+    return scorer
+
+
+def rescore(rows, scorers):
+    """
+    :param rows: from `read_logs`
+    :param scorers: dict name -> scorer, a callable taking (ledger, rows) and returning a (N, 2) array (or
+        (N,) for a score of the game)
+    :return: dict name -> array
+    """
+    if not rows:
+        return {name: np.zeros((0, 2)) for name in scorers}
+    ledger = ledger_of(rows)
+    return {
+        name: np.asarray(scorer(ledger, rows))
+        for name, scorer in scorers.items()
+    }
+
+
+def write_side_table(path, rows, scores):
+    """
+    One line per game with its log path, game, models, whether the trade was accepted and, for each score, a
+    column per player (or a single column for a score of the game).
+    """
+    columns = ["path", "game", "model_1", "model_2", "accepted"]
+    for name, values in scores.items():
+        columns += [f"{name}_1", f"{name}_2"] if values.ndim == 2 else [name]
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for i, row in enumerate(rows):
+            models = (row["models"] + [None, None])[:2]
+            line = [row["path"], row["game"], *models, int(row["accepted"])]
+            for values in scores.values():
+                line += (
+                    [v.item() for v in values[i]]
+                    if values.ndim == 2
+                    else [values[i].item()]
+                )
+            writer.writerow(line)
@@ -0,0 +1,158 @@
+"""
+Search over prompt and behaviour variants with successive halving and Hyperband.
+
+Every candidate starts with a few games, then the worst performing fraction is dropped and the survivors get
+more games, until one candidate is left. Hyperband runs several successive halvings that trade the number of
+candidates against the games each one gets at the start, which is safer when a few games are too noisy to
+tell candidates apart.
+
+    candidates = {"kind": "You are kind.", "rude": "You are rude."}
+    result = successive_halving(candidates, make_game, payoff(1), initial_games=2)
+    print(result["best"])
+"""
+
+import math
+import random
+from negotiationarena.evaluation import RunningStats
+from negotiationarena.league import play_concurrently
+
+
+def _play(make_game, config, seed, metric):
+    game = make_game(config, seed)
+    game.run()
+    return float(metric(game))
+
+
+def _play_round(candidates, names, seeds, make_game, metric, workers):
+    """
+    Every candidate in `names` plays a game with each seed.
+
+    :return: list of (name, score), score None for the games that failed
+    """
+    jobs = [(name, s) for name in names for s in seeds]
+    scores = play_concurrently(
+        [
+            lambda name=name, s=s: _play(
+                make_game, candidates[name], s, metric
+            )
+            for name, s in jobs
+        ],
+        workers,
+    )
+    return [(name, score) for (name, _), score in zip(jobs, scores)]
+
+
+def successive_halving(
+    candidates, make_game, metric, initial_games=2, eta=2, workers=1, seed=0
+):
+    """
+    :param candidates: dict name -> configuration, passed to make_game
+    :param make_game: callable taking (configuration, seed) and returning a new game
+    :param metric: callable taking a finished game and returning the score of the candidate, higher is better
+    :param initial_games: games of every candidate in the first round
+    :param eta: only the best 1 / eta candidates survive a round, and they get eta times more games
+    :param workers: games played at the same time
+    :param seed: games with the same seed are played by all the candidates of a round
+    :return: dict with the best candidate, the statistics of every candidate, the rounds and the games played
+    """
+    stats = {name: RunningStats() for name in candidates}
+    survivors = list(candidates)
+    rounds, games, next_seed = [], 0, seed
+
+    while True:
+        n = initial_games * eta ** len(rounds)
+        # the candidates of a round play with the same seeds
+        seeds = list(range(next_seed, next_seed + n))
+        next_seed += n
+        results = _play_round(
+            candidates, survivors, seeds, make_game, metric, workers
+        )
+        games += len(results)
+        for name, score in results:
+            if score is not None:
+                stats[name].add(score)
+
+        ranked = sorted(
+            survivors,
+            key=lambda name: stats[name].mean if stats[name].n else -math.inf,
+            reverse=True,
+        )
+        rounds.append(
+            [dict(name=name, **stats[name].json()) for name in ranked]
+        )
+        survivors = ranked[: max(1, len(ranked) // eta)]
+        if len(survivors) == 1:
+            break
+
+    return dict(
+        best=survivors[0],
+        stats={name: s.json() for name, s in stats.items()},
+        rounds=rounds,
+        games=games,
+    )
+
+
+def hyperband(
+    candidates,
+    make_game,
+    metric,
+    max_games=27,
+    eta=3,
+    workers=1,
+    seed=0,
+):
+    """
+    Runs successive halving on random subsets of the candidates, from many candidates with a single game each
+    to few candidates with `max_games` each.
+
+    :param max_games: most games a candidate gets in the first round of a bracket
+    :return: dict with the best candidate, the brackets, the statistics of the final round and the games
+        played. The winners of the brackets play a final round of `max_games` games each on the same seeds,
+        the best one there is the best candidate
+    """
+    rng = random.Random(seed)
+    names = list(candidates)
+    s_max = int(math.log(max_games, eta) + 1e-9)
+    brackets, games = [], 0
+
+    for s in range(s_max, -1, -1):
+        n = int(math.ceil((s_max + 1) / (s + 1) * eta**s))
+        subset = rng.sample(names, min(n, len(names)))
+        result = successive_halving(
+            {name: candidates[name] for name in subset},
+            make_game,
+            metric,
+            initial_games=max(1, int(max_games * eta**-s)),
+            eta=eta,
+            workers=workers,
+            seed=seed + games,
+        )
+        games += result["games"]
+        brackets.append(result)
+
+    # bracket winners played different numbers of games, the means of the small brackets are the luckiest
+    # ones: the winners play again on the same seeds before we pick one
+    winners = list(dict.fromkeys(result["best"] for result in brackets))
+    final = {}
+    if len(winners) > 1:
+        seeds = list(range(seed + games, seed + games + max_games))
+        results = _play_round(
+            candidates, winners, seeds, make_game, metric, workers
+        )
+        games += len(results)
+        final = {name: RunningStats() for name in winners}
+        for name, score in results:
+            if score is not None:
+                final[name].add(score)
+        best = max(
+            winners,
+            key=lambda name: final[name].mean if final[name].n else -math.inf,
+        )
+    else:
+        best = winners[0]
+    return dict(
+        best=best,
+        brackets=brackets,
+        final={name: s.json() for name, s in final.items()},
+        games=games,
+    )
@@ -0,0 +1,265 @@
+"""
+Text-free simulator of the buy-sell and ultimatum games, for parametric studies.
+
+Millions of games are stored as arrays (offers, reservation values, proposals made, ...) and stepped all at
+once: one NumPy operation per turn of the games instead of one model call. Players follow the time-dependent
+concession strategy of negotiationarena.agents.strategies.TimeDependentAgent, with the same rounding, the same
+acceptance rule and the same proposal limits, so a simulated game ends like the same game played through the
+engine with two TimeDependentAgent. The payoffs are those of `BuySellGame.after_game_ends` and
+`MultiTurnUltimatumGame.after_game_ends`.
+
+Every game is a single number negotiated between RED and BLUE: the price of the object in the buy-sell game,
+the amount RED gives to BLUE in the ultimatum game.
+"""
+
+import numpy as np
+
+
+def buy_sell_proposal_limits(iterations):
+    """
+    Same limits as BuySellGame.move_validator.
+
+    :return: (2, N) number of proposals RED and BLUE can make
+    """
+    iterations = np.asarray(iterations)
+    limit = iterations // 2 - 1
+    return np.stack([limit, limit])
+
+
+def ultimatum_moves(iterations):
+    """
+    Moves of each player in the ultimatum game, RED moves first. MultiTurnUltimatumGame tells the players
+    these numbers in the prompt.
+
+    :return: (2, N) number of moves of RED and BLUE
+    """
+    iterations = np.asarray(iterations)
+    return np.stack([(iterations + 1 - idx) // 2 for idx in range(2)])
+
+
+def ultimatum_proposal_limits(iterations):
+    """
+    Limits of MultiTurnUltimatumGame.move_validator, the player with the last move cannot propose on it.
+
+    :return: (2, N) number of proposals RED and BLUE can make
+    """
+    iterations = np.asarray(iterations)
+    last_player = (iterations - 1) % 2
+    return ultimatum_moves(iterations) - np.stack(
+        [last_player == idx for idx in range(2)]
+    )
+
+
+def utility(value, best, reservation):
+    """
+    Normalized utility, 1 at the best value and 0 at the reservation value (see StrategyAgent.utility).
+    """
+    span = best - reservation
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = (value - reservation) / np.where(span == 0, 1, span)
+    return np.where(span == 0, np.where(value == best, 1.0, -1.0), normalized)
+
+
+def value_of(target, best, reservation):
+    """
+    Value with the target utility, rounded in favour of the player (see StrategyAgent.value_of).
+    """
+    value = reservation + target * (best - reservation)
+    return np.where(best > reservation, np.ceil(value), np.trunc(value))
+
+
+def time_dependent_target(made, limit, e):
+    """
+    Target utility of TimeDependentAgent: 1 - t ** (1 / e) with t the fraction of the proposals made.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.minimum(1.0, made / np.maximum(1, limit - 1))
+    t = np.where(limit == 0, 1.0, t)
+    return 1 - t ** (1 / e)
+
+
+def simulate(best, reservation, e, iterations, limits):
+    """
+    Plays N games at once, RED moves first.
+
+    On its turn a player accepts the last offer of the other player if it is at least as good as the offer it
+    would make, otherwise it makes that offer. Without proposals left it accepts any offer above its
+    reservation value and waits otherwise. Games end on an accept or after `iterations` turns.
+
+    :param best: (2, N) opening value of RED and BLUE
+    :param reservation: (2, N) worst value each player accepts
+    :param e: (2, N) concession exponent of each player (< 1 Boulware, > 1 Conceder)
+    :param iterations: (N,) number of turns of each game
+    :param limits: (2, N) number of proposals each player can make
+    :return: dict of (N,) arrays: accepted, value (the accepted offer, nan without a deal), turns and
+        proposals (2, N)
+    """
+    best, reservation, e, limits = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (best, reservation, e, limits))
+    )
+    n = best.shape[1]
+    iterations = np.broadcast_to(np.asarray(iterations), (n,))
+
+    made = np.zeros((2, n))
+    offer = np.full(n, np.nan)
+    value = np.full(n, np.nan)
+    accepted = np.zeros(n, dtype=bool)
+    turns = np.zeros(n, dtype=int)
+
+    for iteration in range(1, int(iterations.max()) + 1):
+        active = ~accepted & (iteration <= iterations)
+        if not active.any():
+            break
+        p = (iteration - 1) % 2
+        turns += active
+
+        can_propose = made[p] < limits[p]
+        proposal = value_of(
+            time_dependent_target(made[p], limits[p], e[p]),
+            best[p],
+            reservation[p],
+        )
+        offered = utility(offer, best[p], reservation[p])
+        threshold = np.where(
+            can_propose, utility(proposal, best[p], reservation[p]), 0.0
+        )
+        # comparisons with nan (no offer) are False
+        accept = active & (offered >= threshold)
+        propose = active & can_propose & ~accept
+
+        accepted |= accept
+        value = np.where(accept, offer, value)
+        made[p] += propose
+        offer = np.where(active, np.where(propose, proposal, np.nan), offer)
+
+    return dict(accepted=accepted, value=value, turns=turns, proposals=made)
+
+
+def buy_sell_payoffs(price, accepted, cost, willingness_to_pay):
+    """
+    Payoffs of BuySellGame.after_game_ends: the seller values the object at its cost of production, the buyer
+    at its willingness to pay, without a deal nobody gains anything.
+
+    :return: (2, N) payoff of the seller (RED) and of the buyer (BLUE)
+    """
+    price = np.where(accepted, price, 0)
+    return np.stack(
+        [
+            np.where(accepted, price - cost, 0),
+            np.where(accepted, willingness_to_pay - price, 0),
+        ]
+    )
+
+
+def ultimatum_payoffs(amount, accepted, total):
+    """
+    Payoffs of MultiTurnUltimatumGame.after_game_ends: RED gets what it keeps, BLUE what it is given.
+
+    :return: (2, N) payoff of RED and BLUE
+    """
+    amount = np.where(accepted, amount, 0)
+    total = np.broadcast_to(total, amount.shape)
+    return np.stack([total - amount, amount])
+
+
+def simulate_buy_sell(
+    cost, willingness_to_pay, seller_e, buyer_e, iterations, markup=0.5
+):
+    """
+    Buy-sell games where the seller opens at cost * (1 + markup) and concedes down to its cost and the buyer
+    opens at willingness_to_pay * (1 - markup) and concedes up to its willingness to pay.
+
+    All the arguments are broadcast together, e.g., a grid of costs and willingness to pay:
+
+        cost, wtp = np.meshgrid(np.arange(100), np.arange(100))
+        result = simulate_buy_sell(cost.ravel(), wtp.ravel(), 0.2, 5.0, 10)
+
+    :return: the result of `simulate` with the payoffs (2, N) and the inputs
+    """
+    cost, willingness_to_pay, seller_e, buyer_e, iterations = (
+        a.ravel()
+        for a in np.broadcast_arrays(
+            *(
+                np.asarray(a)
+                for a in (
+                    cost,
+                    willingness_to_pay,
+                    seller_e,
+                    buyer_e,
+                    iterations,
+                )
+            )
+        )
+    )
+    best = np.stack(
+        [
+            np.ceil(cost * (1 + markup)),
+            np.trunc(willingness_to_pay * (1 - markup)),
+        ]
+    )
+    reservation = np.stack([cost, willingness_to_pay])
+    result = simulate(
+        best,
+        reservation,
+        np.stack([seller_e, buyer_e]),
+        iterations,
+        buy_sell_proposal_limits(iterations),
+    )
+    result["payoffs"] = buy_sell_payoffs(
+        result["value"], result["accepted"], cost, willingness_to_pay
+    )
+    result.update(cost=cost, willingness_to_pay=willingness_to_pay)
+    return result
+
+
+def simulate_ultimatum(
+    red_best,
+    red_reservation,
+    blue_best,
+    blue_reservation,
+    red_e,
+    blue_e,
+    iterations,
+    total=100,
+):
+    """
+    Ultimatum games over the amount RED gives to BLUE out of `total`.
+
+    :return: the result of `simulate` with the payoffs (2, N)
+    """
+    arrays = np.broadcast_arrays(
+        *(
+            np.asarray(a)
+            for a in (
+                red_best,
+                red_reservation,
+                blue_best,
+                blue_reservation,
+                red_e,
+                blue_e,
+                iterations,
+                total,
+            )
+        )
+    )
+    (
+        red_best,
+        red_reservation,
+        blue_best,
+        blue_reservation,
+        red_e,
+        blue_e,
+        iterations,
+        total,
+    ) = (a.ravel() for a in arrays)
+    result = simulate(
+        np.stack([red_best, blue_best]),
+        np.stack([red_reservation, blue_reservation]),
+        np.stack([red_e, blue_e]),
+        iterations,
+        ultimatum_proposal_limits(iterations),
+    )
+    result["payoffs"] = ultimatum_payoffs(
+        result["value"], result["accepted"], total
+    )
+    return result
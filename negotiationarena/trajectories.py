@@ -0,0 +1,302 @@
+"""
+Offers of all the stored games as one columnar table, to study how players concede.
+
+Each row is a resource in the trade proposed in a turn: game, position of the turn in the game, player that
+proposed, player that would give the resource, resource, amount and the answer of the player in that turn.
+Turns without a trade (e.g., the player accepted) have a single row with resource -1 so that the answers are
+there too. Rows are sorted by game and turn, `offsets[g]:offsets[g + 1]` are the rows of game g.
+
+Analyses work on the columns, without going back to the games:
+
+    table = OfferTable.from_logs(["example_logs"])
+    # the price proposed in each turn of the buy-sell games: what BLUE gives
+    price = table.series(giver=1, resource=MONEY_TOKEN)
+    first = first_offers(price, len(table))
+    concessions = mean_concession(price, len(table))
+    converged = convergence_turns(
+        price, len(table), accepted=table.answer_turns(ACCEPTING_TAG)
+    )
+"""
+
+import json
+import numpy as np
+from negotiationarena.constants import *
+from negotiationarena.reparse import find_logs
+
+COLUMNS = ["game", "turn", "player", "giver", "resource", "amount", "answer"]
+
+
+def offers_of(game):
+    """
+    :param game: a game_state.json loaded as plain JSON
+    :return: list of (turn, player, giver, resource, amount, answer), resource None without a trade
+    """
+    rows = []
+    turns = [s for s in game["game_state"] if "player_complete_answer" in s]
+    for turn, state in enumerate(turns):
+        public = state.get("player_public_info_dict") or {}
+        answer = public.get(PLAYER_ANSWER_TAG)
+        trade = public.get(PROPOSED_TRADE_TAG)
+        player = state["turn"]
+        if isinstance(trade, dict) and trade.get("_type") == "trade":
+            trade = trade["_value"]
+            # the first player of the trade is RED, see Trade
+            sides = [trade[k] for k in sorted(trade, reverse=True)]
+            items = [
+                (giver, resource, amount)
+                for giver, side in enumerate(sides)
+                for resource, amount in side["_value"].items()
+            ]
+            if items:
+                rows += [(turn, player, *item, answer) for item in items]
+                continue
+        rows.append((turn, player, -1, None, 0, answer))
+    return rows
+
+
+class OfferTable:
+    def __init__(self, columns, offsets, games, resources, answers):
+        """
+        :param columns: dict name -> (rows,) array, see COLUMNS. `resource` and `answer` are codes into
+            `resources` and `answers`
+        :param offsets: (games + 1,) first row of each game
+        :param games: path of each game
+        :param resources: names of the resources
+        :param answers: the answers
+        """
+        self.columns = columns
+        self.offsets = offsets
+        self.games = games
+        self.resources = resources
+        self.answers = answers
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_games(cls, games, names=None):
+        """
+        :param games: games loaded as plain JSON
+        :param names: a name for each game, e.g. its path
+        """
+        resources, answers = {}, {}
+        rows, offsets = [], [0]
+        for g, game in enumerate(games):
+            for turn, player, giver, resource, amount, answer in offers_of(
+                game
+            ):
+                code = (
+                    -1
+                    if resource is None
+                    else resources.setdefault(resource, len(resources))
+                )
+                rows.append(
+                    (
+                        g,
+                        turn,
+                        player,
+                        giver,
+                        code,
+                        amount,
+                        answers.setdefault(str(answer), len(answers)),
+                    )
+                )
+            offsets.append(len(rows))
+
+        data = np.array(rows, dtype=np.int64).reshape(-1, len(COLUMNS))
+        return cls(
+            columns={name: data[:, i] for i, name in enumerate(COLUMNS)},
+            offsets=np.array(offsets, dtype=np.int64),
+            games=list(names or range(len(offsets) - 1)),
+            resources=list(resources),
+            answers=list(answers),
+        )
+
+    @classmethod
+    def from_logs(cls, log_dirs):
+        """
+        :param log_dirs: directories searched recursively for game_state.json
+        """
+        paths = find_logs(log_dirs)
+        games = []
+        for path in paths:
+            with open(path) as f:
+                games.append(json.load(f))
+        return cls.from_games(games, names=paths)
+
+    def rows_of(self, game):
+        return slice(self.offsets[game], self.offsets[game + 1])
+
+    def turns_per_game(self):
+        """
+        (games,) number of turns of each game.
+        """
+        last = np.full(len(self), -1)
+        np.maximum.at(last, self.game, self.turn)
+        return last + 1
+
+    def answer_turns(self, answer):
+        """
+        (games,) first turn (the `turn` column, the position of the turn among the turns of the players) whose
+        answer is `answer`, e.g. `table.answer_turns(ACCEPTING_TAG)` is where the trade was accepted. -1 in the
+        games without such a turn. Answers are compared as strings, as they are stored in the table.
+        """
+        first = np.full(len(self), np.iinfo(np.int64).max)
+        if answer in self.answers:
+            mask = self.answer == self.answers.index(answer)
+            np.minimum.at(first, self.game[mask], self.turn[mask])
+        return np.where(first == np.iinfo(np.int64).max, -1, first)
+
+    def series(self, giver, resource):
+        """
+        The amount of a resource offered by `giver` in each turn that proposed a trade, 0 when the trade did
+        not include it.
+
+        :return: dict with the game, turn, player and amount arrays
+        """
+        proposals = self.resource >= 0
+        # one entry per turn with a trade
+        keys = self.game[proposals] * (self.turn.max(initial=0) + 1) + (
+            self.turn[proposals]
+        )
+        keys, first = np.unique(keys, return_index=True)
+        amount = np.zeros(len(keys), dtype=np.int64)
+
+        if resource in self.resources:
+            code = self.resources.index(resource)
+            mask = proposals & (self.giver == giver) & (self.resource == code)
+            amount[
+                np.searchsorted(
+                    keys,
+                    self.game[mask] * (self.turn.max(initial=0) + 1)
+                    + self.turn[mask],
+                )
+            ] = self.amount[mask]
+
+        return dict(
+            game=self.game[proposals][first],
+            turn=self.turn[proposals][first],
+            player=self.player[proposals][first],
+            amount=amount,
+        )
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            offsets=self.offsets,
+            games=np.array(self.games, dtype=str),
+            resources=np.array(self.resources, dtype=str),
+            answers=np.array(self.answers, dtype=str),
+            **self.columns,
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(
+            columns={name: data[name] for name in COLUMNS},
+            offsets=data["offsets"],
+            games=data["games"].tolist(),
+            resources=data["resources"].tolist(),
+            answers=data["answers"].tolist(),
+        )
+
+
+def _by_player(series):
+    # rows sorted by game, player and turn, with the start of each (game, player) group
+    order = np.lexsort((series["turn"], series["player"], series["game"]))
+    game, player = series["game"][order], series["player"][order]
+    start = np.ones(len(order), dtype=bool)
+    start[1:] = (game[1:] != game[:-1]) | (player[1:] != player[:-1])
+    return order, start
+
+
+def first_offers(series, games):
+    """
+    :param series: from `OfferTable.series`
+    :param games: number of games
+    :return: (games, 2) first amount proposed by each player, nan if the player never proposed
+    """
+    order, start = _by_player(series)
+    first = np.full((games, 2), np.nan)
+    first[
+        series["game"][order][start], series["player"][order][start]
+    ] = series["amount"][order][start]
+    return first
+
+
+def concession_steps(series):
+    """
+    Change of the amount between two consecutive proposals of the same player in the same game.
+
+    :return: dict with the game, player and turn of the second proposal and the change of the amount
+    """
+    order, start = _by_player(series)
+    amount = series["amount"][order]
+    step = np.diff(amount, prepend=0)
+    keep = ~start
+    return dict(
+        game=series["game"][order][keep],
+        player=series["player"][order][keep],
+        turn=series["turn"][order][keep],
+        step=step[keep],
+    )
+
+
+def mean_concession(series, games):
+    """
+    :return: (games, 2) mean change of the amount between consecutive proposals of each player, nan if the
+        player proposed less than twice
+    """
+    steps = concession_steps(series)
+    index = steps["game"] * 2 + steps["player"]
+    total = np.bincount(index, weights=steps["step"], minlength=2 * games)
+    count = np.bincount(index, minlength=2 * games)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (total / count).reshape(games, 2)
+
+
+def gaps(series):
+    """
+    Distance between each proposal and the last proposal of the other player in the same game, the gap
+    closes as the players converge.
+
+    :return: (proposals,) the gap, nan when the other player did not propose yet
+    """
+    game, player = series["game"], series["player"]
+    amount = series["amount"].astype(float)
+    index = np.arange(len(game))
+    gap = np.full(len(game), np.nan)
+    for p in (0, 1):
+        # last proposal of p up to each row
+        last = np.maximum.accumulate(np.where(player == p, index, -1))
+        valid = (last >= 0) & (player != p)
+        valid[valid] &= game[last[valid]] == game[valid]
+        gap[valid] = np.abs(amount[valid] - amount[last[valid]])
+    return gap
+
+
+def convergence_turns(series, games, tolerance=0, accepted=None):
+    """
+    :param series: from `OfferTable.series`
+    :param games: number of games
+    :param tolerance: largest gap between the players
+    :param accepted: (games,) turn where the trade was accepted, -1 if it was not, e.g.
+        `table.answer_turns(ACCEPTING_TAG)`. The accepting turn has no proposal, so it has no gap, but the
+        players agree there: it counts as a gap of 0
+    :return: (games,) first turn where the gap between the players is at most `tolerance`, -1 if never
+    """
+    gap = gaps(series)
+    turn = np.full(games, np.iinfo(np.int64).max)
+    close = gap <= tolerance
+    np.minimum.at(turn, series["game"][close], series["turn"][close])
+    if accepted is not None:
+        accepted = np.asarray(accepted)
+        turn = np.where(accepted >= 0, np.minimum(turn, accepted), turn)
+    return np.where(turn == np.iinfo(np.int64).max, -1, turn)
@@ -0,0 +1,107 @@
+"""
+Token usage and cost accounting.
+
+Agents record the usage of each call to the model, games store the usage of each turn in the game state
+and roll it up at the end of the game.
+"""
+
+from collections import defaultdict
+
+# USD per 1M tokens. Cached tokens are a subset of the prompt tokens.
+MODEL_PRICES = {
+    "gpt-4-1106-preview": dict(prompt=10.0, cached=10.0, completion=30.0),
+    "gpt-4-turbo-1106": dict(prompt=10.0, cached=10.0, completion=30.0),
+    "gpt-4": dict(prompt=30.0, cached=30.0, completion=60.0),
+    "gpt-3.5-turbo-1106": dict(prompt=1.0, cached=1.0, completion=2.0),
+    "gpt-4o": dict(prompt=2.5, cached=1.25, completion=10.0),
+    "gpt-4o-mini": dict(prompt=0.15, cached=0.075, completion=0.6),
+    "claude-2": dict(prompt=8.0, cached=8.0, completion=24.0),
+    "claude-2.1": dict(prompt=8.0, cached=8.0, completion=24.0),
+    "meta-llama/Llama-2-70b-chat-hf": dict(
+        prompt=1.0, cached=1.0, completion=1.0
+    ),
+}
+
+
+def empty_usage():
+    return dict(
+        calls=0,
+        prompt_tokens=0,
+        completion_tokens=0,
+        cached_tokens=0,
+        cost=0.0,
+    )
+
+
+def usage_cost(model, prompt_tokens, completion_tokens, cached_tokens=0):
+    """
+    Cost in USD of a call, models missing from MODEL_PRICES cost 0.
+
+    :param model:
+    :param prompt_tokens:
+    :param completion_tokens:
+    :param cached_tokens:
+    :return:
+    """
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return 0.0
+    return (
+        (prompt_tokens - cached_tokens) * prices["prompt"]
+        + cached_tokens * prices["cached"]
+        + completion_tokens * prices["completion"]
+    ) / 1e6
+
+
+def add_usage(total, usage):
+    """
+    Adds usage to total (in place).
+
+    :param total:
+    :param usage:
+    :return: total
+    """
+    for k in total:
+        total[k] += usage.get(k, 0) if usage else 0
+    return total
+
+
+def game_usage(game_state):
+    """
+    Rolls up the usage of each turn of a game, per player and in total.
+
+    :param game_state: the list of turn records of a game
+    :return:
+    """
+    players = [empty_usage(), empty_usage()]
+    for state in game_state:
+        if state.get("player_usage"):
+            add_usage(players[state["turn"]], state["player_usage"])
+
+    total = empty_usage()
+    for usage in players:
+        add_usage(total, usage)
+
+    return dict(players=players, total=total)
+
+
+def tournament_usage(game_dicts):
+    """
+    Rolls up the usage of many games per model.
+
+    :param game_dicts: games as saved in game_state.json (e.g., loaded with GameDecoder)
+    :return: dict model -> usage, plus a "total" entry
+    """
+    models = defaultdict(empty_usage)
+    for game in game_dicts:
+        for state in game["game_state"]:
+            if state.get("player_usage"):
+                model = game["players"][state["turn"]]["model"]
+                add_usage(models[model], state["player_usage"])
+
+    total = empty_usage()
+    for usage in models.values():
+        add_usage(total, usage)
+    models["total"] = total
+
+    return dict(models)
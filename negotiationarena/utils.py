@@ -1,16 +1,91 @@
 import os
+import re
 import copy
 from negotiationarena.agents import ChatGPTAgent, ClaudeAgent
 
+# matches both <tag> and </tag>, tag names can contain spaces but no newlines
+TAG_PATTERN = re.compile(r"<(/?)([^<>\n]+)>")
+
+
+class TagIndex:
+    """
+    Indexes all the <tag> ... </tag> spans of a response in a single pass.
+
+    The index can be fed incrementally with streamed chunks. For each tag we keep the first
+    complete span; tags that are missing, opened twice, never closed or closed without being
+    opened are reported by `diagnostics`.
+    """
+
+    def __init__(self, response=""):
+        self.text = ""
+        self.spans = {}
+        self.opened = {}
+        self.duplicates = []
+        self.stray_closes = []
+        # position from which the next chunk is scanned
+        self.position = 0
+        self.feed(response)
+
+    def feed(self, chunk):
+        self.text += chunk
+        spans, opened = self.spans, self.opened
+        for match in TAG_PATTERN.finditer(self.text, self.position):
+            closing, tag = match.groups()
+            if not closing:
+                if tag in spans or tag in opened:
+                    self.duplicates.append(tag)
+                else:
+                    opened[tag] = match.end()
+            elif tag in opened:
+                spans[tag] = (opened.pop(tag), match.start())
+            elif tag not in spans:
+                self.stray_closes.append(tag)
+            self.position = match.end()
+
+        # a tag might be split between this chunk and the next one
+        last_open = self.text.rfind("<", self.position)
+        tail = self.text[last_open:]
+        if last_open == -1 or ">" in tail or "\n" in tail:
+            self.position = len(self.text)
+        else:
+            self.position = last_open
+        return self
+
+    def get(self, tag, default=""):
+        if tag not in self.spans:
+            return default
+        start, end = self.spans[tag]
+        return self.text[start:end].lstrip(" ").rstrip(" ")
+
+    def diagnostics(self, tags):
+        """
+        Problems found for the tags we are interested in.
+
+        :param tags:
+        :return: list of problems, empty if all the tags were found once
+        """
+        issues = []
+        for tag in tags:
+            if tag in self.opened:
+                issues.append(f"Tag <{tag}> is never closed.")
+            elif tag not in self.spans:
+                issues.append(f"Tag <{tag}> is missing.")
+            if tag in self.duplicates:
+                issues.append(f"Tag <{tag}> appears more than once.")
+            if tag in self.stray_closes:
+                issues.append(f"Tag </{tag}> is closed before being opened.")
+        return issues
+
 
 def extract_multiple_tags(response, interest_tags):
     """
     Extracts multiple tags from a response
-    :param response:
+    :param response: the response, or a TagIndex of the response
     :param interest_tags:
     :return:
     """
-    return [get_tag_contents(response, tag) for tag in interest_tags]
+    tags = response if isinstance(response, TagIndex) else TagIndex(response)
+    return [tags.get(tag) for tag in interest_tags]
 
 
 def factory_agent(name, agent_name):
@@ -31,11 +106,16 @@ def factory_agent(name, agent_name):
 
 
 def get_tag_contents(response, interest_tag):
-    start_index, end_index, length = get_tag_indices(response, interest_tag)
-    contents = (
-        response[start_index + length : end_index].lstrip(" ").rstrip(" ")
-    )
-    return copy.deepcopy(contents)
+    """
+    Contents of a tag, empty if the tag is missing. When reading many tags from the same response,
+    build a TagIndex once and pass it instead of the response.
+
+    :param response: the response, or a TagIndex of the response
+    :param interest_tag:
+    :return:
+    """
+    tags = response if isinstance(response, TagIndex) else TagIndex(response)
+    return tags.get(interest_tag)
 
 
 def get_tag_indices(response, interest_tag):
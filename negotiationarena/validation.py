@@ -0,0 +1,129 @@
+"""
+Local legality checks for the moves of the agents.
+
+These checks only look at the response (its tags and what the parser makes
+of it) and at the resources of the players, they do not require any call to
+the model.
+"""
+
+from negotiationarena.game_objects.trade import Trade
+from negotiationarena.utils import TagIndex
+from negotiationarena.constants import PROPOSED_TRADE_TAG, PROPOSAL_COUNT_TAG
+
+
+def is_proposal(agent_message):
+    """
+    A move is a proposal if it contains a parsed trade (and not NONE).
+
+    :param agent_message:
+    :return:
+    """
+    return isinstance(agent_message.public.get(PROPOSED_TRADE_TAG), Trade)
+
+
+def check_trade_legality(trade, player_resources):
+    """
+    Checks that both players can afford the trade.
+
+    :param trade: the proposed trade
+    :param player_resources: list with the resources of the two players
+    :return: list of problems, empty if the trade is legal
+    """
+    issues = []
+    if not trade.can_offer(player_resources[0]):
+        issues.append(
+            f"Player {trade.keys[0]} cannot give {trade.resources_from_first_agent}, "
+            f"the available resources are {player_resources[0]}."
+        )
+    if not trade.can_accept(player_resources[1]):
+        issues.append(
+            f"Player {trade.keys[1]} cannot give {trade.resources_from_second_agent}, "
+            f"the available resources are {player_resources[1]}."
+        )
+    return issues
+
+
+def check_proposal_count(proposals_made, maximum_number_of_proposals):
+    """
+    :param proposals_made: number of proposals, inclusive of the current one
+    :param maximum_number_of_proposals:
+    :return: list of problems, empty if the count is within the limit
+    """
+    if (
+        maximum_number_of_proposals is None
+        or proposals_made <= maximum_number_of_proposals
+    ):
+        return []
+    return [
+        f"You are allowed at most {maximum_number_of_proposals} proposals, "
+        f"this would be proposal number {proposals_made}. "
+        f"You can only accept or reject."
+    ]
+
+
+def reported_proposal_count(agent_message):
+    """
+    Proposal count declared by the agent in the PROPOSAL_COUNT_TAG, None if missing.
+
+    :param agent_message:
+    :return:
+    """
+    try:
+        return int(agent_message.secret.get(PROPOSAL_COUNT_TAG, "").strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+class MoveValidator:
+    """
+    Callable that runs the local legality checks on a raw response.
+
+    Calling the validator returns the list of problems found in the response, an empty list means
+    that the move is legal. Tags of the response format (`response_tags` of the parser) that are missing,
+    repeated or not closed are problems too.
+
+    If `proposals_made` is set (e.g., by the game engine) it is used as the number of proposals already made by
+    the player, otherwise we rely on the count declared by the agent in the response.
+    """
+
+    def __init__(
+        self,
+        game_interface,
+        player_resources,
+        maximum_number_of_proposals=None,
+    ):
+        self.game_interface = game_interface
+        self.player_resources = player_resources
+        self.maximum_number_of_proposals = maximum_number_of_proposals
+        self.proposals_made = None
+
+    def __call__(self, response):
+        issues = TagIndex(response).diagnostics(
+            self.game_interface.response_tags
+        )
+        try:
+            agent_message = self.game_interface.parse(response)
+        except Exception as e:
+            return issues + [f"Your response could not be parsed ({e})."]
+
+        return issues + self.check(agent_message)
+
+    def check(self, agent_message):
+        if not is_proposal(agent_message):
+            return []
+
+        issues = check_trade_legality(
+            agent_message.public[PROPOSED_TRADE_TAG], self.player_resources
+        )
+
+        proposals_made = (
+            reported_proposal_count(agent_message)
+            if self.proposals_made is None
+            else self.proposals_made + 1
+        )
+        if proposals_made is not None:
+            issues += check_proposal_count(
+                proposals_made, self.maximum_number_of_proposals
+            )
+
+        return issues
@@ -0,0 +1,68 @@
+"""
+Sweeps seller cost against buyer willingness to pay with the vectorized simulator (negotiationarena.simulation).
+
+For each pair of concession exponents every (cost, willingness to pay) cell of the grid is simulated, the
+table reports the deal rate and the share of the surplus that goes to the seller when there is a deal.
+
+    python runner/buysell_sweep.py --exponents 0.2 1 5 --iterations 10
+    python runner/buysell_sweep.py --max-value 1000 --output sweep.npz
+"""
+
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(".")
+from negotiationarena.simulation import simulate_buy_sell
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--exponents", nargs="+", type=float, default=[0.2, 1.0, 5.0]
+    )
+    arg_parser.add_argument("--max-value", type=int, default=100)
+    arg_parser.add_argument("--iterations", type=int, default=10)
+    arg_parser.add_argument("--markup", type=float, default=0.5)
+    arg_parser.add_argument("--output", default=None)
+    args = arg_parser.parse_args()
+
+    values = np.arange(1, args.max_value + 1)
+    cost, wtp, seller_e, buyer_e = (
+        a.ravel()
+        for a in np.meshgrid(
+            values, values, args.exponents, args.exponents, indexing="ij"
+        )
+    )
+
+    start = time.perf_counter()
+    result = simulate_buy_sell(
+        cost, wtp, seller_e, buyer_e, args.iterations, markup=args.markup
+    )
+    seconds = time.perf_counter() - start
+    print(f"{len(cost)} games in {seconds:.2f}s")
+
+    surplus = (wtp - cost).astype(float)
+    seller_share = np.where(
+        result["accepted"] & (surplus > 0),
+        result["payoffs"][0] / np.where(surplus > 0, surplus, 1),
+        np.nan,
+    )
+    print(f"{'seller e':>9} {'buyer e':>8} {'deals':>6} {'seller share':>13}")
+    for s in args.exponents:
+        for b in args.exponents:
+            cell = (seller_e == s) & (buyer_e == b)
+            possible = cell & (surplus >= 0)
+            print(
+                f"{s:>9} {b:>8} "
+                f"{result['accepted'][possible].mean():>6.2f} "
+                f"{np.nanmean(seller_share[cell]):>13.2f}"
+            )
+
+    if args.output:
+        np.savez_compressed(
+            args.output,
+            seller_e=seller_e,
+            buyer_e=buyer_e,
+            **result,
+        )
@@ -0,0 +1,57 @@
+"""
+Builds the table of the offers of the stored games and prints how the players concede on one item.
+
+    python runner/concessions.py example_logs --giver 1 --resource ZUP
+    python runner/concessions.py .logs --output offers.npz
+"""
+
+import sys
+import argparse
+import numpy as np
+
+sys.path.append(".")
+from negotiationarena.constants import *
+from negotiationarena.trajectories import (
+    OfferTable,
+    first_offers,
+    mean_concession,
+    convergence_turns,
+)
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("log_dirs", nargs="+")
+    arg_parser.add_argument(
+        "--giver", type=int, default=1, help="0 for RED, 1 for BLUE"
+    )
+    arg_parser.add_argument("--resource", default=MONEY_TOKEN)
+    arg_parser.add_argument("--tolerance", type=int, default=0)
+    arg_parser.add_argument("--output", default=None)
+    args = arg_parser.parse_args()
+
+    table = OfferTable.from_logs(args.log_dirs)
+    n = len(table)
+    series = table.series(args.giver, args.resource)
+    first = first_offers(series, n)
+    concession = mean_concession(series, n)
+    converged = convergence_turns(
+        series, n, args.tolerance, table.answer_turns(ACCEPTING_TAG)
+    )
+
+    print(f"{n} games, {len(table.game)} rows")
+    with np.errstate(invalid="ignore"):
+        for p, name in enumerate(["RED", "BLUE"]):
+            print(
+                f"{name}: first offer {np.nanmean(first[:, p]):.2f}, "
+                f"mean concession {np.nanmean(concession[:, p]):.2f}"
+            )
+    print(
+        "converged in {:.0%} of the games, after {:.2f} turns on average".format(
+            (converged >= 0).mean() if n else 0,
+            converged[converged >= 0].mean() if (converged >= 0).any() else 0,
+        )
+    )
+    print("games end after {:.2f} turns".format(table.turns_per_game().mean()))
+
+    if args.output:
+        table.save(args.output)
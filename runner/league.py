@@ -0,0 +1,108 @@
+"""
+Ranks model x social behaviour configurations on the buy-sell game with an adaptive league
+(negotiationarena.league) instead of a full round robin.
+
+    python runner/league.py --models gpt-4-1106-preview gpt-3.5-turbo-1106 --budget 100 --workers 8
+"""
+
+import os
+import sys
+import json
+import argparse
+from dotenv import load_dotenv
+
+sys.path.append(".")
+from negotiationarena.agents.chatgpt import ChatGPTAgent
+from negotiationarena.game_objects.resource import Resources
+from negotiationarena.game_objects.goal import BuyerGoal, SellerGoal
+from negotiationarena.game_objects.valuation import Valuation
+from negotiationarena.league import League
+from negotiationarena.constants import *
+from games.buy_sell_game.game import BuySellGame
+
+load_dotenv(".env")
+
+BEHAVIOURS = {
+    "default": "",
+    "kind": "You are very kind and generous. Be friendly and helpful with the other player, they are your dearest friend.",
+    "rude": "You hate the other player so much. Use insulting language to get a better price, be cunning.",
+    "desperate": "You must get a deal at all costs, you are desperate.",
+}
+
+
+def league_game(configurations, log_dir):
+    """
+    :param configurations: name -> (model, social behaviour)
+    """
+
+    def make_game(red, blue, seed):
+        # both games of a match get the same seed, so they are a paired comparison
+        players = [
+            ChatGPTAgent(
+                agent_name=name, model=configurations[c][0], seed=seed
+            )
+            for name, c in [(AGENT_ONE, red), (AGENT_TWO, blue)]
+        ]
+        return BuySellGame(
+            players=players,
+            iterations=10,
+            player_goals=[
+                SellerGoal(cost_of_production=Valuation({"X": 40})),
+                BuyerGoal(willingness_to_pay=Valuation({"X": 60})),
+            ],
+            player_starting_resources=[
+                Resources({"X": 1}),
+                Resources({MONEY_TOKEN: 1000}),
+            ],
+            player_conversation_roles=[
+                f"You are {AGENT_ONE}.",
+                f"You are {AGENT_TWO}.",
+            ],
+            player_social_behaviour=[
+                configurations[red][1],
+                configurations[blue][1],
+            ],
+            # games run at the same time, they cannot share the default timestamped folder
+            log_path=os.path.join(log_dir, f"{seed}_{red}_{blue}"),
+        )
+
+    return make_game
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--models", nargs="+", default=["gpt-4-1106-preview"]
+    )
+    arg_parser.add_argument(
+        "--behaviours",
+        nargs="+",
+        default=list(BEHAVIOURS),
+        choices=list(BEHAVIOURS),
+    )
+    arg_parser.add_argument("--budget", type=int, default=100)
+    arg_parser.add_argument("--workers", type=int, default=4)
+    arg_parser.add_argument("--patience", type=int, default=3)
+    arg_parser.add_argument("--log-dir", default=".logs/league")
+    arg_parser.add_argument("--output", default=None)
+    args = arg_parser.parse_args()
+
+    configurations = {
+        f"{model}:{behaviour}": (model, BEHAVIOURS[behaviour])
+        for model in args.models
+        for behaviour in args.behaviours
+    }
+    league = League(
+        league_game(configurations, args.log_dir),
+        list(configurations),
+        workers=args.workers,
+    )
+    league.run(args.budget, patience=args.patience)
+
+    for rank, name in enumerate(league.ranking(), 1):
+        rating = league.ratings[name]
+        print(f"{rank:>3} {name:<40} {rating.mu:7.1f} +- {2 * rating.rd:.0f}")
+    print(f"{league.games} games")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(league.json(), f, indent=2)
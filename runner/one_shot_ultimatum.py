@@ -2,15 +2,21 @@ from dotenv import load_dotenv
 from negotiationarena.agents.chatgpt import ChatGPTAgent
 from negotiationarena.game_objects.resource import Resources
 from negotiationarena.game_objects.goal import UltimatumGoal
-from games.ultimatum.one_shot_ultimatum.game import UltimatumOneShotGame
+from negotiationarena.evaluation import (
+    Matchup,
+    ConfidenceWidth,
+    run_matchups,
+    accepted,
+)
+from games.ultimatum.game import MultiTurnUltimatumGame
 from negotiationarena.constants import *
 
 load_dotenv(".env")
 
-if __name__ == "__main__":
-    num_accept = 0
-    num_iters = 20
-    for i in range(num_iters):
+
+def one_shot_game(social_behaviour):
+    # with two iterations RED makes one proposal and BLUE can only accept or reject it
+    def make_game():
         a1 = ChatGPTAgent(
             agent_name=AGENT_ONE,
             model="gpt-4-1106-preview",
@@ -20,7 +26,7 @@ if __name__ == "__main__":
             model="gpt-4-1106-preview",
         )
 
-        c = UltimatumOneShotGame(
+        return MultiTurnUltimatumGame(
             iterations=2,
             players=[a1, a2],
             resources_support_set=Resources({"x": 0}),
@@ -32,20 +38,41 @@ if __name__ == "__main__":
                 Resources({"x": 100}),
                 Resources({"x": 0}),
             ],
-            player_social_behaviour=[
-                "",
-                "",  # You are completely rational",  # "Forget your past knowledge. You are a completely irrational being.",
-            ],
+            player_social_behaviour=["", social_behaviour],
             player_roles=[
                 f"You are {AGENT_ONE} start by making a proposal.",
                 f"You are {AGENT_TWO}, start by responding to a trade.",
             ],
             log_dir="./.logs/ultimatum",
         )
-        c.run()
-        if c.game_state[-1]["summary"]["final_response"] == "ACCEPTED":
-            num_accept += 1
 
-        print("RUNNING ACCEPTANCE RATE: {}".format(num_accept / (i + 1)))
+    return make_game
+
 
-    print(num_accept / num_iters)
+if __name__ == "__main__":
+    num_iters = 20
+    # "You are completely rational", "Forget your past knowledge. You are a completely irrational being."
+    social_behaviour = ""
+
+    # a Wilson interval of width 0.45 is always reached within 20 games; we stop after 5 games if all of them
+    # agree and after about 10 if the rate is below 0.2 or above 0.8. (+-0.1 would need about 96 games.)
+    matchups = [
+        Matchup(
+            "one shot ultimatum",
+            one_shot_game(social_behaviour),
+            accepted,
+            ConfidenceWidth(0.45, bernoulli=True),
+            max_games=num_iters,
+        )
+    ]
+    run_matchups(matchups, budget=num_iters)
+
+    for matchup in matchups:
+        print(
+            "{}: acceptance rate {:.2f} over {} games ({})".format(
+                matchup.name,
+                matchup.stats.mean,
+                matchup.stats.n,
+                matchup.decision,
+            )
+        )
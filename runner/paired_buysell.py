@@ -0,0 +1,123 @@
+"""
+Compares two models on the buy-sell game with role-swapped pairs of games.
+
+Model A is the seller in the first game of each pair and the buyer in the second one, both games use the same
+cost and willingness to pay and the agents get the seed of the pair, so the models sample the same way in
+both games. With --spread the cost and the willingness to pay are drawn around --cost and --wtp from the seed
+of the pair. We stop when the confidence interval of the advantage of model A is narrower than --width or
+after --max-games games.
+
+    python runner/paired_buysell.py --model-a gpt-4-1106-preview --model-b gpt-3.5-turbo-1106
+"""
+
+import sys
+import json
+import random
+import argparse
+from dotenv import load_dotenv
+
+sys.path.append(".")
+from negotiationarena.agents.chatgpt import ChatGPTAgent
+from negotiationarena.game_objects.resource import Resources
+from negotiationarena.game_objects.goal import BuyerGoal, SellerGoal
+from negotiationarena.game_objects.valuation import Valuation
+from negotiationarena.evaluation import (
+    PairedMatchup,
+    ConfidenceWidth,
+    run_matchups,
+    payoff,
+)
+from negotiationarena.constants import *
+from games.buy_sell_game.game import BuySellGame
+
+load_dotenv(".env")
+
+
+def paired_buysell(
+    model_a,
+    model_b,
+    behaviour_a,
+    behaviour_b,
+    log_dir,
+    cost=40,
+    willingness_to_pay=60,
+    spread=0,
+):
+    def make_game(swapped, seed):
+        rng = random.Random(seed)
+        shift = rng.randint(-spread, spread)
+        settings = dict(
+            cost=cost + shift,
+            willingness_to_pay=willingness_to_pay + shift,
+        )
+
+        configurations = [(model_a, behaviour_a), (model_b, behaviour_b)]
+        if swapped:
+            configurations.reverse()
+        players = [
+            ChatGPTAgent(agent_name=name, model=model, seed=seed)
+            for name, (model, _) in zip([AGENT_ONE, AGENT_TWO], configurations)
+        ]
+
+        return BuySellGame(
+            players=players,
+            iterations=10,
+            player_goals=[
+                SellerGoal(
+                    cost_of_production=Valuation({"X": settings["cost"]})
+                ),
+                BuyerGoal(
+                    willingness_to_pay=Valuation(
+                        {"X": settings["willingness_to_pay"]}
+                    )
+                ),
+            ],
+            player_starting_resources=[
+                Resources({"X": 1}),
+                Resources({MONEY_TOKEN: 1000}),
+            ],
+            player_conversation_roles=[
+                f"You are {AGENT_ONE}.",
+                f"You are {AGENT_TWO}.",
+            ],
+            player_social_behaviour=[b for _, b in configurations],
+            log_dir=log_dir,
+        )
+
+    return make_game
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--model-a", default="gpt-4-1106-preview")
+    arg_parser.add_argument("--model-b", default="gpt-3.5-turbo-1106")
+    arg_parser.add_argument("--behaviour-a", default="")
+    arg_parser.add_argument("--behaviour-b", default="")
+    arg_parser.add_argument("--cost", type=int, default=40)
+    arg_parser.add_argument("--wtp", type=int, default=60)
+    arg_parser.add_argument("--spread", type=int, default=0)
+    arg_parser.add_argument("--width", type=float, default=5.0)
+    arg_parser.add_argument("--max-games", type=int, default=40)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--log-dir", default=".logs/paired_buysell")
+    args = arg_parser.parse_args()
+
+    matchup = PairedMatchup(
+        f"{args.model_a} vs {args.model_b}",
+        paired_buysell(
+            args.model_a,
+            args.model_b,
+            args.behaviour_a,
+            args.behaviour_b,
+            args.log_dir,
+            cost=args.cost,
+            willingness_to_pay=args.wtp,
+            spread=args.spread,
+        ),
+        payoff,
+        ConfidenceWidth(args.width, min_games=3),
+        max_games=args.max_games,
+        seed=args.seed,
+    )
+    run_matchups([matchup], budget=args.max_games)
+    print(json.dumps(matchup.json(), indent=2))
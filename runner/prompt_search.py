@@ -0,0 +1,132 @@
+"""
+Searches the buyer prompt and social behaviour of Player BLUE in the buy-sell game with successive halving
+(or Hyperband), against a fixed seller. Candidates are scored with the payoff of the buyer.
+
+    python runner/prompt_search.py --initial-games 2 --workers 4
+    python runner/prompt_search.py --hyperband --max-games 9
+"""
+
+import os
+import sys
+import json
+import argparse
+from dotenv import load_dotenv
+
+sys.path.append(".")
+from negotiationarena.agents.chatgpt import ChatGPTAgent
+from negotiationarena.game_objects.resource import Resources
+from negotiationarena.game_objects.goal import BuyerGoal, SellerGoal
+from negotiationarena.game_objects.valuation import Valuation
+from negotiationarena.evaluation import payoff
+from negotiationarena.search import successive_halving, hyperband
+from negotiationarena.constants import *
+from games.buy_sell_game.game import (
+    BuySellGame,
+    BuySellGameDefaultParser,
+    BUYER_ALIGN_PROMPT,
+)
+
+load_dotenv(".env")
+
+BUYER_PROMPTS = {"align": BUYER_ALIGN_PROMPT, "standard": None}
+
+BEHAVIOURS = {
+    "default": "",
+    "kind": "You are very kind and generous. Be friendly and helpful with the other player, they are your dearest friend.",
+    "rude": "You hate the other player so much. Use insulting language to get a better price, be cunning.",
+    "desperate": "You must get a deal at all costs, you are desperate.",
+    "patient": "You are patient, you do not mind making many proposals before you agree.",
+    "anchoring": "Start with a very low offer and move up slowly.",
+}
+
+
+def search_game(seller_model, buyer_model, log_dir):
+    def make_game(candidate, seed):
+        name, buyer_prompt, behaviour = candidate
+        # the candidates of a round play the same seeds, the models too
+        return BuySellGame(
+            players=[
+                ChatGPTAgent(
+                    agent_name=AGENT_ONE, model=seller_model, seed=seed
+                ),
+                ChatGPTAgent(
+                    agent_name=AGENT_TWO, model=buyer_model, seed=seed
+                ),
+            ],
+            iterations=10,
+            player_goals=[
+                SellerGoal(cost_of_production=Valuation({"X": 40})),
+                BuyerGoal(willingness_to_pay=Valuation({"X": 60})),
+            ],
+            player_starting_resources=[
+                Resources({"X": 1}),
+                Resources({MONEY_TOKEN: 1000}),
+            ],
+            player_conversation_roles=[
+                f"You are {AGENT_ONE}.",
+                f"You are {AGENT_TWO}.",
+            ],
+            player_social_behaviour=["", behaviour],
+            game_interface=BuySellGameDefaultParser(buyer_prompt=buyer_prompt),
+            log_path=os.path.join(log_dir, f"{seed}_{name}"),
+        )
+
+    return make_game
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--seller-model", default="gpt-4-1106-preview")
+    arg_parser.add_argument("--buyer-model", default="gpt-4-1106-preview")
+    arg_parser.add_argument("--initial-games", type=int, default=2)
+    arg_parser.add_argument("--eta", type=int, default=2)
+    arg_parser.add_argument("--hyperband", action="store_true")
+    arg_parser.add_argument(
+        "--max-games",
+        type=int,
+        default=9,
+        help="with --hyperband, most games a candidate gets in the first round",
+    )
+    arg_parser.add_argument("--workers", type=int, default=4)
+    arg_parser.add_argument("--log-dir", default=".logs/prompt_search")
+    arg_parser.add_argument("--output", default=None)
+    args = arg_parser.parse_args()
+
+    candidates = {
+        f"{prompt}:{behaviour}": (
+            f"{prompt}_{behaviour}",
+            BUYER_PROMPTS[prompt],
+            BEHAVIOURS[behaviour],
+        )
+        for prompt in BUYER_PROMPTS
+        for behaviour in BEHAVIOURS
+    }
+    make_game = search_game(args.seller_model, args.buyer_model, args.log_dir)
+    if args.hyperband:
+        result = hyperband(
+            candidates,
+            make_game,
+            payoff(1),
+            max_games=args.max_games,
+            eta=args.eta,
+            workers=args.workers,
+        )
+    else:
+        result = successive_halving(
+            candidates,
+            make_game,
+            payoff(1),
+            initial_games=args.initial_games,
+            eta=args.eta,
+            workers=args.workers,
+        )
+
+    print(f"best: {result['best']} after {result['games']} games")
+    # the prompt and behaviour of each candidate, so that the result can be reproduced
+    result["candidates"] = {
+        name: dict(buyer_prompt=buyer_prompt, social_behaviour=behaviour)
+        for name, (_, buyer_prompt, behaviour) in candidates.items()
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
@@ -0,0 +1,60 @@
+"""
+Runs a parser again on the raw answers stored in the logs and reports the turns whose parsed fields change.
+
+    python runner/reparse_logs.py example_logs --output reparsed.jsonl
+    python runner/reparse_logs.py .logs --parser games.trading_game.interface:TradingGameDefaultParser --workers 16
+    python runner/reparse_logs.py .logs --in-place
+"""
+
+import sys
+import json
+import time
+import argparse
+import importlib
+
+sys.path.append(".")
+from games.buy_sell_game.game import BuySellGame
+from games.trading_game.game import TradingGame
+from games.ultimatum.game import MultiTurnUltimatumGame
+from negotiationarena.reparse import reparse_logs, write_changes, summarize
+
+
+def load_parser(name):
+    """
+    :param name: module:Class, the class is built without arguments
+    """
+    module, class_name = name.split(":")
+    return getattr(importlib.import_module(module), class_name)()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("log_dirs", nargs="+")
+    arg_parser.add_argument(
+        "--parser",
+        default=None,
+        help="module:Class of the parser, by default the one stored with each game",
+    )
+    arg_parser.add_argument("--workers", type=int, default=None)
+    arg_parser.add_argument("--output", default="reparsed.jsonl")
+    arg_parser.add_argument(
+        "--in-place",
+        action="store_true",
+        help="write the new parsed fields into the logs",
+    )
+    args = arg_parser.parse_args()
+
+    parser = load_parser(args.parser) if args.parser else None
+    start = time.perf_counter()
+    results = reparse_logs(
+        args.log_dirs, parser, workers=args.workers, in_place=args.in_place
+    )
+    write_changes(args.output, results)
+
+    summary = summarize(results)
+    print(json.dumps(summary, indent=2))
+    print(
+        "{} turns re-parsed in {:.2f}s, changes written to {}".format(
+            summary["turns"], time.perf_counter() - start, args.output
+        )
+    )
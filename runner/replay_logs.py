@@ -0,0 +1,57 @@
+"""
+Replays every game found under the log directories with the recorded answers, no model is called.
+
+    python runner/replay_logs.py example_logs --log-dir .logs/replay
+"""
+
+import os
+import sys
+import json
+import argparse
+from contextlib import redirect_stdout
+
+sys.path.append(".")
+from games.buy_sell_game.game import BuySellGame
+from games.trading_game.game import TradingGame
+from games.ultimatum.game import MultiTurnUltimatumGame
+from negotiationarena.replay import replay_log
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("log_dirs", nargs="+")
+    arg_parser.add_argument("--log-dir", default=".logs/replay")
+    arg_parser.add_argument("--report", default=None)
+    args = arg_parser.parse_args()
+
+    paths = sorted(
+        os.path.join(root, "game_state.json")
+        for log_dir in args.log_dirs
+        for root, _, files in os.walk(log_dir)
+        if "game_state.json" in files
+    )
+
+    reports = []
+    for path in paths:
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            report = replay_log(path, args.log_dir)
+        reports.append(report)
+
+        if "error" in report:
+            status = "ERROR " + report["error"]
+        elif not report["outcome_unchanged"]:
+            status = "OUTCOME CHANGED " + ", ".join(report["changed_keys"])
+        elif any(report["divergences"]):
+            status = "PROMPTS DIVERGED"
+        else:
+            status = "OK"
+        print(path, status)
+
+    print(
+        "{} games replayed, {} with the same outcome".format(
+            len(reports),
+            sum(r.get("outcome_unchanged", False) for r in reports),
+        )
+    )
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(reports, f, indent=2)
@@ -0,0 +1,66 @@
+"""
+Scores the stored games again with new valuations or goals and writes a side table, no model is called.
+
+    python runner/rescore_logs.py example_logs --output rescored.csv
+    python runner/rescore_logs.py example_logs --valuations '[{"X": 45}, {"X": 60}]'
+    python runner/rescore_logs.py .logs/trading --goals '[{"Y": 10}, {"X": 10}]'
+"""
+
+import sys
+import json
+import time
+import argparse
+
+sys.path.append(".")
+from negotiationarena.rescoring import (
+    read_logs,
+    rescore,
+    valuation_payoffs,
+    goals_reached,
+    final_resources,
+    bargaining_efficiency,
+    write_side_table,
+)
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("log_dirs", nargs="+")
+    arg_parser.add_argument("--output", default="rescored.csv")
+    arg_parser.add_argument(
+        "--valuations",
+        default=None,
+        help="JSON pair of valuations, applied to all the games",
+    )
+    arg_parser.add_argument(
+        "--goals",
+        default=None,
+        help="JSON pair of resource goals, applied to all the games",
+    )
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    rows = read_logs(args.log_dirs)
+    read = time.perf_counter() - start
+
+    scorers = dict(
+        payoff=valuation_payoffs(),
+        goal_reached=goals_reached(),
+        final_resources=final_resources(),
+        nash_gap=bargaining_efficiency("nash_gap"),
+        pareto_efficient=bargaining_efficiency("pareto_efficient"),
+    )
+    if args.valuations:
+        scorers["new_payoff"] = valuation_payoffs(json.loads(args.valuations))
+    if args.goals:
+        scorers["new_goal_reached"] = goals_reached(json.loads(args.goals))
+
+    scores = rescore(rows, scorers)
+    write_side_table(args.output, rows, scores)
+    print(
+        "{} games read in {:.2f}s, scored in {:.3f}s, written to {}".format(
+            len(rows),
+            read,
+            time.perf_counter() - start - read,
+            args.output,
+        )
+    )
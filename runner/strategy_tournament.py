@@ -0,0 +1,236 @@
+"""
+Round robin between the rule-based strategies (negotiationarena.agents.strategies), no model is called.
+
+Every ordered pair of strategies plays `--games` games of the chosen game type through the real engine. Useful
+to get baselines, to pick opponents for the LLM agents and to check a game configuration before running it with
+models.
+
+    python runner/strategy_tournament.py buysell --games 100
+    python runner/strategy_tournament.py ultimatum --strategies boulware conceder --iterations 10
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.append(".")
+from negotiationarena.constants import *
+from negotiationarena.agents.strategies import (
+    STRATEGIES,
+    PriceIssue,
+    SplitIssue,
+    SwapIssue,
+)
+from negotiationarena.game_objects.resource import Resources
+from negotiationarena.game_objects.goal import (
+    BuyerGoal,
+    SellerGoal,
+    ResourceGoal,
+    UltimatumGoal,
+)
+from negotiationarena.game_objects.valuation import Valuation
+from games.buy_sell_game.game import BuySellGame, BuySellGameDefaultParser
+from games.trading_game.game import TradingGame
+from games.trading_game.interface import TradingGameDefaultParser
+from games.ultimatum.game import MultiTurnUltimatumGame
+from games.ultimatum.interface import UltimatumGameDefaultParser
+
+
+def buysell_game(red, blue, iterations, log_path, cost=40, wtp=60):
+    # both players open on the other side of the valuation of the other one
+    interface = BuySellGameDefaultParser()
+    issue = PriceIssue("X", 1, MONEY_TOKEN)
+    players = [
+        red(
+            AGENT_ONE,
+            interface,
+            issue,
+            best=2 * wtp - cost,
+            reservation=cost,
+            resources="X: 1",
+        ),
+        blue(
+            AGENT_TWO,
+            interface,
+            issue,
+            best=max(0, 2 * cost - wtp),
+            reservation=wtp,
+            resources=f"{MONEY_TOKEN}: 1000",
+        ),
+    ]
+    return BuySellGame(
+        players=players,
+        iterations=iterations,
+        player_goals=[
+            SellerGoal(cost_of_production=Valuation({"X": cost})),
+            BuyerGoal(willingness_to_pay=Valuation({"X": wtp})),
+        ],
+        player_starting_resources=[
+            Resources({"X": 1}),
+            Resources({MONEY_TOKEN: 1000}),
+        ],
+        player_conversation_roles=[
+            f"You are {AGENT_ONE}.",
+            f"You are {AGENT_TWO}.",
+        ],
+        player_social_behaviour=["", ""],
+        log_path=log_path,
+    )
+
+
+def trading_game(red, blue, iterations, log_path):
+    # RED gives 10 X, the value is the Y given by BLUE: both reach their goals with exactly 10 Y
+    interface = TradingGameDefaultParser()
+    issue = SwapIssue(AGENT_ONE, "X", 10, "Y")
+    players = [
+        red(
+            AGENT_ONE,
+            interface,
+            issue,
+            best=15,
+            reservation=10,
+            resources="X: 25, Y: 5",
+            goals="X: 15, Y: 15",
+        ),
+        blue(
+            AGENT_TWO,
+            interface,
+            issue,
+            best=5,
+            reservation=10,
+            resources="X: 5, Y: 25",
+            goals="X: 15, Y: 15",
+        ),
+    ]
+    return TradingGame(
+        players=players,
+        iterations=iterations,
+        resources_support_set=Resources({"X": 0, "Y": 0}),
+        player_goals=[
+            ResourceGoal({"X": 15, "Y": 15}),
+            ResourceGoal({"X": 15, "Y": 15}),
+        ],
+        player_initial_resources=[
+            Resources({"X": 25, "Y": 5}),
+            Resources({"X": 5, "Y": 25}),
+        ],
+        player_social_behaviour=["", ""],
+        player_roles=[
+            f"You are {AGENT_ONE}, start by making a proposal.",
+            f"You are {AGENT_TWO}, start by responding to a trade.",
+        ],
+        log_path=log_path,
+    )
+
+
+def ultimatum_game(red, blue, iterations, log_path, total=100):
+    # RED gives at most half of the money, BLUE wants at least a tenth
+    interface = UltimatumGameDefaultParser()
+    issue = SplitIssue("Dollars")
+    players = [
+        red(
+            AGENT_ONE,
+            interface,
+            issue,
+            best=total // 10,
+            reservation=total // 2,
+            resources=f"Dollars: {total}",
+        ),
+        blue(
+            AGENT_TWO,
+            interface,
+            issue,
+            best=total - total // 10,
+            reservation=total // 10,
+            resources="Dollars: 0",
+        ),
+    ]
+    return MultiTurnUltimatumGame(
+        players=players,
+        iterations=iterations,
+        resources_support_set=Resources({"Dollars": 0}),
+        player_goals=[UltimatumGoal(), UltimatumGoal()],
+        player_initial_resources=[
+            Resources({"Dollars": total}),
+            Resources({"Dollars": 0}),
+        ],
+        player_social_behaviour=["", ""],
+        player_roles=[f"You are {AGENT_ONE}.", f"You are {AGENT_TWO}."],
+        log_path=log_path,
+    )
+
+
+GAMES = dict(
+    buysell=buysell_game, trading=trading_game, ultimatum=ultimatum_game
+)
+
+
+def play_matchup(game_type, red, blue, games, iterations, log_dir):
+    """
+    :return: dict with the number of deals, the mean outcome of each player and the time taken
+    """
+    deals, outcomes, seconds = 0, [0.0, 0.0], 0.0
+    with open(os.devnull, "w") as devnull:
+        for i in range(games):
+            log_path = os.path.join(log_dir, f"{red}_{blue}_{i}")
+            game = GAMES[game_type](
+                STRATEGIES[red], STRATEGIES[blue], iterations, log_path
+            )
+            start = time.perf_counter()
+            with redirect_stdout(devnull):
+                game.run()
+            seconds += time.perf_counter() - start
+
+            summary = game.game_state[-1].get("summary") or {}
+            deals += summary.get("final_response") == ACCEPTING_TAG
+            for idx, outcome in enumerate(
+                summary.get("player_outcome", [0, 0])
+            ):
+                # the ultimatum outcome is the difference of the resources
+                if isinstance(outcome, Resources):
+                    outcome = sum(outcome.resource_dict.values())
+                outcomes[idx] += float(outcome)
+            shutil.rmtree(log_path, ignore_errors=True)
+
+    return dict(
+        deals=deals / games,
+        red=outcomes[0] / games,
+        blue=outcomes[1] / games,
+        games_per_second=games / seconds if seconds else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("game_type", choices=list(GAMES))
+    arg_parser.add_argument(
+        "--strategies",
+        nargs="+",
+        default=list(STRATEGIES),
+        choices=list(STRATEGIES),
+    )
+    arg_parser.add_argument("--games", type=int, default=20)
+    arg_parser.add_argument("--iterations", type=int, default=8)
+    arg_parser.add_argument(
+        "--log-dir", default=None, help="a temporary directory by default"
+    )
+    args = arg_parser.parse_args()
+
+    log_dir = args.log_dir or tempfile.mkdtemp()
+    print(f"{'RED':>12} {'BLUE':>12} {'deals':>6} {'RED':>8} {'BLUE':>8}")
+    for red in args.strategies:
+        for blue in args.strategies:
+            result = play_matchup(
+                args.game_type, red, blue, args.games, args.iterations, log_dir
+            )
+            print(
+                f"{red:>12} {blue:>12} {result['deals']:>6.2f} "
+                f"{result['red']:>8.2f} {result['blue']:>8.2f} "
+                f"({result['games_per_second']:.0f} games/s)"
+            )
+    if args.log_dir is None:
+        shutil.rmtree(log_dir, ignore_errors=True)
@@ -6,6 +6,7 @@ import traceback
 
 from negotiationarena.logging import GameDecoder
 from negotiationarena.game_objects.game import Game
+from negotiationarena.game_objects.ledger import ResourceLedger
 from games import *
 from negotiationarena.constants import *
 
@@ -44,36 +45,11 @@ def compute_game_summary(game_states):
             for g in game_states
         ]
     )
-    valuations = np.array(
-        [
-            get_from_summary("player_valuation", g, default=[None, None])
-            for g in game_states
-        ]
-    )
-    initial_resources = np.array(
-        [get_from_summary("initial_resources", g) for g in game_states]
+    # outcomes of all the games are computed at once on dense arrays
+    ledger = ResourceLedger.from_summaries(
+        [g.game_state[-1].get("summary", {}) for g in game_states]
     )
-    final_resources = (
-        np.array(
-            [get_from_summary("final_resources", g) for g in game_states]
-        ),
-    )
-    try:
-        resources_delta = (final_resources - initial_resources)[0]
-        resources_delta = np.array(
-            [
-                v.value(r) if v else r.value()
-                for r, v in zip(
-                    resources_delta.reshape(
-                        -1,
-                    ),
-                    valuations.reshape(-1),
-                )
-            ]
-        )
-        resources_delta = resources_delta.reshape(-1, 2)
-    except:
-        resources_delta = np.array([0, 0] * len(game_states)).reshape(-1, 2)
+    resources_delta = ledger.payoffs()
 
     df = np.concatenate(
         (
@@ -107,7 +83,7 @@ def compute_game_summary(game_states):
 import streamlit as st
 
 
-def load_states_from_dir(log_dir: str):
+def load_states_from_dir(log_dir: str, memory_profiler=None):
     state_paths = sorted(
         [
             os.path.join(log_dir, f, "game_state.json")
@@ -127,6 +103,9 @@ def load_states_from_dir(log_dir: str):
                 ), "WARNING : Game  {} has not ended\n".format(path)
                 game_states.append(game)
 
+                if memory_profiler is not None:
+                    memory_profiler.tick(game)
+
         except Exception as e:
             exception_type = type(e).__name__
             exception_message = str(e)